@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+"""
+WHMCS Admin Panel - Request Path Benchmarks
+
+Drives every named admin_panel (except logout) and dev_dashboard URL
+through the Django test client and through a real threaded WSGI server,
+reports throughput, latency percentiles, SQL query counts, allocations
+and response sizes, and compares the results with the stored JSON
+baseline (regressions and a missing baseline make the run fail).
+
+The committed baseline holds only machine-independent metrics (statuses,
+query counts, allocations, response sizes), so it gates the same on any
+host. Timings depend on the machine: --save-baseline also writes them to
+an untracked timings.json next to it, and --timings compares against
+that file on the same machine.
+
+The benchmark runs against a throwaway test database (SQLite file or
+test_<DB_NAME> on a local PostgreSQL), never against real data.
+
+Usage:
+    python dev_tools/bench/bench.py [options]
+
+Options:
+    --db sqlite|postgresql   Database engine (default: sqlite)
+    --mode client|server|all Which harness to run (default: all)
+    --iterations N           Timed requests per case (default: 200)
+    --login-iterations N     Timed requests for POST admin_login (default: 10)
+    --records N              Clients, services and invoices to seed (default: 1000)
+    --only TEXT              Run only cases whose name contains TEXT
+    --save-baseline          Store results as the baseline for this engine
+    --tolerance FRACTION     Allowed growth of allocations and response size (default: 0.25)
+    --timings                Also compare timings with this machine's timings.json
+    --timing-tolerance FRACTION
+                             Allowed slowdown with --timings (default: 0.25)
+
+Examples:
+    python dev_tools/bench/bench.py
+    python dev_tools/bench/bench.py --db postgresql --mode server
+    python dev_tools/bench/bench.py --save-baseline
+    python dev_tools/bench/bench.py --timings --timing-tolerance 0.5
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SRC_DIR = PROJECT_ROOT / 'src'
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+# Per machine, not committed (see .gitignore)
+DEFAULT_TIMINGS = Path(__file__).resolve().parent / 'timings.json'
+
+# Machine-independent metrics stored in the committed baseline; the rest are timings
+BASELINE_METRICS = ('statuses', 'queries', 'alloc_kib', 'bytes')
+
+BENCH_USERNAME = 'bench-admin'
+BENCH_PASSWORD = 'bench-password-123'
+
+# Differences below these floors are noise, not regressions
+MIN_LATENCY_DELTA_MS = 0.5
+MIN_ALLOC_DELTA_KIB = 16
+MIN_BYTES_DELTA = 1024
+
+CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+# admin_panel URLs: logout would end the shared benchmark session
+SKIPPED_URLS = ('admin_logout',)
+ANONYMOUS_URLS = ('admin_login',)
+# Query strings for pages that do nothing without one (matches seeded records)
+URL_QUERIES = {
+    'admin_search': {'q': 'First1'},
+    'admin_search_suggest': {'q': 'First1'},
+}
+
+
+# Colors for output
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    BLUE = '\033[0;34m'
+    NC = '\033[0m'  # No Color
+
+def print_info(message: str) -> None:
+    print(f"{Colors.BLUE}[INFO]{Colors.NC} {message}")
+
+def print_success(message: str) -> None:
+    print(f"{Colors.GREEN}[SUCCESS]{Colors.NC} {message}")
+
+def print_warning(message: str) -> None:
+    print(f"{Colors.YELLOW}[WARNING]{Colors.NC} {message}")
+
+def print_error(message: str) -> None:
+    print(f"{Colors.RED}[ERROR]{Colors.NC} {message}")
+
+
+def configure_environment(db_engine: str) -> None:
+    """Environment for whmcs_project.settings, must run before importing Django"""
+    os.environ['DB_ENGINE'] = db_engine
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'whmcs_project.settings')
+    # dev_dashboard URLs exist only when DEBUG is on at import time
+    os.environ.setdefault('DEBUG', 'True')
+    # Measure the application, not the instrumentation
+    os.environ.setdefault('PROFILING_ENABLED', 'False')
+    os.environ.setdefault('QUERYLOG_ENABLED', 'False')
+    sys.path.insert(0, str(SRC_DIR))
+
+
+@dataclass
+class Case:
+    """One benchmarked request: a named URL with method and auth state"""
+    name: str
+    method: str
+    path: str
+    auth: bool
+    data: Optional[dict] = None
+
+    @property
+    def key(self) -> str:
+        return f'{self.method} {self.name}'
+
+
+@dataclass
+class CaseResult:
+    key: str
+    requests: int = 0
+    rps: float = 0.0
+    p50_ms: float = 0.0
+    p95_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+    queries: Optional[int] = None
+    alloc_kib: Optional[float] = None
+    bytes: Optional[int] = None
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {name: value for name, value in self.__dict__.items() if name != 'key'}
+
+
+def build_cases(only: Optional[str]) -> List[Case]:
+    from django.urls import reverse
+    from admin_panel import urls as admin_urls
+    from dev_dashboard import urls as dev_urls
+
+    credentials = {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}
+    cases = []
+    # admin_login is routed twice ('' and 'login/'): one case per name
+    names = list(dict.fromkeys(pattern.name for pattern in admin_urls.urlpatterns if pattern.name not in SKIPPED_URLS))
+    for name in names:
+        path = reverse(name)
+        if name in URL_QUERIES:
+            path += '?' + urllib.parse.urlencode(URL_QUERIES[name])
+        cases.append(Case(name, 'GET', path, auth=name not in ANONYMOUS_URLS))
+        if name == 'admin_login':
+            cases.append(Case(name, 'POST', path, auth=False, data=credentials))
+    for pattern in dev_urls.urlpatterns:
+        name = f'{dev_urls.app_name}:{pattern.name}'
+        cases.append(Case(name, 'GET', reverse(name), auth=True))
+
+    if only:
+        cases = [case for case in cases if only in case.key]
+    return cases
+
+
+def seed_database(users: int, records: int) -> None:
+    """Benchmark user, extra users and records for the list and search pages"""
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from admin_panel import search
+    from lists_bench import seed_records
+
+    User.objects.create_user(BENCH_USERNAME, password=BENCH_PASSWORD, is_staff=True, is_superuser=True)
+    password = make_password(None)
+    User.objects.bulk_create(
+        [User(username=f'bench-user-{index}', password=password) for index in range(users)],
+        batch_size=1000,
+    )
+    if records:
+        seed_records(records, records, records)
+        search.rebuild()
+
+
+def summarize(case: Case, latencies: List[float], elapsed: float, statuses: Dict[str, int]) -> CaseResult:
+    from whmcs_project.profiling import percentile
+
+    latencies = sorted(latencies)
+    return CaseResult(
+        key=case.key,
+        requests=len(latencies),
+        rps=round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        p50_ms=round(percentile(latencies, 50), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        max_ms=round(latencies[-1], 3),
+        statuses=statuses,
+    )
+
+
+# Test client harness
+
+class ClientBench:
+    """In-process requests through django.test.Client"""
+
+    def __init__(self):
+        from django.test import Client
+
+        self.make_client = Client
+        self.auth_client = Client()
+        if not self.auth_client.login(username=BENCH_USERNAME, password=BENCH_PASSWORD):
+            raise RuntimeError('Could not log in the benchmark user')
+
+    def _request(self, case: Case) -> Callable:
+        if case.method == 'POST':
+            # Logged-in clients are redirected before the form is processed
+            def request():
+                return self.make_client().post(case.path, case.data)
+        else:
+            client = self.auth_client if case.auth else self.make_client()
+
+            def request():
+                return client.get(case.path)
+        return request
+
+    def run(self, case: Case, iterations: int, warmup: int, instrumented: int) -> CaseResult:
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        request = self._request(case)
+        for _ in range(warmup):
+            request()
+
+        latencies, statuses = [], {}
+        started = time.perf_counter()
+        for _ in range(iterations):
+            request_started = time.perf_counter()
+            status = request().status_code
+            latencies.append((time.perf_counter() - request_started) * 1000)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        result = summarize(case, latencies, time.perf_counter() - started, statuses)
+
+        # Separate pass: query capture and tracemalloc distort the timings
+        queries, allocations, sizes = [], [], []
+        tracemalloc.start()
+        try:
+            for _ in range(instrumented):
+                tracemalloc.reset_peak()
+                before, _peak = tracemalloc.get_traced_memory()
+                with CaptureQueriesContext(connection) as captured:
+                    response = request()
+                _current, peak = tracemalloc.get_traced_memory()
+                queries.append(len(captured))
+                allocations.append((peak - before) / 1024)
+                sizes.append(len(response.content))
+        finally:
+            tracemalloc.stop()
+        if queries:
+            result.queries = int(statistics.median(queries))
+            result.alloc_kib = round(statistics.median(allocations), 1)
+            result.bytes = int(statistics.median(sizes))
+        return result
+
+
+# Real server harness
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class ServerBench:
+    """Requests over HTTP to a threaded WSGI server in this process"""
+
+    def __init__(self, concurrency: int):
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        self.concurrency = concurrency
+        self.server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler)
+        self.server.set_app(get_internal_wsgi_application())
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever, name='bench-server', daemon=True)
+        self.thread.start()
+        # One logged-in session per worker thread
+        self._local = threading.local()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _opener(self):
+        return urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), NoRedirect,
+        )
+
+    def _open(self, opener, path: str, data: Optional[dict] = None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        try:
+            with opener.open(self.base_url + path, body, timeout=30) as response:
+                return response.status, response.read().decode('utf-8', 'replace')
+        except urllib.error.HTTPError as e:
+            return e.code, e.read().decode('utf-8', 'replace')
+
+    def _login_form(self, opener, path: str) -> dict:
+        _status, html = self._open(opener, path)
+        match = CSRF_INPUT_RE.search(html)
+        if match is None:
+            raise RuntimeError(f'No CSRF token in {path}')
+        return {'csrfmiddlewaretoken': match.group(1)}
+
+    def _auth_opener(self, login_path: str):
+        opener = getattr(self._local, 'opener', None)
+        if opener is None:
+            opener = self._opener()
+            form = self._login_form(opener, login_path)
+            status, _html = self._open(opener, login_path, form | {
+                'username': BENCH_USERNAME, 'password': BENCH_PASSWORD,
+            })
+            if status != 302:
+                raise RuntimeError(f'Could not log in the benchmark user (HTTP {status})')
+            self._local.opener = opener
+        return opener
+
+    def _timed(self, case: Case, login_path: str) -> tuple:
+        if case.method == 'POST':
+            # The CSRF token rotates on login: fetch a fresh form outside the timing
+            opener = self._opener()
+            data = self._login_form(opener, case.path) | case.data
+        else:
+            opener = self._auth_opener(login_path) if case.auth else self._opener()
+            data = None
+        started = time.perf_counter()
+        status, _body = self._open(opener, case.path, data)
+        return (time.perf_counter() - started) * 1000, status
+
+    def run(self, case: Case, iterations: int, warmup: int, login_path: str) -> CaseResult:
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            list(pool.map(lambda _: self._timed(case, login_path), range(warmup)))
+            started = time.perf_counter()
+            timings = list(pool.map(lambda _: self._timed(case, login_path), range(iterations)))
+            elapsed = time.perf_counter() - started
+
+        statuses = {}
+        for _latency, status in timings:
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+        return summarize(case, [latency for latency, _status in timings], elapsed, statuses)
+
+
+# Baseline comparison
+
+def split_results(results: dict) -> tuple:
+    """Splits results into machine-independent metrics and timings"""
+    metrics, timings = {}, {}
+    for mode, cases in results.items():
+        metrics[mode], timings[mode] = {}, {}
+        for key, values in cases.items():
+            metrics[mode][key] = {name: value for name, value in values.items() if name in BASELINE_METRICS}
+            timings[mode][key] = {name: value for name, value in values.items() if name not in BASELINE_METRICS}
+    return metrics, timings
+
+
+def _grew(current: Optional[float], base: Optional[float], tolerance: float, floor: float) -> bool:
+    return current is not None and base is not None \
+        and current > base * (1 + tolerance) and current - base > floor
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of machine-independent metrics against the committed baseline"""
+    regressions = []
+    for mode, cases in results.items():
+        for key, current in cases.items():
+            base = baseline.get(mode, {}).get(key)
+            if base is None:
+                continue
+            label = f'{mode}: {key}'
+            if sorted(current['statuses']) != sorted(base['statuses']):
+                regressions.append(f"{label}: statuses {sorted(base['statuses'])} -> {sorted(current['statuses'])}")
+            if current['queries'] is not None and base.get('queries') is not None \
+                    and current['queries'] > base['queries']:
+                regressions.append(f"{label}: queries {base['queries']} -> {current['queries']}")
+            if _grew(current['alloc_kib'], base.get('alloc_kib'), tolerance, MIN_ALLOC_DELTA_KIB):
+                regressions.append(f"{label}: alloc {base['alloc_kib']:.1f} -> {current['alloc_kib']:.1f} KiB")
+            if _grew(current.get('bytes'), base.get('bytes'), tolerance, MIN_BYTES_DELTA):
+                regressions.append(f"{label}: response {base['bytes']} -> {current['bytes']} bytes")
+    return regressions
+
+
+def compare_timings(results: dict, timings: dict, tolerance: float) -> List[str]:
+    """Slowdowns against timings stored on this machine"""
+    regressions = []
+    for mode, cases in results.items():
+        for key, current in cases.items():
+            base = timings.get(mode, {}).get(key)
+            if base is None:
+                continue
+            label = f'{mode}: {key}'
+            for metric in ('p50_ms', 'p95_ms'):
+                if _grew(current[metric], base[metric], tolerance, MIN_LATENCY_DELTA_MS):
+                    regressions.append(f'{label}: {metric} {base[metric]:.2f} -> {current[metric]:.2f}')
+            if current['rps'] < base['rps'] / (1 + tolerance):
+                regressions.append(f"{label}: rps {base['rps']:.1f} -> {current['rps']:.1f}")
+    return regressions
+
+
+def print_table(mode: str, results: List[CaseResult]) -> None:
+    print(f"\n{Colors.BLUE}{mode}{Colors.NC}")
+    header = (f"{'case':<44} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'queries':>8} "
+              f"{'alloc KiB':>10} {'bytes':>8}  status")
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        queries = '-' if result.queries is None else str(result.queries)
+        alloc = '-' if result.alloc_kib is None else f'{result.alloc_kib:.1f}'
+        size = '-' if result.bytes is None else str(result.bytes)
+        statuses = ','.join(f'{status}x{count}' for status, count in sorted(result.statuses.items()))
+        print(f'{result.key:<44} {result.rps:>9.1f} {result.p50_ms:>9.2f} {result.p95_ms:>9.2f} '
+              f'{result.p99_ms:>9.2f} {result.max_ms:>9.2f} {queries:>8} {alloc:>10} {size:>8}  {statuses}')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Benchmark admin_panel and dev_dashboard request paths')
+    parser.add_argument('--db', choices=['sqlite', 'postgresql'], default='sqlite')
+    parser.add_argument('--mode', choices=['client', 'server', 'all'], default='all')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--login-iterations', type=int, default=10,
+                        help='POST admin_login hashes a password per request')
+    parser.add_argument('--warmup', type=int, default=10, help='untimed requests per case before timing')
+    parser.add_argument('--instrumented', type=int, default=5,
+                        help='requests per case for query counts and allocations')
+    parser.add_argument('--concurrency', type=int, default=4, help='server mode worker threads')
+    parser.add_argument('--users', type=int, default=1000, help='extra users in the test database')
+    parser.add_argument('--records', type=int, default=1000,
+                        help='clients, services and invoices (each) in the test database')
+    parser.add_argument('--only', help='run only cases whose name contains this text')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed relative growth of allocations and response size')
+    parser.add_argument('--timings', type=Path, nargs='?', const=DEFAULT_TIMINGS,
+                        help=f'also compare timings with a baseline from this machine (default: {DEFAULT_TIMINGS.name})')
+    parser.add_argument('--timing-tolerance', type=float, default=0.25,
+                        help='allowed relative slowdown of p50/p95 and req/s with --timings')
+    parser.add_argument('--output', type=Path, help='write results as JSON')
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    configure_environment(args.db)
+
+    import django
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    django.setup()
+    setup_test_environment(debug=True)
+
+    if args.db == 'sqlite':
+        # File database: the server threads need their own connections
+        temp_dir = tempfile.TemporaryDirectory(prefix='whmcs-bench-')
+        connection.settings_dict['TEST']['NAME'] = str(Path(temp_dir.name) / 'bench.sqlite3')
+    print_info(f'Creating test database ({args.db})...')
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    results: Dict[str, Dict[str, dict]] = {}
+    try:
+        seed_database(args.users, args.records)
+        cases = build_cases(args.only)
+        if not cases:
+            print_error(f'No cases match "{args.only}"')
+            return 2
+        login_path = next(case.path for case in cases if case.name == 'admin_login') \
+            if any(case.name == 'admin_login' for case in cases) else '/panel/login/'
+
+        def iterations_for(case: Case) -> int:
+            return args.login_iterations if case.method == 'POST' else args.iterations
+
+        if args.mode in ('client', 'all'):
+            print_info(f'Test client: {len(cases)} cases x {args.iterations} requests')
+            bench = ClientBench()
+            client_results = [
+                bench.run(case, iterations_for(case), args.warmup, args.instrumented) for case in cases
+            ]
+            print_table('Test client', client_results)
+            results['client'] = {result.key: result.as_dict() for result in client_results}
+
+        if args.mode in ('server', 'all'):
+            print_info(f'Threaded WSGI server: {len(cases)} cases, concurrency {args.concurrency}')
+            server = ServerBench(args.concurrency)
+            try:
+                server_results = [
+                    server.run(case, iterations_for(case), args.warmup, login_path) for case in cases
+                ]
+            finally:
+                server.close()
+            print_table(f'WSGI server ({server.base_url})', server_results)
+            results['server'] = {result.key: result.as_dict() for result in server_results}
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    report = {
+        'meta': {
+            'db': args.db,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'iterations': args.iterations,
+            'concurrency': args.concurrency,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+
+    metrics, timings = split_results(results)
+    timings_path = args.timings or DEFAULT_TIMINGS
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    stored_timings = json.loads(timings_path.read_text()) if timings_path.exists() else {}
+    if args.save_baseline:
+        stored[args.db] = {'meta': {key: report['meta'][key] for key in ('db', 'python', 'django')},
+                           'results': metrics}
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + '\n')
+        print_success(f'Baseline for {args.db} saved to {args.baseline}')
+        stored_timings[args.db] = report | {'results': timings}
+        timings_path.write_text(json.dumps(stored_timings, indent=2, sort_keys=True) + '\n')
+        print_success(f'Timings for {args.db} saved to {timings_path} (this machine only)')
+        return 0
+
+    if args.db not in stored:
+        print_error(f'No {args.db} baseline in {args.baseline}: run with --save-baseline to create one')
+        return 1
+
+    regressions = compare(metrics, stored[args.db]['results'], args.tolerance)
+    if args.timings:
+        if args.db not in stored_timings:
+            print_error(f'No {args.db} timings in {timings_path}: run with --save-baseline on this machine first')
+            return 1
+        regressions += compare_timings(timings, stored_timings[args.db]['results'], args.timing_tolerance)
+    if regressions:
+        print_error(f'{len(regressions)} regression(s) against the baseline:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print_success('No regressions against the baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+WHMCS Admin Panel - List Pagination Benchmark
+
+Seeds a throwaway test database with enough clients, services and
+invoices to reach page --max-page of every admin list, then times
+fetching pages at increasing depth three ways:
+
+    keyset  - KeysetPaginator.page(cursor), what the list views use
+    offset  - the same projection with OFFSET/LIMIT, for comparison
+    view    - the full list view through the Django test client
+
+Keyset latency should stay flat from page 1 to the deepest page while
+OFFSET grows linearly. The run fails when the deepest keyset page is
+more than --max-ratio times slower than page 1.
+
+Usage:
+    python dev_tools/bench/lists_bench.py [options]
+
+Options:
+    --db sqlite|postgresql   Database engine (default: sqlite)
+    --max-page N             Deepest page to seed and measure (default: 10000)
+    --lists NAMES            Comma-separated lists (default: clients,services,invoices)
+    --iterations N           Timed fetches per page (default: 20)
+    --max-ratio X            Allowed deepest/first page keyset slowdown (default: 3.0)
+
+Examples:
+    python dev_tools/bench/lists_bench.py
+    python dev_tools/bench/lists_bench.py --db postgresql --max-page 100000
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+SRC_DIR = PROJECT_ROOT / 'src'
+
+BENCH_USERNAME = 'bench-admin'
+BENCH_PASSWORD = 'bench-password-123'
+
+LISTS = ('clients', 'services', 'invoices')
+
+# Differences below this floor are noise, not a growing latency
+MIN_LATENCY_DELTA_MS = 1.0
+
+
+# Colors for output
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    BLUE = '\033[0;34m'
+    NC = '\033[0m'  # No Color
+
+def print_info(message: str) -> None:
+    print(f"{Colors.BLUE}[INFO]{Colors.NC} {message}")
+
+def print_success(message: str) -> None:
+    print(f"{Colors.GREEN}[SUCCESS]{Colors.NC} {message}")
+
+def print_warning(message: str) -> None:
+    print(f"{Colors.YELLOW}[WARNING]{Colors.NC} {message}")
+
+def print_error(message: str) -> None:
+    print(f"{Colors.RED}[ERROR]{Colors.NC} {message}")
+
+
+def configure_environment(db_engine: str) -> None:
+    """Environment for whmcs_project.settings, must run before importing Django"""
+    os.environ['DB_ENGINE'] = db_engine
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'whmcs_project.settings')
+    os.environ.setdefault('PROFILING_ENABLED', 'False')
+    os.environ.setdefault('QUERYLOG_ENABLED', 'False')
+    sys.path.insert(0, str(SRC_DIR))
+
+
+def seed_database(clients: int, services: int = 0, invoices: int = 0) -> None:
+    """The benchmark user plus seed_records()"""
+    from django.contrib.auth.models import User
+
+    User.objects.create_user(BENCH_USERNAME, password=BENCH_PASSWORD, is_staff=True, is_superuser=True)
+    seed_records(clients, services, invoices)
+
+
+def seed_records(clients: int, services: int = 0, invoices: int = 0) -> None:
+    """Clients, services and invoices with explicit ids (bulk_create, no signals)"""
+    from admin_panel.importer import reset_sequences
+    from admin_panel.models import Client, Invoice, Service
+    from admin_panel.summary import rebuild
+
+    start = date(2015, 1, 1)
+    batch = 10000
+    statuses = {
+        Client: Client.Status.values,
+        Service: Service.Status.values,
+        Invoice: Invoice.Status.values,
+    }
+
+    def make_client(pk):
+        return Client(id=pk, first_name=f'First{pk}', last_name=f'Last{pk}', email=f'client{pk}@example.com',
+                      status=statuses[Client][pk % len(statuses[Client])],
+                      created_at=start + timedelta(days=pk % 3650))
+
+    def make_service(pk):
+        return Service(id=pk, client_id=pk % clients + 1, product='Shared Hosting', domain=f'site{pk}.example',
+                       status=statuses[Service][pk % len(statuses[Service])], billing_cycle='Monthly',
+                       amount=Decimal('9.99'), registration_date=start, next_due_date=start)
+
+    def make_invoice(pk):
+        # ~50 invoices per day: many equal dates in the (date, id) key
+        day = start + timedelta(days=pk // 50)
+        return Invoice(id=pk, client_id=pk % clients + 1, number=f'INV-{pk}', date=day, due_date=day,
+                       subtotal=Decimal('10.00'), total=Decimal('12.00'),
+                       status=statuses[Invoice][pk % len(statuses[Invoice])])
+
+    plan = [(Client, make_client, clients), (Service, make_service, services), (Invoice, make_invoice, invoices)]
+    plan = [(model, make, count) for model, make, count in plan if count]
+
+    for model, make, count in plan:
+        started = time.perf_counter()
+        for offset in range(0, count, batch):
+            model.objects.bulk_create([make(pk) for pk in range(offset + 1, min(offset + batch, count) + 1)])
+        print_info(f'Seeded {count} {model._meta.verbose_name_plural} in {time.perf_counter() - started:.1f}s')
+
+    reset_sequences([model for model, _make, _count in plan])
+    rebuild()
+
+
+def list_specs() -> Dict[str, dict]:
+    """The same projections and orderings as admin_panel.views"""
+    from admin_panel.models import Client, Invoice, Service
+
+    return {
+        'clients': {
+            'url': 'admin_clients',
+            'queryset': Client.objects.values('id', 'first_name', 'last_name', 'company_name', 'email', 'status',
+                                              'created_at'),
+            'ordering': ('-id',),
+        },
+        'services': {
+            'url': 'admin_services',
+            'queryset': Service.objects.values('id', 'client_id', 'client__first_name', 'client__last_name',
+                                               'product', 'domain', 'status', 'billing_cycle', 'amount',
+                                               'next_due_date'),
+            'ordering': ('-id',),
+        },
+        'invoices': {
+            'url': 'admin_invoices',
+            'queryset': Invoice.objects.values('id', 'number', 'client_id', 'client__first_name',
+                                               'client__last_name', 'date', 'due_date', 'total', 'status'),
+            'ordering': ('-date', '-id'),
+        },
+    }
+
+
+def median_ms(function: Callable[[], object], iterations: int) -> float:
+    function()  # warmup
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def bench_list(spec: dict, pages: List[int], iterations: int, http_client) -> List[dict]:
+    from django.urls import reverse
+    from admin_panel.pagination import NEXT, PER_PAGE, KeysetPaginator
+
+    queryset, ordering = spec['queryset'], spec['ordering']
+    paginator = KeysetPaginator(queryset, ordering)
+    url = reverse(spec['url'])
+    results = []
+    for page in pages:
+        offset = (page - 1) * PER_PAGE
+        cursor = None
+        if offset:
+            # The cursor for a page is the key of the last row of the previous one (not timed)
+            previous_row = queryset.order_by(*ordering)[offset - 1]
+            cursor = paginator.encode(NEXT, previous_row)
+
+        keyset_rows = [row['id'] for row in paginator.page(cursor)]
+        offset_rows = [row['id'] for row in queryset.order_by(*ordering)[offset:offset + PER_PAGE]]
+        if keyset_rows != offset_rows:
+            raise RuntimeError(f'page {page}: keyset and OFFSET pages differ')
+
+        results.append({
+            'page': page,
+            'keyset_ms': median_ms(lambda: list(paginator.page(cursor)), iterations),
+            'offset_ms': median_ms(lambda: list(queryset.order_by(*ordering)[offset:offset + PER_PAGE]),
+                                   iterations),
+            'view_ms': median_ms(lambda: http_client.get(url, {'cursor': cursor} if cursor else {}), iterations),
+        })
+    return results
+
+
+def print_table(name: str, results: List[dict]) -> None:
+    print(f"\n{Colors.BLUE}{name}{Colors.NC}")
+    header = f"{'page':>8} {'keyset ms':>11} {'offset ms':>11} {'view ms':>11}"
+    print(header)
+    print('-' * len(header))
+    for row in results:
+        print(f"{row['page']:>8} {row['keyset_ms']:>11.2f} {row['offset_ms']:>11.2f} {row['view_ms']:>11.2f}")
+
+
+def check_flat(results: Dict[str, List[dict]], max_ratio: float) -> List[str]:
+    """Lists whose deepest keyset page is more than max_ratio times slower than the first"""
+    problems = []
+    for name, rows in results.items():
+        first, deepest = rows[0], rows[-1]
+        for metric in ('keyset_ms', 'view_ms'):
+            if deepest[metric] > first[metric] * max_ratio \
+                    and deepest[metric] - first[metric] > MIN_LATENCY_DELTA_MS:
+                problems.append(f"{name}: {metric} page {first['page']} {first[metric]:.2f} -> "
+                                f"page {deepest['page']} {deepest[metric]:.2f}")
+    return problems
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Benchmark keyset pagination of the admin lists')
+    parser.add_argument('--db', choices=['sqlite', 'postgresql'], default='sqlite')
+    parser.add_argument('--max-page', type=int, default=10000)
+    parser.add_argument('--lists', default=','.join(LISTS), help='comma-separated: ' + ', '.join(LISTS))
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--max-ratio', type=float, default=3.0)
+    parser.add_argument('--output', type=Path, help='write results as JSON')
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    lists = [name.strip() for name in args.lists.split(',') if name.strip()]
+    unknown = set(lists) - set(LISTS)
+    if unknown or not lists:
+        print_error(f'Unknown lists: {", ".join(sorted(unknown)) or "(none)"}')
+        return 2
+    configure_environment(args.db)
+
+    import django
+    from django.db import connection
+    from django.test import Client as HttpClient
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    django.setup()
+    setup_test_environment()
+
+    from admin_panel.pagination import PER_PAGE
+
+    pages = sorted({1, *(page for page in (10, 100, 1000, 10000, 100000) if page < args.max_page),
+                    args.max_page})
+    rows = args.max_page * PER_PAGE
+
+    if args.db == 'sqlite':
+        temp_dir = tempfile.TemporaryDirectory(prefix='whmcs-lists-bench-')
+        connection.settings_dict['TEST']['NAME'] = str(Path(temp_dir.name) / 'bench.sqlite3')
+    print_info(f'Creating test database ({args.db})...')
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    results: Dict[str, List[dict]] = {}
+    try:
+        # Services and invoices reference the first clients; the client list needs them all
+        seed_database(
+            clients=rows if 'clients' in lists else min(rows, 1000),
+            services=rows if 'services' in lists else 0,
+            invoices=rows if 'invoices' in lists else 0,
+        )
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                # Visibility map and statistics for index-only scans, as after autovacuum
+                cursor.execute('VACUUM ANALYZE')
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        http_client = HttpClient()
+        if not http_client.login(username=BENCH_USERNAME, password=BENCH_PASSWORD):
+            raise RuntimeError('Could not log in the benchmark user')
+
+        specs = list_specs()
+        for name in lists:
+            print_info(f'{name}: pages {", ".join(map(str, pages))} x {args.iterations} fetches')
+            results[name] = bench_list(specs[name], pages, args.iterations, http_client)
+            print_table(name, results[name])
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    if args.output:
+        args.output.write_text(json.dumps({
+            'meta': {
+                'db': args.db,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'rows': rows,
+                'per_page': PER_PAGE,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            },
+            'results': results,
+        }, indent=2) + '\n')
+
+    problems = check_flat(results, args.max_ratio)
+    if problems:
+        print_error('Keyset page latency grows with depth:')
+        for line in problems:
+            print(f'  {line}')
+        return 1
+    print_success(f'Keyset page latency is flat up to page {args.max_page}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
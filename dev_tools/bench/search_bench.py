@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+WHMCS Admin Panel - Navbar Search Benchmark
+
+Seeds a throwaway test database with --clients clients (plus 100k
+services and invoices), builds the search index with
+admin_panel.search.rebuild() and times typical type-ahead queries:
+name prefixes, email and domain fragments and invoice numbers.
+
+On PostgreSQL the run fails when a query's p95 exceeds --budget-ms
+(50 ms by default). SQLite has no tsvector/trigram indexes and scans
+the table, so there the numbers are informational only.
+
+Usage:
+    python dev_tools/bench/search_bench.py [options]
+
+Options:
+    --db sqlite|postgresql   Database engine (default: sqlite)
+    --clients N              Clients to seed (default: 1000000)
+    --iterations N           Timed searches per query (default: 50)
+    --budget-ms MS           Allowed p95 per query on PostgreSQL (default: 50)
+
+Examples:
+    python dev_tools/bench/search_bench.py --db postgresql
+    python dev_tools/bench/search_bench.py --clients 100000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from lists_bench import (Colors, configure_environment, print_error, print_info, print_success, print_warning,
+                         seed_database)
+
+# Typical type-ahead input: name prefixes, email/domain fragments, invoice numbers
+QUERIES = (
+    'First12345',
+    'Last99',
+    'client77777@',
+    'site4242',
+    'example',
+    'INV-31337',
+    'fi',
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Benchmark the navbar search')
+    parser.add_argument('--db', choices=['sqlite', 'postgresql'], default='sqlite')
+    parser.add_argument('--clients', type=int, default=1_000_000)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    configure_environment(args.db)
+
+    import django
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    django.setup()
+    setup_test_environment()
+
+    from admin_panel import search
+    from whmcs_project.profiling import percentile
+
+    if args.db == 'sqlite':
+        temp_dir = tempfile.TemporaryDirectory(prefix='whmcs-search-bench-')
+        connection.settings_dict['TEST']['NAME'] = str(Path(temp_dir.name) / 'bench.sqlite3')
+    print_info(f'Creating test database ({args.db})...')
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    over_budget = []
+    try:
+        related = min(args.clients, 100_000)
+        seed_database(clients=args.clients, services=related, invoices=related)
+
+        started = time.perf_counter()
+        documents = search.rebuild()
+        print_info(f'Indexed {documents} documents in {time.perf_counter() - started:.1f}s')
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM ANALYZE')
+
+        print(f"\n{Colors.BLUE}search ({args.db}, {args.clients} clients){Colors.NC}")
+        header = f"{'query':<16} {'results':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"
+        print(header)
+        print('-' * len(header))
+        for query in QUERIES:
+            results = len(search.search(query))
+            timings = []
+            for _ in range(args.iterations):
+                query_started = time.perf_counter()
+                search.search(query)
+                timings.append((time.perf_counter() - query_started) * 1000)
+            timings.sort()
+            p95 = percentile(timings, 95)
+            print(f'{query:<16} {results:>8} {percentile(timings, 50):>9.2f} {p95:>9.2f} {timings[-1]:>9.2f}')
+            if p95 > args.budget_ms:
+                over_budget.append(f'{query}: p95 {p95:.2f} ms')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    if over_budget and args.db == 'postgresql':
+        print_error(f'Queries over the {args.budget_ms:.0f} ms budget:')
+        for line in over_budget:
+            print(f'  {line}')
+        return 1
+    if over_budget:
+        print_warning(f'{len(over_budget)} queries over {args.budget_ms:.0f} ms: SQLite scans without '
+                      f'tsvector/trigram indexes, run with --db postgresql to check the budget')
+        return 0
+    print_success(f'All queries within {args.budget_ms:.0f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+WHMCS Admin Panel - Translation Toolchain Benchmarks
+
+Generates synthetic projects with catalogs of 1k, 10k and 100k entries
+(plurals, multi-line strings, fuzzy and untranslated entries) across up
+to 20 locales, then runs the `stats`, `test`, `fix-english` and `update`
+commands of dev_tools/translations.py end to end, each in a fresh
+process. Wall time and peak RSS are compared with the stored JSON
+baseline (regressions and sizes without a baseline make the run fail).
+
+Usage:
+    python dev_tools/bench/translations_bench.py [options]
+
+Options:
+    --sizes N,N,...          Catalog sizes (default: 1000,10000, the committed baseline)
+    --locales N              Locales per project, at most 20 (default: 20)
+    --commands a,b,...       Commands to time (default: all)
+    --repeat N               Runs per command, the fastest is kept (default: 1)
+    --save-baseline          Store results as the baseline
+    --tolerance FRACTION     Allowed slowdown before failing (default: 0.25)
+
+Examples:
+    python dev_tools/bench/translations_bench.py --sizes 1000,10000 --locales 5
+    python dev_tools/bench/translations_bench.py --sizes 100000 --save-baseline
+    python dev_tools/bench/translations_bench.py --save-baseline
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent.parent
+SRC_DIR = PROJECT_ROOT / 'src'
+DEFAULT_BASELINE = BENCH_DIR / 'translations_baseline.json'
+
+LOCALES = [
+    'en', 'uk', 'de', 'fr', 'es', 'it', 'pl', 'cs', 'sk', 'ro',
+    'hu', 'nl', 'pt', 'sv', 'da', 'fi', 'nb', 'bg', 'hr', 'sl',
+]
+
+# update-warm: second update on an unchanged tree (extraction and .mo caches hit)
+COMMANDS = ['stats', 'test', 'fix-english', 'update', 'update-warm']
+
+MESSAGES_PER_FILE = 500
+
+# Differences below these floors are noise, not regressions
+MIN_TIME_DELTA_S = 0.05
+MIN_RSS_DELTA_MIB = 8
+
+sys.path.insert(0, str(SRC_DIR))
+
+from whmcs_project.i18n.po import POCatalog, POEntry  # noqa: E402
+
+
+# Colors for output
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    BLUE = '\033[0;34m'
+    NC = '\033[0m'  # No Color
+
+def print_info(message: str) -> None:
+    print(f"{Colors.BLUE}[INFO]{Colors.NC} {message}")
+
+def print_success(message: str) -> None:
+    print(f"{Colors.GREEN}[SUCCESS]{Colors.NC} {message}")
+
+def print_warning(message: str) -> None:
+    print(f"{Colors.YELLOW}[WARNING]{Colors.NC} {message}")
+
+def print_error(message: str) -> None:
+    print(f"{Colors.RED}[ERROR]{Colors.NC} {message}")
+
+
+# Synthetic project
+
+def message(index: int) -> POEntry:
+    """Source message number `index`: every 10th is plural, every 7th multi-line"""
+    if index % 10 == 0:
+        return POEntry(msgid=f'%(count)s service for client {index}',
+                       msgid_plural=f'%(count)s services for client {index}', flags=['python-format'])
+    if index % 7 == 0:
+        return POEntry(msgid=f'Invoice {index} is overdue.\nPlease review the payment details\nand contact billing.')
+    return POEntry(msgid=f'Manage hosting account settings, entry {index}')
+
+
+def translate(entry: POEntry, lang: str, index: int) -> POEntry:
+    """Catalog entry: every 11th untranslated, every 13th fuzzy"""
+    entry = POEntry(msgid=entry.msgid, msgid_plural=entry.msgid_plural, flags=list(entry.flags),
+                    references=[f'generated/messages_{index // MESSAGES_PER_FILE:04d}.py:{index % MESSAGES_PER_FILE + 1}'])
+    if index % 11 == 0:
+        if entry.is_plural:
+            entry.msgstr_plural = {0: '', 1: ''}
+        return entry
+    if entry.is_plural:
+        entry.msgstr_plural = {0: f'[{lang}] {entry.msgid}', 1: f'[{lang}] {entry.msgid_plural}'}
+    else:
+        entry.msgstr = f'[{lang}] {entry.msgid}'
+    if index % 13 == 0:
+        entry.set_fuzzy(True)
+    return entry
+
+
+def header(lang: str) -> POEntry:
+    return POEntry(msgid='', msgstr=(
+        'Project-Id-Version: WHMCS Admin Panel\n'
+        'POT-Creation-Date: 2025-01-01 00:00+0000\n'
+        f'Language: {lang}\n'
+        'MIME-Version: 1.0\n'
+        'Content-Type: text/plain; charset=UTF-8\n'
+        'Content-Transfer-Encoding: 8bit\n'
+        'Plural-Forms: nplurals=2; plural=(n != 1);\n'
+    ))
+
+
+def generate_project(root: Path, size: int, locales: List[str]) -> None:
+    """Sources with `size` messages and a django.po per locale"""
+    src_dir = root / 'src'
+    (src_dir / 'generated').mkdir(parents=True)
+    # TranslationManager.check_environment() looks for manage.py
+    (src_dir / 'manage.py').write_text('')
+
+    messages = [message(index) for index in range(size)]
+    for start in range(0, size, MESSAGES_PER_FILE):
+        lines = ['from django.utils.translation import gettext as _, ngettext\n', '\n']
+        for entry in messages[start:start + MESSAGES_PER_FILE]:
+            if entry.is_plural:
+                lines.append(f'ngettext({entry.msgid!r}, {entry.msgid_plural!r}, count)\n')
+            else:
+                lines.append(f'_({entry.msgid!r})\n')
+        (src_dir / 'generated' / f'messages_{start // MESSAGES_PER_FILE:04d}.py').write_text(''.join(lines))
+
+    for lang in locales:
+        catalog = POCatalog([header(lang)] + [translate(entry, lang, index) for index, entry in enumerate(messages)])
+        po_dir = src_dir / 'locale' / lang / 'LC_MESSAGES'
+        po_dir.mkdir(parents=True)
+        catalog.save(po_dir / 'django.po')
+
+
+# Command runner (executed in a child process)
+
+def run_command(root: Path, command: str, locales: List[str]) -> int:
+    sys.path.insert(0, str(BENCH_DIR.parent))
+    import translations
+
+    class SyntheticTranslationManager(translations.TranslationManager):
+        SUPPORTED_LANGUAGES = locales
+        PROJECT_ROOT = root
+        SRC_DIR = root / 'src'
+        LOCALE_DIR = root / 'src' / 'locale'
+        CACHE_DIR = root / '.cache'
+
+    manager = SyntheticTranslationManager()
+    actions = {
+        'stats': manager.show_stats,
+        'test': manager.test_translations,
+        'fix-english': manager.fix_english_translations,
+        'update': manager.update_translations,
+    }
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return 0 if actions[command]() else 1
+
+
+def timed_run(root: Path, command: str, locales: List[str]) -> Dict[str, float]:
+    """Wall time and peak RSS of one command in a fresh interpreter"""
+    started = time.perf_counter()
+    process = subprocess.Popen([
+        sys.executable, __file__, '--run-command', command, '--root', str(root), '--locales-list', ','.join(locales),
+    ])
+    # wait4 reports the peak RSS of this child (and its pool workers)
+    _pid, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f'{command} failed with exit code {process.returncode}')
+    return {'seconds': round(elapsed, 3), 'peak_rss_mib': round(usage.ru_maxrss / 1024, 1)}
+
+
+def bench_size(size: int, locales: List[str], commands: List[str], repeat: int, workdir: Path) -> Dict[str, dict]:
+    pristine = workdir / f'pristine-{size}'
+    print_info(f'Generating {size} entries x {len(locales)} locales...')
+    generate_project(pristine, size, locales)
+
+    results = {}
+    for command in commands:
+        runs = []
+        for _ in range(repeat):
+            root = workdir / f'run-{size}'
+            shutil.rmtree(root, ignore_errors=True)
+            shutil.copytree(pristine, root)
+            if command == 'update-warm':
+                timed_run(root, 'update', locales)
+                runs.append(timed_run(root, 'update', locales))
+            else:
+                runs.append(timed_run(root, command, locales))
+        best = min(runs, key=lambda run: run['seconds'])
+        best['peak_rss_mib'] = max(run['peak_rss_mib'] for run in runs)
+        results[command] = best
+        print(f"  {command:<12} {best['seconds']:>9.3f} s {best['peak_rss_mib']:>9.1f} MiB")
+    shutil.rmtree(pristine, ignore_errors=True)
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Regressions of the current run against the stored baseline"""
+    regressions = []
+    for scale, commands in results.items():
+        for command, current in commands.items():
+            base = baseline.get(scale, {}).get(command)
+            if base is None:
+                continue
+            label = f'{scale}: {command}'
+            if current['seconds'] > base['seconds'] * (1 + tolerance) \
+                    and current['seconds'] - base['seconds'] > MIN_TIME_DELTA_S:
+                regressions.append(f"{label}: {base['seconds']:.3f} s -> {current['seconds']:.3f} s")
+            if current['peak_rss_mib'] > base['peak_rss_mib'] * (1 + tolerance) \
+                    and current['peak_rss_mib'] - base['peak_rss_mib'] > MIN_RSS_DELTA_MIB:
+                regressions.append(f"{label}: {base['peak_rss_mib']:.1f} MiB -> {current['peak_rss_mib']:.1f} MiB")
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Benchmark dev_tools/translations.py on synthetic catalogs')
+    parser.add_argument('--sizes', default='1000,10000')
+    parser.add_argument('--locales', type=int, default=20, choices=range(1, len(LOCALES) + 1), metavar='N')
+    parser.add_argument('--commands', default=','.join(COMMANDS))
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--output', type=Path, help='write results as JSON')
+    parser.add_argument('--workdir', type=Path, help='directory for generated projects (default: temporary)')
+    # Internal: run one command in this process
+    parser.add_argument('--run-command', choices=['stats', 'test', 'fix-english', 'update'], help=argparse.SUPPRESS)
+    parser.add_argument('--root', type=Path, help=argparse.SUPPRESS)
+    parser.add_argument('--locales-list', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.run_command:
+        return run_command(args.root, args.run_command, args.locales_list.split(','))
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    commands = args.commands.split(',')
+    unknown = set(commands) - set(COMMANDS)
+    if unknown:
+        print_error(f"Unknown commands: {', '.join(sorted(unknown))} (available: {', '.join(COMMANDS)})")
+        return 2
+    locales = LOCALES[:args.locales]
+
+    results: Dict[str, Dict[str, dict]] = {}
+    with tempfile.TemporaryDirectory(prefix='whmcs-translations-bench-') as temp_dir:
+        workdir = args.workdir or Path(temp_dir)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for size in sizes:
+            scale = f'{size}x{len(locales)}'
+            print_info(f'Catalog {scale}:')
+            results[scale] = bench_size(size, locales, commands, args.repeat, workdir)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else None
+    if args.save_baseline:
+        if stored is not None:
+            # Scales that were not run keep their previous baseline
+            report['results'] = stored['results'] | results
+        args.baseline.write_text(json.dumps(report, indent=2, sort_keys=True) + '\n')
+        print_success(f'Baseline saved to {args.baseline}')
+        return 0
+
+    missing = [scale for scale in results if stored is None or scale not in stored['results']]
+    if missing:
+        print_error(f"No baseline for {', '.join(missing)} in {args.baseline}: "
+                    f"run with --save-baseline to create one")
+        return 1
+
+    regressions = compare(results, stored['results'], args.tolerance)
+    if regressions:
+        print_error(f'{len(regressions)} regression(s) against the baseline:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print_success('No regressions against the baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
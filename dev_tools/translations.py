@@ -9,7 +9,7 @@ Usage:
     python dev_tools/translations.py <command> [options]
 
 Commands:
-    update [lang]     - Update and compile translations
+    update [lang]     - Update and compile translations (--force to recompile all)
     test             - Test translation quality  
     fix-english      - Fix English translations (msgstr = msgid)
     add <code> <name> - Add new language support
@@ -25,13 +25,24 @@ Examples:
 """
 
 import argparse
+import json
 import os
 import sys
 import subprocess
 import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from whmcs_project.i18n.extract import (  # noqa: E402
+    ExtractionCache, build_template_catalog, extract_file, find_source_files, merge_po_file,
+)
+from whmcs_project.i18n.mo import COMPILER_VERSION, compile_catalog, file_hash  # noqa: E402
+from whmcs_project.i18n.po import POCatalog, POParseError  # noqa: E402
+
 # Colors for output
 class Colors:
     RED = '\033[0;31m'
@@ -59,9 +70,11 @@ class TranslationManager:
     PROJECT_ROOT = Path(__file__).parent.parent
     SRC_DIR = PROJECT_ROOT / 'src'
     LOCALE_DIR = SRC_DIR / 'locale'
+    CACHE_DIR = PROJECT_ROOT / 'dev_tools' / '.cache'
     
     def __init__(self):
         self.check_environment()
+        self._catalogs: Dict[str, Optional[POCatalog]] = {}
     
     def check_environment(self) -> None:
         """Check if we're in the right directory and environment"""
@@ -87,38 +100,151 @@ class TranslationManager:
         except Exception as e:
             return False, str(e)
     
+    def get_po_file(self, lang: str) -> Path:
+        """Path to the .po catalog of a language"""
+        return self.LOCALE_DIR / lang / 'LC_MESSAGES' / 'django.po'
+    
+    def load_catalog(self, lang: str) -> Optional[POCatalog]:
+        """Parse the .po catalog of a language once and reuse it across commands"""
+        if lang not in self._catalogs:
+            po_file = self.get_po_file(lang)
+            catalog = None
+            if po_file.exists():
+                try:
+                    catalog = POCatalog.from_file(po_file)
+                except (OSError, UnicodeDecodeError, POParseError) as e:
+                    print_error(f"Error reading {po_file}: {e}")
+            self._catalogs[lang] = catalog
+        return self._catalogs[lang]
+    
+    def invalidate_catalogs(self) -> None:
+        """Forget parsed catalogs after .po files were regenerated on disk"""
+        self._catalogs.clear()
+    
     def get_translation_stats(self, lang: str) -> Dict[str, int]:
         """Get translation statistics for a language"""
-        po_file = self.LOCALE_DIR / lang / 'LC_MESSAGES' / 'django.po'
+        catalog = self.load_catalog(lang)
         
-        if not po_file.exists():
-            return {'total': 0, 'translated': 0, 'empty': 0, 'fuzzy': 0}
+        if catalog is None:
+            return {'total': 0, 'translated': 0, 'empty': 0, 'fuzzy': 0, 'plural': 0, 'obsolete': 0}
         
+        return catalog.stats()
+    
+    def load_compile_state(self) -> Dict[str, Dict[str, str]]:
+        """Load content hashes of catalogs compiled by previous runs"""
+        state_file = self.CACHE_DIR / 'compiled.json'
         try:
-            with open(po_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Count different types of entries
-            total = len(re.findall(r'^msgid "([^"]*)"$', content, re.MULTILINE))
-            translated = len(re.findall(r'^msgstr "([^"]+)"$', content, re.MULTILINE))
-            empty = len(re.findall(r'^msgstr ""$', content, re.MULTILINE))
-            fuzzy = len(re.findall(r'^#, fuzzy', content, re.MULTILINE))
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        if state.get('compiler') != COMPILER_VERSION:
+            return {}
+        return state.get('catalogs', {})
+    
+    def save_compile_state(self, catalogs: Dict[str, Dict[str, str]]) -> None:
+        """Persist content hashes of compiled catalogs"""
+        self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        state_file = self.CACHE_DIR / 'compiled.json'
+        with open(state_file, 'w', encoding='utf-8') as f:
+            json.dump({'compiler': COMPILER_VERSION, 'catalogs': catalogs}, f, indent=2, sort_keys=True)
+    
+    def compile_translations(self, languages: Optional[List[str]] = None, force: bool = False) -> bool:
+        """Compile .po catalogs into .mo, skipping catalogs whose content has not changed"""
+        if languages is None:
+            languages = self.SUPPORTED_LANGUAGES
+        
+        state = self.load_compile_state()
+        pending: Dict[str, str] = {}
+        
+        for lang in languages:
+            po_file = self.get_po_file(lang)
+            if not po_file.exists():
+                print_warning(f"Translation file for {lang} not found, skipping compilation")
+                continue
             
-            # Subtract header msgid ""
-            if total > 0:
-                total -= 1
-                
-            return {
-                'total': total,
-                'translated': translated,
-                'empty': empty,
-                'fuzzy': fuzzy
-            }
-        except Exception as e:
-            print_error(f"Error reading {po_file}: {e}")
-            return {'total': 0, 'translated': 0, 'empty': 0, 'fuzzy': 0}
+            po_hash = file_hash(po_file)
+            mo_file = po_file.with_suffix('.mo')
+            cached = state.get(lang, {})
+            if (not force and cached.get('po') == po_hash and mo_file.exists()
+                    and cached.get('mo') == file_hash(mo_file)):
+                print_info(f"{lang}: catalog unchanged, skipping")
+                continue
+            pending[lang] = po_hash
+        
+        if not pending:
+            print_success("All compiled translations are up to date")
+            return True
+        
+        print_info(f"Compiling {len(pending)} catalog(s): {', '.join(pending)}")
+        po_files = [self.get_po_file(lang) for lang in pending]
+        
+        try:
+            if len(po_files) > 1:
+                with ProcessPoolExecutor(max_workers=min(len(po_files), os.cpu_count() or 1)) as pool:
+                    counts = list(pool.map(compile_catalog, po_files))
+            else:
+                counts = [compile_catalog(po_files[0])]
+        except (OSError, UnicodeDecodeError, POParseError) as e:
+            print_error(f"Error compiling translations: {e}")
+            return False
+        
+        for (lang, po_hash), po_file, count in zip(pending.items(), po_files, counts):
+            state[lang] = {'po': po_hash, 'mo': file_hash(po_file.with_suffix('.mo'))}
+            print_success(f"{lang}: compiled {count} messages")
+        
+        self.save_compile_state(state)
+        return True
     
-    def update_translations(self, languages: Optional[List[str]] = None) -> bool:
+    def extract_messages(self, use_cache: bool = True) -> POCatalog:
+        """Scan all sources once and build an in-memory template catalog"""
+        files = find_source_files(self.SRC_DIR)
+        messages = []
+        
+        if use_cache:
+            # Only files changed since the previous run are parsed again
+            with ExtractionCache(self.CACHE_DIR / 'extraction.sqlite3') as cache:
+                for path in files:
+                    messages.extend(cache.extract(path, self.SRC_DIR))
+                cache.prune(files, self.SRC_DIR)
+            print_info(f"Extraction cache: {cache.hits} files cached, {cache.misses} parsed")
+        else:
+            for path in files:
+                messages.extend(extract_file(path, self.SRC_DIR))
+        
+        template = build_template_catalog(messages)
+        print_success(f"Extracted {len(template)} messages from {len(files)} files")
+        return template
+    
+    def merge_translations(self, languages: List[str], template: POCatalog) -> bool:
+        """Merge the template catalog into every language's django.po concurrently"""
+        po_files = []
+        for lang in languages:
+            po_file = self.get_po_file(lang)
+            if not po_file.exists():
+                print_error(f"Translation file for {lang} not found: {po_file}")
+                print_info(f"Create it with: python dev_tools/translations.py add {lang} <name>")
+                return False
+            po_files.append(po_file)
+        
+        try:
+            if len(po_files) > 1:
+                with ProcessPoolExecutor(max_workers=min(len(po_files), os.cpu_count() or 1)) as pool:
+                    results = list(pool.map(merge_po_file, po_files, repeat(template)))
+            else:
+                results = [merge_po_file(po_files[0], template)]
+        except (OSError, UnicodeDecodeError, POParseError) as e:
+            print_error(f"Error merging translations: {e}")
+            return False
+        
+        for lang, stats in zip(languages, results):
+            print_success(f"Translation file for {lang} updated ({stats['empty']} untranslated, "
+                          f"{stats['obsolete']} obsolete)")
+        return True
+    
+    def update_translations(self, languages: Optional[List[str]] = None, force: bool = False,
+                            engine: str = 'native', use_cache: bool = True) -> bool:
         """Update and compile translations"""
         if languages is None:
             languages = self.SUPPORTED_LANGUAGES
@@ -132,29 +258,38 @@ class TranslationManager:
         
         print_info("Starting translation update...")
         
-        # Generate translation files for each language
-        for lang in languages:
-            print_info(f"Processing language: {lang}")
-            
-            print_info(f"Generating translation files for {lang}...")
-            success, output = self.run_django_command(['makemessages', '-l', lang, '--ignore=venv'])
+        if engine == 'native':
+            print_info("Extracting messages from sources...")
+            try:
+                template = self.extract_messages(use_cache=use_cache and not force)
+            except (OSError, UnicodeDecodeError, SyntaxError) as e:
+                print_error(f"Error extracting messages: {e}")
+                return False
             
-            if success:
-                print_success(f"Translation files for {lang} generated")
-            else:
-                print_error(f"Error generating translation files for {lang}")
-                print_error(output)
+            print_info(f"Merging messages into: {', '.join(languages)}")
+            if not self.merge_translations(languages, template):
                 return False
+        else:
+            # Generate translation files for each language
+            for lang in languages:
+                print_info(f"Processing language: {lang}")
+                
+                print_info(f"Generating translation files for {lang}...")
+                success, output = self.run_django_command(
+                    ['makemessages', '-l', lang, '--ignore=venv', '--ignore=tests.py', '--ignore=tests'])
+                
+                if success:
+                    print_success(f"Translation files for {lang} generated")
+                else:
+                    print_error(f"Error generating translation files for {lang}")
+                    print_error(output)
+                    return False
+        
+        self.invalidate_catalogs()
         
         # Compile all translations
         print_info("Compiling translations...")
-        success, output = self.run_django_command(['compilemessages'])
-        
-        if success:
-            print_success("Translations compiled successfully")
-        else:
-            print_error("Error compiling translations")
-            print_error(output)
+        if not self.compile_translations(force=force):
             return False
         
         # Show statistics
@@ -176,7 +311,7 @@ class TranslationManager:
         print_info("Checking translations...")
         
         for lang in self.SUPPORTED_LANGUAGES:
-            po_file = self.LOCALE_DIR / lang / 'LC_MESSAGES' / 'django.po'
+            po_file = self.get_po_file(lang)
             mo_file = self.LOCALE_DIR / lang / 'LC_MESSAGES' / 'django.mo'
             
             if not po_file.exists():
@@ -202,40 +337,19 @@ class TranslationManager:
                 else:
                     print_warning(f"Language {lang}: needs more work")
                 
+                catalog = self.load_catalog(lang)
+                
                 # Show first few untranslated strings
                 if stats['empty'] > 0:
                     print_info(f"First untranslated strings for {lang}:")
-                    try:
-                        with open(po_file, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        # Find empty msgstr entries
-                        pattern = r'msgid "([^"]+)"\nmsgstr ""'
-                        matches = re.findall(pattern, content)
-                        for i, match in enumerate(matches[:5]):
-                            print(f"  - {match}")
-                    except Exception as e:
-                        print_error(f"Error reading untranslated strings: {e}")
+                    for entry in catalog.untranslated()[:5]:
+                        print(f"  - {entry.msgid}")
                 
                 # Show fuzzy translations
                 if stats['fuzzy'] > 0:
                     print_warning(f"Fuzzy translations for {lang} (need review):")
-                    try:
-                        with open(po_file, 'r', encoding='utf-8') as f:
-                            lines = f.readlines()
-                        
-                        fuzzy_count = 0
-                        for i, line in enumerate(lines):
-                            if '#, fuzzy' in line and fuzzy_count < 3:
-                                # Find the next msgid
-                                for j in range(i + 1, min(i + 5, len(lines))):
-                                    if lines[j].startswith('msgid "'):
-                                        msgid = lines[j].strip()[7:-1]  # Remove msgid " and "
-                                        print(f"  - {msgid}")
-                                        fuzzy_count += 1
-                                        break
-                    except Exception as e:
-                        print_error(f"Error reading fuzzy translations: {e}")
+                    for entry in catalog.fuzzy_entries()[:3]:
+                        print(f"  - {entry.msgid}")
             else:
                 print_error(f"Translation file for {lang} is empty or corrupted")
             
@@ -255,7 +369,7 @@ class TranslationManager:
     
     def fix_english_translations(self) -> bool:
         """Fix English translations by setting msgstr = msgid"""
-        en_po_file = self.LOCALE_DIR / 'en' / 'LC_MESSAGES' / 'django.po'
+        en_po_file = self.get_po_file('en')
         
         if not en_po_file.exists():
             print_error(f"English translation file not found: {en_po_file}")
@@ -264,32 +378,29 @@ class TranslationManager:
         print_info("Fixing English translations...")
         
         try:
-            with open(en_po_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Replace empty msgstr with corresponding msgid
-            pattern = r'msgid "([^"]+)"\nmsgstr ""'
-            
-            def replace_func(match):
-                msgid_text = match.group(1)
-                return f'msgid "{msgid_text}"\nmsgstr "{msgid_text}"'
+            catalog = self.load_catalog('en')
+            if catalog is None:
+                return False
             
-            new_content = re.sub(pattern, replace_func, content)
+            # Fill empty msgstr with the corresponding msgid
+            fixed = 0
+            for entry in catalog.untranslated():
+                if entry.is_plural:
+                    for index in entry.msgstr_plural or {0: '', 1: ''}:
+                        if not entry.msgstr_plural.get(index):
+                            entry.msgstr_plural[index] = entry.msgid if index == 0 else entry.msgid_plural
+                else:
+                    entry.msgstr = entry.msgid
+                fixed += 1
             
-            with open(en_po_file, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            if fixed:
+                catalog.save()
             
-            print_success("English translations fixed")
+            print_success(f"English translations fixed ({fixed} entries)")
             
             # Compile translations
             print_info("Compiling translations...")
-            success, output = self.run_django_command(['compilemessages'])
-            
-            if success:
-                print_success("Translations compiled")
-            else:
-                print_error("Error compiling translations")
-                print_error(output)
+            if not self.compile_translations(['en']):
                 return False
             
             print_info("Restart development server to apply changes")
@@ -310,7 +421,8 @@ class TranslationManager:
         
         # Generate translation files
         print_info("Generating translation files...")
-        success, output = self.run_django_command(['makemessages', '-l', lang_code, '--ignore=venv'])
+        success, output = self.run_django_command(
+            ['makemessages', '-l', lang_code, '--ignore=venv', '--ignore=tests.py', '--ignore=tests'])
         
         if not success:
             print_error("Error generating translation files")
@@ -372,6 +484,9 @@ class TranslationManager:
                 print(f"  Translated: {stats['translated']} ({percentage}%)")
                 print(f"  Empty: {stats['empty']}")
                 print(f"  Fuzzy: {stats['fuzzy']}")
+                print(f"  Plural: {stats['plural']}")
+                if stats['obsolete']:
+                    print(f"  Obsolete: {stats['obsolete']}")
                 
                 # Progress bar
                 bar_length = 30
@@ -404,6 +519,12 @@ def main():
     # Update command
     update_parser = subparsers.add_parser('update', help='Update and compile translations')
     update_parser.add_argument('language', nargs='?', help='Specific language to update (optional)')
+    update_parser.add_argument('--force', action='store_true', help='Recompile catalogs even if unchanged')
+    update_parser.add_argument('--engine', choices=['native', 'django'], default='native',
+                               help='Extraction engine: single in-process pass (native) '
+                                    'or makemessages per language (django)')
+    update_parser.add_argument('--no-cache', action='store_true',
+                               help='Re-parse all sources instead of using the extraction cache')
     
     # Test command
     subparsers.add_parser('test', help='Test translation quality')
@@ -433,7 +554,8 @@ def main():
     try:
         if args.command == 'update':
             languages = [args.language] if args.language else None
-            success = manager.update_translations(languages)
+            success = manager.update_translations(languages, force=args.force, engine=args.engine,
+                                                   use_cache=not args.no_cache)
         elif args.command == 'test':
             success = manager.test_translations()
         elif args.command == 'fix-english':
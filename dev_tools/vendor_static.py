@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+WHMCS Admin Panel - Vendored Static Assets
+
+Downloads the pinned Bootstrap and Font Awesome releases from the npm
+registry into src/admin_panel/static/admin_panel/vendor/, so the panel
+works without third-party CDNs (air-gapped installs included). The
+tarball is verified against the integrity hash published by the
+registry before anything is extracted, and the files the panel links
+to are checked against pinned Subresource Integrity hashes (the same
+values the CDNs publish). The result is committed to the repository;
+the Docker build never downloads anything.
+
+Usage:
+    python dev_tools/vendor_static.py [options]
+
+Options:
+    --check      Only verify that all vendored files are present and intact
+    --force      Download again even if the files are present
+
+Examples:
+    python dev_tools/vendor_static.py
+    python dev_tools/vendor_static.py --check
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import shutil
+import sys
+import tarfile
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+VENDOR_DIR = PROJECT_ROOT / 'src' / 'admin_panel' / 'static' / 'admin_panel' / 'vendor'
+REGISTRY = 'https://registry.npmjs.org'
+
+# npm package -> target directory and {path in the tarball: path in the target}.
+# A path ending in '/' copies the whole directory (Font Awesome webfonts).
+# 'integrity' pins the files base.html links to: {path in the target: SRI hash}.
+PACKAGES = [
+    {
+        'name': 'bootstrap',
+        'version': '5.1.3',
+        'target': 'bootstrap-5.1.3',
+        'files': {
+            'LICENSE': 'LICENSE',
+            'dist/css/bootstrap.min.css': 'css/bootstrap.min.css',
+            'dist/css/bootstrap.min.css.map': 'css/bootstrap.min.css.map',
+            'dist/js/bootstrap.bundle.min.js': 'js/bootstrap.bundle.min.js',
+            'dist/js/bootstrap.bundle.min.js.map': 'js/bootstrap.bundle.min.js.map',
+        },
+        'integrity': {
+            'css/bootstrap.min.css': 'sha384-1BmE4kWBq78iYhFldvKuhfTAU6auU8tT94WrHftjDbrCEXSU1oBoqyl2QvZ6jIW3',
+            'js/bootstrap.bundle.min.js': 'sha384-ka7Sk0Gln4gmtz2MlQnikT1wXgYsOg+OMhuP+IlRH9sENBO0LRn5q+8nbTov4+1p',
+        },
+    },
+    {
+        'name': '@fortawesome/fontawesome-free',
+        'version': '6.0.0',
+        'target': 'fontawesome-6.0.0',
+        'files': {
+            'LICENSE.txt': 'LICENSE.txt',
+            'css/all.min.css': 'css/all.min.css',
+            'webfonts/': 'webfonts/',
+        },
+        'integrity': {
+            'css/all.min.css': 'sha384-3B6NwesSXE7YJlcLI9RpRqGf2p/EgVH8BgoKTaUrmKNDkHPStTQ3EyoYjCGXaOTS',
+        },
+    },
+]
+
+
+# Colors for output
+class Colors:
+    RED = '\033[0;31m'
+    GREEN = '\033[0;32m'
+    YELLOW = '\033[1;33m'
+    BLUE = '\033[0;34m'
+    NC = '\033[0m'  # No Color
+
+def print_info(message: str) -> None:
+    print(f"{Colors.BLUE}[INFO]{Colors.NC} {message}")
+
+def print_success(message: str) -> None:
+    print(f"{Colors.GREEN}[SUCCESS]{Colors.NC} {message}")
+
+def print_warning(message: str) -> None:
+    print(f"{Colors.YELLOW}[WARNING]{Colors.NC} {message}")
+
+def print_error(message: str) -> None:
+    print(f"{Colors.RED}[ERROR]{Colors.NC} {message}")
+
+
+def missing_files(package: dict) -> List[str]:
+    target = VENDOR_DIR / package['target']
+    missing = []
+    for destination in package['files'].values():
+        path = target / destination
+        if destination.endswith('/'):
+            if not path.is_dir() or not any(path.iterdir()):
+                missing.append(destination)
+        elif not path.is_file():
+            missing.append(destination)
+    return missing
+
+
+def modified_files(package: dict) -> List[str]:
+    """Pinned files whose content does not match the integrity hash"""
+    target = VENDOR_DIR / package['target']
+    modified = []
+    for destination, integrity in package['integrity'].items():
+        try:
+            verify_integrity((target / destination).read_bytes(), integrity)
+        except (OSError, RuntimeError):
+            modified.append(destination)
+    return modified
+
+
+def fetch(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=60) as response:
+        return response.read()
+
+
+def verify_integrity(data: bytes, integrity: str) -> None:
+    """Checks a Subresource Integrity string such as 'sha512-<base64>'"""
+    algorithm, _, expected = integrity.partition('-')
+    actual = base64.b64encode(hashlib.new(algorithm, data).digest()).decode()
+    if actual != expected:
+        raise RuntimeError(f'integrity mismatch: expected {integrity}, got {algorithm}-{actual}')
+
+
+def extract(package: dict, data: bytes) -> Dict[str, int]:
+    """Extracts the listed files into the target directory, returns {file: size}"""
+    target = VENDOR_DIR / package['target']
+    staging = target.with_name(target.name + '.tmp')
+    shutil.rmtree(staging, ignore_errors=True)
+    written = {}
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:gz') as archive:
+        for member in archive.getmembers():
+            if not member.isfile() or not member.name.startswith('package/'):
+                continue
+            source = member.name[len('package/'):]
+            for pattern, destination in package['files'].items():
+                if pattern.endswith('/') and source.startswith(pattern):
+                    relative = destination + source[len(pattern):]
+                elif source == pattern:
+                    relative = destination
+                else:
+                    continue
+                path = staging / relative
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(archive.extractfile(member).read())
+                written[relative] = member.size
+    missing = [pattern for pattern, destination in package['files'].items()
+               if not any(name == destination or (destination.endswith('/') and name.startswith(destination))
+                          for name in written)]
+    if missing:
+        shutil.rmtree(staging)
+        raise RuntimeError(f'not in the tarball: {", ".join(missing)}')
+    shutil.rmtree(target, ignore_errors=True)
+    staging.rename(target)
+    return written
+
+
+def vendor(package: dict) -> None:
+    label = f"{package['name']}@{package['version']}"
+    # Scoped names are requested as @scope%2Fname
+    metadata = json.loads(fetch(f"{REGISTRY}/{package['name'].replace('/', '%2F')}/{package['version']}"))
+    print_info(f"{label}: downloading {metadata['dist']['tarball']}")
+    data = fetch(metadata['dist']['tarball'])
+    verify_integrity(data, metadata['dist']['integrity'])
+    written = extract(package, data)
+    modified = modified_files(package)
+    if modified:
+        raise RuntimeError(f'pinned integrity mismatch: {", ".join(modified)}')
+    print_success(f"{label}: {len(written)} files, {sum(written.values()) / 1024:.0f} KiB -> "
+                  f"{(VENDOR_DIR / package['target']).relative_to(PROJECT_ROOT)}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Vendor Bootstrap and Font Awesome into admin_panel static files')
+    parser.add_argument('--check', action='store_true', help='only verify that the files are present and intact')
+    parser.add_argument('--force', action='store_true', help='download even if the files are present')
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    failed = False
+    for package in PACKAGES:
+        label = f"{package['name']}@{package['version']}"
+        missing = missing_files(package)
+        if args.check:
+            modified = [] if missing else modified_files(package)
+            if missing:
+                print_error(f"{label}: missing {', '.join(missing)}")
+                failed = True
+            elif modified:
+                print_error(f"{label}: integrity mismatch {', '.join(modified)}")
+                failed = True
+            else:
+                print_success(f'{label}: present')
+            continue
+        if not missing and not args.force:
+            print_info(f'{label}: already vendored (--force to download again)')
+            continue
+        try:
+            vendor(package)
+        except (OSError, RuntimeError, KeyError, tarfile.TarError, json.JSONDecodeError) as e:
+            print_error(f'{label}: {e}')
+            failed = True
+    if not failed and not args.check:
+        print_info('Commit src/admin_panel/static/admin_panel/vendor/ together with the version bump')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -43,52 +43,38 @@ if [ "$BUILD_MODE" = "production" ]; then
         print_info "Switching to appuser for security"
         # Change ownership of files to appuser
         chown -R appuser:appuser /app
-        # Execute command as appuser
-        exec gosu appuser "$@"
+        # Re-run the entrypoint as appuser (migrations, translations, server)
+        exec gosu appuser "$0" "$@"
     fi
     
-    # Ensure static files are collected
-    if [ ! -d "/app/staticfiles" ] || [ -z "$(ls -A /app/staticfiles)" ]; then
-        print_info "Collecting static files for production"
-        python manage.py collectstatic --noinput --clear
-    fi
+    # Static files are collected by bootstrap if the image has none
+    BOOTSTRAP_ARGS="--collectstatic"
     
 else
     print_info "Development mode detected"
 fi
 
-# Database migrations (both dev and prod)
-print_info "Checking database migrations"
-python manage.py migrate --check || {
-    print_warning "Migrations needed, applying..."
-    python manage.py migrate
-}
-
-# Create admin user if needed (development only)
+# Migrations, cache table, admin user (development only) and translations
+# in a single Django process (admin_panel/management/commands/bootstrap.py)
 if [ "$BUILD_MODE" = "development" ] && [ "$DEBUG" = "1" ]; then
-    print_info "Creating admin user for development"
-    python manage.py create_admin || print_warning "Admin user creation failed or already exists"
+    BOOTSTRAP_ARGS="--create-admin"
 fi
 
-# Compile translations if .po files are newer than .mo files
-print_info "Checking translation files"
-po_newer_than_mo=false
-for po_file in $(find locale -name "*.po" 2>/dev/null); do
-    mo_file="${po_file%.po}.mo"
-    if [ ! -f "$mo_file" ] || [ "$po_file" -nt "$mo_file" ]; then
-        po_newer_than_mo=true
-        break
-    fi
-done
-
-if [ "$po_newer_than_mo" = "true" ]; then
-    print_info "Recompiling translations"
-    python manage.py compilemessages
-else
-    print_info "Translation files are up to date"
-fi
+print_info "Running bootstrap"
+python manage.py bootstrap ${BOOTSTRAP_ARGS:-}
 
 print_success "Initialization complete, starting application"
 
+# "serve" starts the server for the current mode:
+# gunicorn (ASGI/WSGI workers, see gunicorn.conf.py) in production, runserver in development
+if [ "$1" = "serve" ]; then
+    if [ "$BUILD_MODE" = "production" ]; then
+        print_info "Starting gunicorn (${SERVER_INTERFACE:-asgi})"
+        set -- gunicorn -c gunicorn.conf.py
+    else
+        set -- python manage.py runserver 0.0.0.0:8000
+    fi
+fi
+
 # Execute the main command
 exec "$@"
\ No newline at end of file
@@ -0,0 +1,26 @@
+from django.apps import AppConfig
+
+
+class AdminPanelConfig(AppConfig):
+    name = 'admin_panel'
+
+    def ready(self):
+        from django.conf import settings
+        from django.contrib.auth.models import User
+        from whmcs_project import db, querylog, rowcounts, users
+        from whmcs_project.cache import SHARED, invalidate_on
+
+        from . import checks, search, summary  # noqa: F401 (checks реєструються при імпорті)
+        from .models import Client, Invoice, Service
+        from .summary import DASHBOARD_CACHE_NAMESPACE
+
+        invalidate_on(User, namespaces=[DASHBOARD_CACHE_NAMESPACE], aliases=[SHARED],
+                      ignore_fields=['last_login'])
+        rowcounts.track(User, Client, Service, Invoice)
+        summary.connect()
+        search.connect()
+        users.connect()
+
+        db.install()
+        if settings.QUERYLOG_ENABLED:
+            querylog.install()
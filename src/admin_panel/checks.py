@@ -0,0 +1,21 @@
+from django.core.checks import Error, Tags, register
+
+# Файли, на які посилається admin_panel/base.html
+VENDOR_ASSETS = (
+    'admin_panel/vendor/bootstrap-5.1.3/css/bootstrap.min.css',
+    'admin_panel/vendor/bootstrap-5.1.3/js/bootstrap.bundle.min.js',
+    'admin_panel/vendor/fontawesome-6.0.0/css/all.min.css',
+)
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_vendor_assets(app_configs, **kwargs):
+    """Без завантажених Bootstrap/Font Awesome сторінки панелі не рендеряться
+    (manifest storage не знаходить файл) - помилка під час збірки образу"""
+    from django.contrib.staticfiles import finders
+
+    return [
+        Error(f'Static file {path} is missing', hint='Run python dev_tools/vendor_static.py and commit the files',
+              id='admin_panel.E001')
+        for path in VENDOR_ASSETS if finders.find(path) is None
+    ]
@@ -0,0 +1,28 @@
+from functools import wraps
+
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import redirect
+
+
+def staff_required(view=None, *, json_response=False):
+    """login_required + перевірка is_staff для async view панелі
+
+    Не-адміністратора повертає на сторінку входу з повідомленням, а для
+    JSON endpoint'ів (``json_response=True``) відповідає 403.
+    """
+    def decorator(view):
+        @login_required
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            user = await request.auser()
+            if not user.is_staff:
+                if json_response:
+                    return JsonResponse({'error': 'forbidden'}, status=403)
+                messages.error(request, 'У вас немає прав доступу до адміністративної панелі')
+                return redirect('admin_login')
+            return await view(request, *args, **kwargs)
+        return wrapper
+
+    return decorator(view) if view is not None else decorator
@@ -0,0 +1,545 @@
+"""
+Потоковий імпорт даних WHMCS з дампу MySQL або CSV експорту.
+
+Джерела читаються потоково (рядок дампу або CSV за раз), рядки
+перетворюються у значення моделей і групуються в пачки фіксованого
+розміру. Пачки завантажують ``workers`` потоків, кожен на власному
+з'єднанні; черга між читачем і воркерами обмежена, тому пам'ять не
+залежить від розміру джерела.
+
+PostgreSQL: пачка йде через ``COPY`` у тимчасову таблицю, звідки
+``INSERT ... SELECT`` переносить її в цільову, пропускаючи вже наявні
+id та записи без батьківського рядка (сироти в WHMCS - звична річ).
+Інші БД: ``bulk_create`` з тими ж перевірками.
+
+Кожна пачка комітиться разом з ``ImportCheckpoint``, тому перерваний
+імпорт продовжується з тих самих пачок без дублікатів. Таблиці
+завантажуються фазами (клієнти → послуги та рахунки → позиції
+рахунків), щоб батьківські рядки вже були в БД.
+"""
+
+import csv
+import gzip
+import logging
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import Client, ImportCheckpoint, Invoice, InvoiceItem, Service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_WORKERS = 2
+
+
+class WhmcsImportError(Exception):
+    pass
+
+
+# Перетворення значень WHMCS
+
+def _text(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _decimal(value) -> Decimal:
+    try:
+        return Decimal(value) if value not in (None, '') else Decimal(0)
+    except InvalidOperation:
+        return Decimal(0)
+
+
+def _date(value) -> Optional[date]:
+    # MySQL зберігає "порожні" дати як 0000-00-00
+    if not value or str(value).startswith('0000'):
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _datetime(value) -> Optional[datetime]:
+    if not value or str(value).startswith('0000'):
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+
+# Таблиці
+
+@dataclass
+class TableSpec:
+    name: str
+    whmcs_table: str
+    model: type
+    columns: Tuple[str, ...]
+    # Рядок WHMCS -> значення для columns або None (рядок пропускається)
+    convert: Callable[[dict], Optional[tuple]]
+    # (колонка, модель) батьківського запису
+    parent: Optional[Tuple[str, type]] = None
+    phase: int = 0
+
+
+def _client(row: dict) -> Optional[tuple]:
+    created_at = _date(row.get('datecreated'))
+    pk = _int(row.get('id'))
+    if pk is None or created_at is None:
+        return None
+    return (pk, _text(row.get('firstname')), _text(row.get('lastname')), _text(row.get('companyname')),
+            _text(row.get('email')), _text(row.get('status')) or Client.Status.ACTIVE, created_at)
+
+
+def _service_converter(products: Dict[int, str]) -> Callable[[dict], Optional[tuple]]:
+    def convert(row: dict) -> Optional[tuple]:
+        pk, client_id = _int(row.get('id')), _int(row.get('userid'))
+        if pk is None or client_id is None:
+            return None
+        package = _int(row.get('packageid'))
+        product = products.get(package) or (f'Package #{package}' if package else '')
+        return (pk, client_id, product, _text(row.get('domain')),
+                _text(row.get('domainstatus')) or Service.Status.PENDING, _text(row.get('billingcycle')),
+                _decimal(row.get('amount')), _date(row.get('regdate')), _date(row.get('nextduedate')))
+    return convert
+
+
+def _invoice(row: dict) -> Optional[tuple]:
+    pk, client_id = _int(row.get('id')), _int(row.get('userid'))
+    invoice_date = _date(row.get('date'))
+    if pk is None or client_id is None or invoice_date is None:
+        return None
+    return (pk, client_id, _text(row.get('invoicenum')), invoice_date,
+            _date(row.get('duedate')) or invoice_date, _datetime(row.get('datepaid')),
+            _decimal(row.get('subtotal')), _decimal(row.get('tax')) + _decimal(row.get('tax2')),
+            _decimal(row.get('total')), _text(row.get('status')) or Invoice.Status.UNPAID)
+
+
+def _invoice_item(row: dict) -> Optional[tuple]:
+    pk, invoice_id = _int(row.get('id')), _int(row.get('invoiceid'))
+    if pk is None or invoice_id is None:
+        return None
+    return (pk, invoice_id, _text(row.get('type')), _int(row.get('relid')) or 0,
+            _text(row.get('description')), _decimal(row.get('amount')))
+
+
+def table_specs(products: Optional[Dict[int, str]] = None) -> Dict[str, TableSpec]:
+    return {spec.name: spec for spec in (
+        TableSpec('clients', 'tblclients', Client,
+                  ('id', 'first_name', 'last_name', 'company_name', 'email', 'status', 'created_at'),
+                  _client, phase=0),
+        TableSpec('services', 'tblhosting', Service,
+                  ('id', 'client_id', 'product', 'domain', 'status', 'billing_cycle', 'amount',
+                   'registration_date', 'next_due_date'),
+                  _service_converter(products or {}), parent=('client_id', Client), phase=1),
+        TableSpec('invoices', 'tblinvoices', Invoice,
+                  ('id', 'client_id', 'number', 'date', 'due_date', 'date_paid', 'subtotal', 'tax', 'total',
+                   'status'),
+                  _invoice, parent=('client_id', Client), phase=1),
+        TableSpec('items', 'tblinvoiceitems', InvoiceItem,
+                  ('id', 'invoice_id', 'type', 'rel_id', 'description', 'amount'),
+                  _invoice_item, parent=('invoice_id', Invoice), phase=2),
+    )}
+
+
+TABLES = ('clients', 'services', 'invoices', 'items')
+
+
+# Джерела
+
+_CREATE_RE = re.compile(r'CREATE TABLE `(\w+)` \(')
+_COLUMN_RE = re.compile(r'\s*`(\w+)` ')
+_INSERT_RE = re.compile(r'INSERT INTO `(\w+)`(?: \(([^)]*)\))? VALUES ')
+_TOKEN_RE = re.compile(r"""
+    '((?:[^'\\]|\\.|'')*)'   # рядок
+    |(NULL)\b
+    |([(),;])
+    |\s+
+    |([^\s,()';]+)           # число, 0x..., _binary тощо
+""", re.VERBOSE | re.DOTALL)
+_ESCAPE_RE = re.compile(r"\\(.)|''", re.DOTALL)
+_ESCAPES = {'0': '\0', 'b': '\b', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+
+
+def _unescape(value: str) -> str:
+    def replace(match):
+        if match.group(0) == "''":
+            return "'"
+        char = match.group(1)
+        if char in '%_':
+            # MySQL залишає зворотний слеш перед % та _
+            return '\\' + char
+        return _ESCAPES.get(char, char)
+    return _ESCAPE_RE.sub(replace, value) if '\\' in value or "''" in value else value
+
+
+def parse_values(text: str, pos: int = 0) -> Iterator[list]:
+    """Кортежі з ``VALUES (...),(...);`` рядка дампу"""
+    row: Optional[list] = None
+    for match in _TOKEN_RE.finditer(text, pos):
+        string, null, punct, raw = match.groups()
+        if punct == '(':
+            row = []
+        elif punct == ')':
+            if row is not None:
+                yield row
+            row = None
+        elif punct == ';':
+            return
+        elif row is None:
+            continue
+        elif string is not None:
+            row.append(_unescape(string))
+        elif null:
+            row.append(None)
+        elif raw is not None:
+            row.append(raw)
+
+
+def _open_text(path: Path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def iter_dump_rows(path: Path, whmcs_table: str) -> Iterator[dict]:
+    """Рядки таблиці з дампу mysqldump (звичайного або .gz)
+
+    Дамп читається по рядках; INSERT інших таблиць відкидаються за
+    префіксом без розбору.
+    """
+    columns: List[str] = []
+    in_create = False
+    create_prefix = f'CREATE TABLE `{whmcs_table}` ('
+    insert_prefix = f'INSERT INTO `{whmcs_table}`'
+    with _open_text(path) as f:
+        for lineno, line in enumerate(f, start=1):
+            if in_create:
+                match = _COLUMN_RE.match(line)
+                if match:
+                    columns.append(match.group(1))
+                elif line.startswith(')'):
+                    in_create = False
+                continue
+            if line.startswith(create_prefix):
+                columns, in_create = [], True
+                continue
+            if not line.startswith(insert_prefix):
+                continue
+            match = _INSERT_RE.match(line)
+            if match is None:
+                raise WhmcsImportError(f'{whmcs_table}: unsupported INSERT syntax at {path.name}:{lineno}')
+            row_columns = [name.strip(' `') for name in match.group(2).split(',')] if match.group(2) else columns
+            if not row_columns:
+                raise WhmcsImportError(f'{whmcs_table}: INSERT before CREATE TABLE and without a column list')
+            for values in parse_values(line, match.end()):
+                yield dict(zip(row_columns, values))
+
+
+def iter_csv_rows(path: Path, delimiter: str = ',') -> Iterator[dict]:
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f, delimiter=delimiter):
+            yield {name: (None if value in ('', 'NULL') else value) for name, value in row.items()}
+
+
+class Source:
+    """Дамп MySQL або директорія з CSV файлами ``<таблиця WHMCS>.csv``"""
+
+    def __init__(self, dump: Optional[Path] = None, csv_dir: Optional[Path] = None, delimiter: str = ','):
+        if (dump is None) == (csv_dir is None):
+            raise WhmcsImportError('Exactly one of dump or csv_dir is required')
+        self.dump = dump
+        self.csv_dir = csv_dir
+        self.delimiter = delimiter
+        path = dump or csv_dir
+        if not path.exists():
+            raise WhmcsImportError(f'{path} does not exist')
+        self.key = str(path.resolve())
+
+    def has_table(self, whmcs_table: str) -> bool:
+        if self.dump is not None:
+            return True
+        return (self.csv_dir / f'{whmcs_table}.csv').exists()
+
+    def rows(self, whmcs_table: str) -> Iterator[dict]:
+        if self.dump is not None:
+            return iter_dump_rows(self.dump, whmcs_table)
+        path = self.csv_dir / f'{whmcs_table}.csv'
+        if not path.exists():
+            return iter(())
+        return iter_csv_rows(path, self.delimiter)
+
+    def products(self) -> Dict[int, str]:
+        """Назви продуктів з tblproducts (невелика таблиця, читається повністю)"""
+        if not self.has_table('tblproducts'):
+            return {}
+        return {_int(row.get('id')): _text(row.get('name')) for row in self.rows('tblproducts')}
+
+
+# Завантаження
+
+def _copy_batch(connection, spec: TableSpec, rows: List[tuple]) -> int:
+    """COPY у тимчасову таблицю і перенесення нових рядків з батьками"""
+    table = spec.model._meta.db_table
+    stage = f'import_stage_{table}'
+    qn = connection.ops.quote_name
+    columns = ', '.join(qn(column) for column in spec.columns)
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE TEMP TABLE IF NOT EXISTS {qn(stage)} '
+                       f'(LIKE {qn(table)} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS')
+        # Django cursor -> psycopg cursor з підтримкою COPY
+        with cursor.cursor.copy(f'COPY {qn(stage)} ({columns}) FROM STDIN') as copy:
+            for row in rows:
+                copy.write_row(row)
+
+        conditions = [f'NOT EXISTS (SELECT 1 FROM {qn(table)} t WHERE t.id = s.id)']
+        if spec.parent is not None:
+            column, parent = spec.parent
+            conditions.append(f'EXISTS (SELECT 1 FROM {qn(parent._meta.db_table)} p WHERE p.id = s.{qn(column)})')
+        cursor.execute(
+            f'INSERT INTO {qn(table)} ({columns}) SELECT {columns} FROM {qn(stage)} s '
+            f'WHERE {" AND ".join(conditions)} ON CONFLICT (id) DO NOTHING'
+        )
+        return cursor.rowcount
+
+
+def _bulk_create_batch(connection, spec: TableSpec, rows: List[tuple]) -> int:
+    manager = spec.model._base_manager.using(connection.alias)
+    existing = set(manager.filter(pk__in=[row[0] for row in rows]).values_list('pk', flat=True))
+    if spec.parent is not None:
+        column, parent = spec.parent
+        index = spec.columns.index(column)
+        parents = set(parent._base_manager.using(connection.alias)
+                      .filter(pk__in={row[index] for row in rows}).values_list('pk', flat=True))
+        rows = [row for row in rows if row[index] in parents]
+    objects = [spec.model(**dict(zip(spec.columns, row))) for row in rows if row[0] not in existing]
+    manager.bulk_create(objects)
+    return len(objects)
+
+
+@dataclass
+class TableResult:
+    table: str
+    loaded: int = 0
+    skipped: int = 0
+    batches: int = 0
+    resumed_batches: int = 0
+    seconds: float = 0.0
+    already_finished: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return (self.loaded + self.skipped) / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class _Batch:
+    number: int
+    rows: List[tuple] = field(default_factory=list)
+    # Рядки джерела, відкинуті перетворенням (некоректні)
+    invalid: int = 0
+
+
+class TableImporter:
+    """Читає таблицю з джерела і завантажує пачки пулом потоків"""
+
+    def __init__(self, spec: TableSpec, source: Source, batch_size: int, workers: int, alias: str = 'default',
+                 progress: Optional[Callable[[str], None]] = None):
+        self.spec = spec
+        self.source = source
+        self.batch_size = batch_size
+        self.workers = workers
+        self.alias = alias
+        self.progress = progress or (lambda message: None)
+        self.result = TableResult(spec.name)
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+
+    def _checkpoint(self) -> ImportCheckpoint:
+        checkpoint, _created = ImportCheckpoint.objects.using(self.alias).get_or_create(
+            source=self.source.key, table=self.spec.name, defaults={'batch_size': self.batch_size},
+        )
+        if checkpoint.batch_size != self.batch_size and (checkpoint.done_through or checkpoint.completed):
+            raise WhmcsImportError(f'{self.spec.name}: checkpoint was written with batch size {checkpoint.batch_size}, '
+                                   f'resume with the same --batch-size or use --restart')
+        return checkpoint
+
+    def _batches(self) -> Iterator[_Batch]:
+        batch = _Batch(0)
+        size = 0
+        for row in self.source.rows(self.spec.whmcs_table):
+            values = self.spec.convert(row)
+            if values is None:
+                batch.invalid += 1
+            else:
+                batch.rows.append(values)
+            size += 1
+            if size == self.batch_size:
+                yield batch
+                batch, size = _Batch(batch.number + 1), 0
+        if size:
+            yield batch
+
+    def _load(self, batch: _Batch) -> None:
+        connection = connections[self.alias]
+        with transaction.atomic(using=self.alias):
+            if not batch.rows:
+                loaded = 0
+            elif connection.vendor == 'postgresql':
+                loaded = _copy_batch(connection, self.spec, batch.rows)
+            else:
+                loaded = _bulk_create_batch(connection, self.spec, batch.rows)
+            skipped = len(batch.rows) - loaded + batch.invalid
+
+            checkpoint = ImportCheckpoint.objects.using(self.alias).select_for_update().get(
+                source=self.source.key, table=self.spec.name)
+            checkpoint.mark_done(batch.number)
+            checkpoint.rows_loaded += loaded
+            checkpoint.rows_skipped += skipped
+            checkpoint.save()
+
+        with self._lock:
+            self.result.loaded += loaded
+            self.result.skipped += skipped
+            self.result.batches += 1
+
+    def _worker(self, batches: 'queue.Queue[Optional[_Batch]]') -> None:
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    return
+                if self._error is None:
+                    try:
+                        self._load(batch)
+                    except BaseException as e:
+                        self._error = e
+        finally:
+            connections.close_all()
+
+    def _pending(self, checkpoint: ImportCheckpoint) -> Iterator[_Batch]:
+        for batch in self._batches():
+            if checkpoint.is_done(batch.number):
+                self.result.resumed_batches += 1
+                continue
+            if batch.number % 20 == 0:
+                self.progress(f'{self.spec.name}: batch {batch.number}, {self.result.loaded} rows loaded')
+            yield batch
+
+    def _run_parallel(self, checkpoint: ImportCheckpoint) -> None:
+        batches: 'queue.Queue[Optional[_Batch]]' = queue.Queue(maxsize=self.workers * 2)
+        threads = [
+            threading.Thread(target=self._worker, args=(batches,), name=f'import-{self.spec.name}-{index}')
+            for index in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for batch in self._pending(checkpoint):
+                if self._error is not None:
+                    break
+                batches.put(batch)
+        finally:
+            for _thread in threads:
+                batches.put(None)
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+    def run(self) -> TableResult:
+        started = time.perf_counter()
+        checkpoint = self._checkpoint()
+        if checkpoint.finished:
+            self.result.already_finished = True
+            return self.result
+
+        if self.workers == 1:
+            # Без потоків: пачки вантажаться на поточному з'єднанні
+            for batch in self._pending(checkpoint):
+                self._load(batch)
+        else:
+            self._run_parallel(checkpoint)
+
+        ImportCheckpoint.objects.using(self.alias).filter(pk=checkpoint.pk).update(finished=True)
+        self.result.seconds = time.perf_counter() - started
+        return self.result
+
+
+def reset_sequences(models: Sequence[type], alias: str = 'default') -> None:
+    """Після вставки з явними id послідовності мають продовжуватись з max(id)"""
+    connection = connections[alias]
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def run_import(source: Source, tables: Sequence[str] = TABLES, batch_size: int = DEFAULT_BATCH_SIZE,
+               workers: int = DEFAULT_WORKERS, alias: str = 'default', restart: bool = False,
+               progress: Optional[Callable[[str], None]] = None) -> List[TableResult]:
+    """Імпортує таблиці фазами; таблиці однієї фази - паралельно"""
+    connection = connections[alias]
+    parallel = connection.vendor == 'postgresql'
+    if not parallel:
+        # SQLite блокує всю БД на запис: паралельні пачки тільки чекали б одна на одну
+        workers = 1
+
+    if restart:
+        ImportCheckpoint.objects.using(alias).filter(source=source.key, table__in=tables).delete()
+
+    specs = table_specs(source.products() if 'services' in tables else None)
+    selected = [specs[name] for name in TABLES if name in tables]
+    results = []
+    for phase in sorted({spec.phase for spec in selected}):
+        importers = [
+            TableImporter(spec, source, batch_size, workers, alias, progress)
+            for spec in selected if spec.phase == phase and source.has_table(spec.whmcs_table)
+        ]
+        if parallel and len(importers) > 1:
+            errors: List[BaseException] = []
+
+            def run(importer):
+                try:
+                    importer.run()
+                except BaseException as e:
+                    errors.append(e)
+                finally:
+                    connections.close_all()
+
+            threads = [threading.Thread(target=run, args=(importer,)) for importer in importers]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            if errors:
+                raise errors[0]
+        else:
+            for importer in importers:
+                importer.run()
+        results.extend(importer.result for importer in importers)
+
+    reset_sequences([spec.model for spec in selected], alias)
+    return results
@@ -0,0 +1,107 @@
+import time
+from pathlib import Path
+
+from decouple import config
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+from whmcs_project.i18n.mo import compile_catalog
+
+# Ключ advisory lock PostgreSQL: репліки, що стартують одночасно, не мігрують паралельно
+MIGRATE_LOCK_ID = 0x77686d6373  # 'whmcs'
+
+
+class Command(BaseCommand):
+    help = ('Готує контейнер до старту в одному процесі: міграції, таблиця кешу, адміністратор, '
+            'компіляція перекладів, статика')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Аліас бази даних')
+        parser.add_argument('--create-admin', action='store_true',
+                            help='Створити адміністратора з ADMIN_* у .env, якщо його немає (розробка)')
+        parser.add_argument('--collectstatic', action='store_true',
+                            help='Зібрати статику, якщо STATIC_ROOT порожній (продакшн)')
+
+    def handle(self, *args, **options):
+        database = options['database']
+        steps = [
+            ('migrate', lambda: self.migrate(database)),
+            ('cache table', lambda: self.cache_table(database)),
+        ]
+        if options['create_admin']:
+            steps.append(('admin', self.create_admin))
+        steps.append(('translations', self.compile_translations))
+        if options['collectstatic']:
+            steps.append(('static', self.collect_static))
+
+        started = time.perf_counter()
+        for name, step in steps:
+            step_started = time.perf_counter()
+            result = step()
+            elapsed = (time.perf_counter() - step_started) * 1000
+            self.stdout.write(f'{name:<14} {result} ({elapsed:.0f} мс)')
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(self.style.SUCCESS(f'Bootstrap завершено за {elapsed:.0f} мс'))
+
+    @staticmethod
+    def _migration_plan(connection):
+        executor = MigrationExecutor(connection)
+        return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+    def migrate(self, database: str) -> str:
+        """Застосовує міграції, лише якщо план непорожній (як migrate --check, без окремого процесу)"""
+        connection = connections[database]
+        connection.prepare_database()
+        if not self._migration_plan(connection):
+            return 'актуальні'
+
+        locked = connection.vendor == 'postgresql'
+        if locked:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_lock(%s)', [MIGRATE_LOCK_ID])
+        try:
+            # Поки чекали на lock, міграції могла застосувати інша репліка
+            plan = self._migration_plan(connection)
+            if plan:
+                call_command('migrate', database=database, interactive=False, verbosity=0)
+        finally:
+            if locked:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_unlock(%s)', [MIGRATE_LOCK_ID])
+        return f'застосовано {len(plan)}' if plan else 'застосовані іншим процесом'
+
+    def cache_table(self, database: str) -> str:
+        # No-op, якщо жоден кеш не використовує DatabaseCache або таблиця вже є
+        call_command('createcachetable', database=database, verbosity=0)
+        return 'готово'
+
+    def create_admin(self) -> str:
+        if User.objects.filter(username=config('ADMIN_USERNAME', default='admin')).exists():
+            return 'вже існує'
+        call_command('create_admin', stdout=self.stdout)
+        return 'створено'
+
+    def compile_translations(self) -> str:
+        """Компілює .po, новіші за свій .mo (вбудованим компілятором, без msgfmt)"""
+        catalogs = [po for locale_dir in settings.LOCALE_PATHS
+                    for po in sorted(Path(locale_dir).glob('*/LC_MESSAGES/*.po'))]
+        compiled = 0
+        for po in catalogs:
+            mo = po.with_suffix('.mo')
+            if not mo.exists() or po.stat().st_mtime > mo.stat().st_mtime:
+                compile_catalog(po, mo)
+                compiled += 1
+        if compiled:
+            return f'скомпільовано {compiled} з {len(catalogs)}'
+        return f'актуальні ({len(catalogs)})'
+
+    def collect_static(self) -> str:
+        static_root = Path(settings.STATIC_ROOT)
+        if static_root.is_dir() and any(static_root.iterdir()):
+            return 'вже зібрана'
+        call_command('collectstatic', interactive=False, clear=True, verbosity=0)
+        return 'зібрано'
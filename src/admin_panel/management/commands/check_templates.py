@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from whmcs_project.templating import TEMPLATE_APPS, compile_templates
+
+
+class Command(BaseCommand):
+    help = 'Перевіряє, що всі шаблони проекту компілюються'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'apps', nargs='*', default=list(TEMPLATE_APPS),
+            help='Застосунки для перевірки (за замовчуванням: %s)' % ', '.join(TEMPLATE_APPS)
+        )
+
+    def handle(self, *args, **options):
+        compiled, errors = compile_templates(options['apps'])
+
+        for name, error in errors:
+            self.stderr.write(self.style.ERROR(f'{name}: {error}'))
+
+        if errors:
+            raise CommandError(f'Шаблонів з помилками: {len(errors)}')
+
+        self.stdout.write(self.style.SUCCESS(f'Всі шаблони компілюються: {compiled}'))
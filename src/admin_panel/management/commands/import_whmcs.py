@@ -0,0 +1,60 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_panel import importer, search, summary
+
+
+class Command(BaseCommand):
+    help = 'Імпортує клієнтів, послуги, рахунки та позиції рахунків з дампу MySQL або CSV експорту WHMCS'
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument('--dump', type=Path, help='Дамп mysqldump (.sql або .sql.gz)')
+        source.add_argument('--csv-dir', type=Path, help='Директорія з файлами <таблиця WHMCS>.csv')
+        parser.add_argument('--delimiter', default=',', help='Роздільник CSV')
+        parser.add_argument('--tables', nargs='+', choices=importer.TABLES, default=list(importer.TABLES),
+                            help='Таблиці для імпорту')
+        parser.add_argument('--batch-size', type=int, default=importer.DEFAULT_BATCH_SIZE,
+                            help='Рядків у пачці (одна транзакція)')
+        parser.add_argument('--workers', type=int, default=importer.DEFAULT_WORKERS,
+                            help='Паралельних завантажувачів на таблицю (PostgreSQL)')
+        parser.add_argument('--restart', action='store_true', help='Почати заново, ігноруючи збережений прогрес')
+        parser.add_argument('--no-summary', action='store_true', help='Не перераховувати зведення дашборду')
+        parser.add_argument('--no-search', action='store_true', help='Не перебудовувати пошуковий індекс')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--batch-size and --workers must be positive')
+
+        try:
+            source = importer.Source(dump=options['dump'], csv_dir=options['csv_dir'],
+                                     delimiter=options['delimiter'])
+            started = time.perf_counter()
+            results = importer.run_import(
+                source, tables=options['tables'], batch_size=options['batch_size'], workers=options['workers'],
+                restart=options['restart'], progress=lambda message: self.stdout.write(message),
+            )
+        except importer.WhmcsImportError as e:
+            raise CommandError(str(e))
+
+        for result in results:
+            if result.already_finished:
+                self.stdout.write(self.style.WARNING(
+                    f'{result.table}: вже імпортовано (--restart для повторного імпорту)'
+                ))
+                continue
+            resumed = f', пропущено завершених пачок: {result.resumed_batches}' if result.resumed_batches else ''
+            self.stdout.write(
+                f'{result.table}: завантажено {result.loaded}, пропущено {result.skipped} '
+                f'({result.seconds:.2f} с, {result.rows_per_second:.0f} рядків/с{resumed})'
+            )
+
+        if not options['no_summary']:
+            self.stdout.write(f'Лічильників зведень: {summary.rebuild()}')
+        if not options['no_search']:
+            self.stdout.write(f'Пошукових документів: {search.rebuild()}')
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Імпорт завершено за {elapsed:.2f} с'))
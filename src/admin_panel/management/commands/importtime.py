@@ -0,0 +1,57 @@
+import json
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from whmcs_project import importtime
+
+
+class Command(BaseCommand):
+    help = 'Профілює імпорт модулів при старті воркера (python -X importtime): модулі та застосунки за часом'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', choices=importtime.TARGETS, default='worker',
+                            help='Сценарій старту (worker - ASGI застосунок та URLconf)')
+        parser.add_argument('--limit', type=int, default=25, help='Рядків у кожній таблиці')
+        parser.add_argument('--self', action='store_true', dest='by_self',
+                            help='Сортувати модулі за власним часом замість сумарного')
+        parser.add_argument('--json', action='store_true', help='Вивести звіт як JSON')
+
+    def handle(self, *args, **options):
+        try:
+            report = importtime.measure(options['target'])
+        except importtime.ImportTimeError as e:
+            raise CommandError(str(e))
+
+        limit = options['limit']
+        modules = report.slowest(limit, cumulative=not options['by_self'])
+        groups = report.by_group([config.name for config in apps.get_app_configs()])
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'target': report.target,
+                'total_ms': report.total_us / 1000,
+                'wall_ms': report.wall_seconds * 1000,
+                'modules': len(report.loaded),
+                'measured_modules': len(report.records),
+                'slowest': [{'module': record.module, 'self_ms': record.self_us / 1000,
+                             'cumulative_ms': record.cumulative_us / 1000} for record in modules],
+                'groups': {group: us / 1000 for group, us in list(groups.items())[:limit]},
+            }, indent=2))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{report.target}: імпорт {report.total_us / 1000:.1f} мс, модулів {len(report.loaded)} '
+            f'(виміряно {len(report.records)}), процес {report.wall_seconds * 1000:.0f} мс'
+        ))
+
+        self.stdout.write(f"\n{'сумарно мс':>11} {'власний мс':>11}  модуль")
+        for record in modules:
+            indent = '  ' * min(record.depth, 10)
+            self.stdout.write(f'{record.cumulative_us / 1000:>11.1f} {record.self_us / 1000:>11.1f}  '
+                              f'{indent}{record.module}')
+
+        total = sum(groups.values()) or 1
+        self.stdout.write(f"\n{'власний мс':>11} {'частка':>7}  застосунок / пакет")
+        for group, us in list(groups.items())[:limit]:
+            self.stdout.write(f'{us / 1000:>11.1f} {us * 100 / total:>6.1f}%  {group}')
@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+
+from whmcs_project.sessions import PURGE_BATCH_SIZE, purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Видаляє прострочені сесії з таблиці django_session пачками (замість clearsessions)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PURGE_BATCH_SIZE,
+                            help='Сесій в одному DELETE')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        if settings.SESSION_MODE == 'signed_cookies':
+            self.stdout.write(self.style.WARNING(
+                'SESSION_MODE=signed_cookies: сесії зберігаються в cookie, чистяться лише залишки в таблиці'
+            ))
+
+        started = time.perf_counter()
+        deleted = purge_expired(Session, batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Видалено прострочених сесій: {deleted} ({elapsed:.2f} с)'))
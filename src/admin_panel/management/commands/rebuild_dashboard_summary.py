@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_panel.summary import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Перераховує зведення дашборду з таблиць WHMCS (після імпорту або для періодичної звірки)'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Лічильників зведень: {count} ({elapsed:.2f} с)'))
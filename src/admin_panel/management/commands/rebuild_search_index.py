@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_panel.search import REBUILD_BATCH_SIZE, rebuild
+
+
+class Command(BaseCommand):
+    help = 'Перебудовує пошуковий індекс клієнтів, послуг і рахунків (після імпорту або для звірки)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE,
+                            help='Документів у пачці bulk_create')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild(batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Пошукових документів: {count} ({elapsed:.2f} с)'))
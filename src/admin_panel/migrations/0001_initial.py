@@ -0,0 +1,106 @@
+# Generated by Django 6.0 on 2026-10-17 22:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Client',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_name', models.CharField(max_length=100)),
+                ('last_name', models.CharField(max_length=100)),
+                ('company_name', models.CharField(blank=True, max_length=200)),
+                ('email', models.EmailField(max_length=254)),
+                ('status', models.CharField(choices=[('Active', 'Active'), ('Inactive', 'Inactive'), ('Closed', 'Closed')], default='Active', max_length=16)),
+                ('created_at', models.DateField()),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Invoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.CharField(blank=True, max_length=64)),
+                ('date', models.DateField()),
+                ('due_date', models.DateField()),
+                ('date_paid', models.DateTimeField(blank=True, null=True)),
+                ('subtotal', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('tax', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('status', models.CharField(choices=[('Draft', 'Draft'), ('Unpaid', 'Unpaid'), ('Paid', 'Paid'), ('Cancelled', 'Cancelled'), ('Refunded', 'Refunded'), ('Collections', 'Collections'), ('Payment Pending', 'Payment Pending')], default='Unpaid', max_length=16)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='invoices', to='admin_panel.client')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='InvoiceItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(blank=True, max_length=32)),
+                ('rel_id', models.BigIntegerField(default=0)),
+                ('description', models.TextField()),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('invoice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='admin_panel.invoice')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Service',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product', models.CharField(max_length=255)),
+                ('domain', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Active', 'Active'), ('Suspended', 'Suspended'), ('Terminated', 'Terminated'), ('Cancelled', 'Cancelled'), ('Fraud', 'Fraud'), ('Completed', 'Completed')], default='Pending', max_length=16)),
+                ('billing_cycle', models.CharField(blank=True, max_length=32)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('registration_date', models.DateField(blank=True, null=True)),
+                ('next_due_date', models.DateField(blank=True, null=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='services', to='admin_panel.client')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='SummaryCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(max_length=32)),
+                ('bucket', models.CharField(max_length=32)),
+                ('count', models.BigIntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('metric', 'bucket'), name='summary_counter_metric_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Ticket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tid', models.CharField(max_length=32)),
+                ('subject', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('Open', 'Open'), ('Answered', 'Answered'), ('Customer-Reply', 'Customer-Reply'), ('On Hold', 'On Hold'), ('In Progress', 'In Progress'), ('Closed', 'Closed')], default='Open', max_length=16)),
+                ('priority', models.CharField(default='Medium', max_length=16)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('client', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tickets', to='admin_panel.client')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-17 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=500)),
+                ('table', models.CharField(max_length=32)),
+                ('batch_size', models.PositiveIntegerField()),
+                ('done_through', models.BigIntegerField(default=0)),
+                ('completed', models.JSONField(default=list)),
+                ('rows_loaded', models.BigIntegerField(default=0)),
+                ('rows_skipped', models.BigIntegerField(default=0)),
+                ('finished', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('source', 'table'), name='import_checkpoint_source_table')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-17 22:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0002_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['status', '-id'], name='client_status_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['-date', '-id'], include=('client', 'number', 'due_date', 'total', 'status'), name='invoice_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['status', '-date', '-id'], include=('client', 'number', 'due_date', 'total'), name='invoice_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['client', '-date', '-id'], name='invoice_client_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['status', '-id'], name='service_status_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['client', '-id'], name='service_client_id_idx'),
+        ),
+        # Одноколонкові індекси client_id видаляються після створення складених
+        migrations.AlterField(
+            model_name='invoice',
+            name='client',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='invoices', to='admin_panel.client'),
+        ),
+        migrations.AlterField(
+            model_name='service',
+            name='client',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='services', to='admin_panel.client'),
+        ),
+    ]
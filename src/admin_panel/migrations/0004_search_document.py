@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-10-17 22:45
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+TABLE = 'admin_panel_searchdocument'
+
+
+def add_search_indexes(apps, schema_editor):
+    # tsvector та trigram індекси є тільки в PostgreSQL; інші БД шукають через LIKE
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        f"ALTER TABLE {TABLE} ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, text)) STORED"
+    )
+    schema_editor.execute(f'CREATE INDEX search_document_vector_idx ON {TABLE} USING gin (search_vector)')
+    schema_editor.execute(f'CREATE INDEX search_document_trgm_idx ON {TABLE} USING gin (text gin_trgm_ops)')
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS search_document_trgm_idx')
+    schema_editor.execute(f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0003_list_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('client', 'Client'), ('service', 'Service'), ('invoice', 'Invoice')], max_length=16)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('text', models.TextField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='admin_panel.client')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_document_kind_object')],
+            },
+        ),
+        migrations.RunPython(add_search_indexes, remove_search_indexes),
+    ]
@@ -0,0 +1,255 @@
+"""
+Дані WHMCS, з якими працює панель.
+
+Моделі повторюють основні таблиці WHMCS (tblclients, tblhosting,
+tblinvoices, tblinvoiceitems, tbltickets) у скороченому вигляді;
+первинні ключі збігаються з ідентифікаторами WHMCS, щоб імпорт не
+потребував таблиць відповідності.
+"""
+
+from django.db import models
+
+
+class TrackedModel(models.Model):
+    """Пам'ятає значення ``tracked_fields`` на момент завантаження з БД
+
+    Потрібно для інкрементальних зведень (``admin_panel.summary``): при
+    збереженні дельта рахується між завантаженим і новим станом без
+    додаткового SELECT.
+    """
+
+    tracked_fields: tuple = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if all(name in field_names for name in cls.tracked_fields):
+            instance._loaded_values = instance.tracked_values()
+        return instance
+
+    def tracked_values(self) -> dict:
+        return {name: getattr(self, name) for name in self.tracked_fields}
+
+
+class Client(TrackedModel):
+    class Status(models.TextChoices):
+        ACTIVE = 'Active', 'Active'
+        INACTIVE = 'Inactive', 'Inactive'
+        CLOSED = 'Closed', 'Closed'
+
+    first_name = models.CharField(max_length=100)
+    last_name = models.CharField(max_length=100)
+    company_name = models.CharField(max_length=200, blank=True)
+    email = models.EmailField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.ACTIVE)
+    created_at = models.DateField()
+
+    tracked_fields = ('status',)
+
+    class Meta:
+        indexes = [
+            # Список клієнтів: фільтр за статусом, сортування за id
+            models.Index(fields=['status', '-id'], name='client_status_id_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.first_name} {self.last_name}'.strip() or self.email
+
+
+class Service(TrackedModel):
+    class Status(models.TextChoices):
+        PENDING = 'Pending', 'Pending'
+        ACTIVE = 'Active', 'Active'
+        SUSPENDED = 'Suspended', 'Suspended'
+        TERMINATED = 'Terminated', 'Terminated'
+        CANCELLED = 'Cancelled', 'Cancelled'
+        FRAUD = 'Fraud', 'Fraud'
+        COMPLETED = 'Completed', 'Completed'
+
+    # Окремий індекс client_id не потрібен: його покриває service_client_id_idx
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='services', db_index=False)
+    product = models.CharField(max_length=255)
+    domain = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    billing_cycle = models.CharField(max_length=32, blank=True)
+    amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    registration_date = models.DateField(null=True, blank=True)
+    next_due_date = models.DateField(null=True, blank=True)
+
+    tracked_fields = ('status',)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-id'], name='service_status_id_idx'),
+            models.Index(fields=['client', '-id'], name='service_client_id_idx'),
+        ]
+
+    def __str__(self):
+        return self.domain or self.product
+
+
+class Invoice(TrackedModel):
+    class Status(models.TextChoices):
+        DRAFT = 'Draft', 'Draft'
+        UNPAID = 'Unpaid', 'Unpaid'
+        PAID = 'Paid', 'Paid'
+        CANCELLED = 'Cancelled', 'Cancelled'
+        REFUNDED = 'Refunded', 'Refunded'
+        COLLECTIONS = 'Collections', 'Collections'
+        PAYMENT_PENDING = 'Payment Pending', 'Payment Pending'
+
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='invoices', db_index=False)
+    # Номер з WHMCS (invoicenum) може бути порожнім - тоді показується id
+    number = models.CharField(max_length=64, blank=True)
+    date = models.DateField()
+    due_date = models.DateField()
+    date_paid = models.DateTimeField(null=True, blank=True)
+    subtotal = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    tax = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.UNPAID)
+
+    tracked_fields = ('status', 'total', 'date_paid')
+
+    class Meta:
+        indexes = [
+            # Решта колонок списку рахунків в INCLUDE: сторінка читається
+            # лише з індексу (index-only scan у PostgreSQL)
+            models.Index(fields=['-date', '-id'], name='invoice_date_id_idx',
+                         include=['client', 'number', 'due_date', 'total', 'status']),
+            models.Index(fields=['status', '-date', '-id'], name='invoice_status_date_idx',
+                         include=['client', 'number', 'due_date', 'total']),
+            models.Index(fields=['client', '-date', '-id'], name='invoice_client_date_idx'),
+        ]
+
+    def __str__(self):
+        return self.number or str(self.pk)
+
+
+class InvoiceItem(models.Model):
+    invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, related_name='items')
+    # Тип та id пов'язаного запису WHMCS (Hosting, Domain, Addon, ...)
+    type = models.CharField(max_length=32, blank=True)
+    rel_id = models.BigIntegerField(default=0)
+    description = models.TextField()
+    amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    def __str__(self):
+        return self.description[:50]
+
+
+class Ticket(TrackedModel):
+    class Status(models.TextChoices):
+        OPEN = 'Open', 'Open'
+        ANSWERED = 'Answered', 'Answered'
+        CUSTOMER_REPLY = 'Customer-Reply', 'Customer-Reply'
+        ON_HOLD = 'On Hold', 'On Hold'
+        IN_PROGRESS = 'In Progress', 'In Progress'
+        CLOSED = 'Closed', 'Closed'
+
+    client = models.ForeignKey(Client, on_delete=models.SET_NULL, null=True, blank=True, related_name='tickets')
+    # Публічний номер тікета WHMCS (tid)
+    tid = models.CharField(max_length=32)
+    subject = models.CharField(max_length=255)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.OPEN)
+    priority = models.CharField(max_length=16, default='Medium')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    tracked_fields = ('status',)
+
+    def __str__(self):
+        return f'#{self.tid} {self.subject}'
+
+
+class SummaryCounter(models.Model):
+    """Попередньо пораховані агрегати дашборду (див. admin_panel.summary)
+
+    metric - що рахується (clients, services, invoices, tickets, revenue),
+    bucket - статус або день (YYYY-MM-DD) для revenue.
+    """
+
+    metric = models.CharField(max_length=32)
+    bucket = models.CharField(max_length=32)
+    count = models.BigIntegerField(default=0)
+    amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'bucket'], name='summary_counter_metric_bucket'),
+        ]
+
+    def __str__(self):
+        return f'{self.metric}:{self.bucket} = {self.count} / {self.amount}'
+
+
+class ImportCheckpoint(models.Model):
+    """Прогрес імпорту таблиці WHMCS (див. admin_panel.importer)
+
+    Пачки мають фіксований розмір; ``done_through`` - кількість пачок,
+    завантажених поспіль від початку, ``completed`` - номери пачок після
+    неї, які паралельні воркери завантажили раніше за попередні.
+    """
+
+    source = models.CharField(max_length=500)
+    table = models.CharField(max_length=32)
+    batch_size = models.PositiveIntegerField()
+    done_through = models.BigIntegerField(default=0)
+    completed = models.JSONField(default=list)
+    rows_loaded = models.BigIntegerField(default=0)
+    rows_skipped = models.BigIntegerField(default=0)
+    finished = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'table'], name='import_checkpoint_source_table'),
+        ]
+
+    def __str__(self):
+        return f'{self.table} <- {self.source}'
+
+    def is_done(self, batch: int) -> bool:
+        return batch < self.done_through or batch in self.completed
+
+    def mark_done(self, batch: int) -> None:
+        completed = set(self.completed)
+        completed.add(batch)
+        while self.done_through in completed:
+            completed.discard(self.done_through)
+            self.done_through += 1
+        self.completed = sorted(completed)
+
+
+class SearchDocument(models.Model):
+    """Денормалізований документ пошуку в навбарі (див. admin_panel.search)
+
+    Один рядок на клієнта, послугу або рахунок. У PostgreSQL міграція
+    додає згенеровану колонку ``search_vector`` (tsvector з ``text``) з
+    GIN індексом та trigram індекс на ``text``; у моделі їх немає, щоб
+    схема лишалась переносною.
+    """
+
+    class Kind(models.TextChoices):
+        CLIENT = 'client', 'Client'
+        SERVICE = 'service', 'Service'
+        INVOICE = 'invoice', 'Invoice'
+
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name='+')
+    title = models.CharField(max_length=255)
+    text = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_kind_object'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind}:{self.object_id} {self.title}'
@@ -0,0 +1,132 @@
+"""
+Keyset (seek) пагінація для списків панелі.
+
+Замість ``OFFSET`` сторінка продовжується від ключа сортування
+останнього показаного запису: ``WHERE (date, id) < (:date, :id)
+ORDER BY date DESC, id DESC LIMIT n``. З індексом на полях сортування
+це один прохід індексом на ``n`` рядків незалежно від того, наскільки
+далеко сторінка - OFFSET натомість перебирає і відкидає всі попередні
+рядки.
+
+Номерів сторінок немає: посилання "далі"/"назад" несуть непрозорий
+курсор з ключем крайнього запису. Поля сортування мають бути NOT NULL,
+а останнє - унікальним (зазвичай ``id``).
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+from typing import List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+PER_PAGE = 50
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+@dataclass
+class KeysetPage:
+    object_list: List
+    has_next: bool
+    has_previous: bool
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Сторінки ``queryset`` у порядку ``ordering`` (наприклад ``('-date', '-id')``)
+
+    ``queryset`` може бути ``values()``/``only()`` - поля сортування мають
+    входити в проекцію.
+    """
+
+    def __init__(self, queryset, ordering: Sequence[str], per_page: int = PER_PAGE):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        opts = queryset.model._meta
+        self.fields = [(opts.get_field(name.lstrip('-')), name.startswith('-')) for name in self.ordering]
+
+    # Курсор
+
+    def encode(self, direction: str, row) -> str:
+        key = [field.value_to_string(row) if not isinstance(row, dict) else _string(row[field.name])
+               for field, _descending in self.fields]
+        payload = json.dumps([direction, key], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    def decode(self, cursor: str) -> Optional[Tuple[str, list]]:
+        """(напрям, значення ключа) або None для пошкодженого курсора"""
+        try:
+            payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            direction, key = json.loads(payload)
+            if direction not in (NEXT, PREVIOUS) or len(key) != len(self.fields):
+                return None
+            return direction, [field.to_python(value) for (field, _descending), value in zip(self.fields, key)]
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            return None
+
+    # Запит
+
+    def _seek(self, key: list, forward: bool) -> Q:
+        """Рядки строго після ``key`` у порядку сортування (або до нього)"""
+        clauses = []
+        for index, (field, descending) in enumerate(self.fields):
+            lookup = 'lt' if descending == forward else 'gt'
+            equal = {self.fields[prev][0].attname: key[prev] for prev in range(index)}
+            clauses.append(Q(**equal, **{f'{field.attname}__{lookup}': key[index]}))
+        # Нестрога межа за першим полем дає індексу діапазон, OR-умова лише відсікає рівні ключі
+        first, descending = self.fields[0]
+        bound = Q(**{f'{first.attname}__{"lte" if descending == forward else "gte"}': key[0]})
+        return bound & reduce(or_, clauses)
+
+    def _ordering(self, forward: bool) -> List[str]:
+        if forward:
+            return list(self.ordering)
+        return [name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering]
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        decoded = self.decode(cursor) if cursor else None
+        direction, key = decoded if decoded else (NEXT, None)
+        forward = direction == NEXT
+
+        queryset = self.queryset
+        if key is not None:
+            queryset = queryset.filter(self._seek(key, forward))
+        rows = list(queryset.order_by(*self._ordering(forward))[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if forward:
+            has_next, has_previous = has_more, key is not None
+        else:
+            if not has_more:
+                # Дійшли до початку: показуємо повну першу сторінку
+                return self.page(None)
+            rows.reverse()
+            has_next, has_previous = True, True
+
+        return KeysetPage(
+            object_list=rows,
+            has_next=has_next and bool(rows),
+            has_previous=has_previous and bool(rows),
+            next_cursor=self.encode(NEXT, rows[-1]) if has_next and rows else None,
+            previous_cursor=self.encode(PREVIOUS, rows[0]) if has_previous and rows else None,
+        )
+
+
+def _string(value) -> str:
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
@@ -0,0 +1,215 @@
+"""
+Пошук клієнтів, послуг і рахунків для навбару панелі.
+
+Кожен запис має денормалізований ``SearchDocument``: заголовок для
+показу та ``text`` з полями, за якими шукають (ім'я, email, компанія,
+домен, номер рахунку). Документи оновлюються сигналами при збереженні
+та видаленні записів; після масових операцій (імпорт) індекс
+перебудовується командою ``rebuild_search_index``.
+
+У PostgreSQL запит іде двома індексами одночасно:
+
+- ``search_vector @@ to_tsquery('simple', 'слово:* & ...')`` - GIN по
+  tsvector, збіг за префіксами слів (ім'я, початок email)
+- ``text ILIKE '%фрагмент%'`` - GIN trigram індекс, збіг з середини
+  слова (частина домену чи email), від 3 символів
+
+Кандидатів обмежено ``CANDIDATES`` рядками до ранжування, тому навіть
+дуже поширений префікс не змушує рахувати ранг для всієї таблиці.
+Інші БД шукають через ``LIKE`` по ``text`` (для розробки).
+"""
+
+import re
+from typing import Iterable, List, Optional
+
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.urls import reverse
+
+from .models import Client, Invoice, SearchDocument, Service
+
+MIN_QUERY_LENGTH = 2
+# Мінімальна довжина фрагмента, з якої працює trigram індекс
+MIN_TRIGRAM_LENGTH = 3
+CANDIDATES = 200
+DEFAULT_LIMIT = 10
+REBUILD_BATCH_SIZE = 5000
+
+_TOKEN_RE = re.compile(r'[\w@.+-]+')
+
+# Поля, зміна яких оновлює документ (для save(update_fields=...))
+SEARCH_FIELDS = {
+    Client: {'first_name', 'last_name', 'company_name', 'email'},
+    Service: {'domain', 'product', 'client'},
+    Invoice: {'number', 'client'},
+}
+
+KINDS = {
+    Client: SearchDocument.Kind.CLIENT,
+    Service: SearchDocument.Kind.SERVICE,
+    Invoice: SearchDocument.Kind.INVOICE,
+}
+
+
+# Документи
+
+def _join(*parts) -> str:
+    return ' '.join(str(part) for part in parts if part)
+
+
+def _text(*parts) -> str:
+    # Нижній регістр: LIKE у SQLite не зводить регістр не-ASCII літер
+    return _join(*parts).lower()
+
+
+def document_for(instance) -> SearchDocument:
+    """Документ пошуку для клієнта, послуги або рахунку"""
+    if isinstance(instance, Client):
+        title = _join(instance.first_name, instance.last_name) or instance.email
+        text = _text(instance.first_name, instance.last_name, instance.company_name, instance.email)
+        client_id = instance.pk
+    elif isinstance(instance, Service):
+        title = instance.domain or instance.product
+        text = _text(instance.domain, instance.product)
+        client_id = instance.client_id
+    elif isinstance(instance, Invoice):
+        title = f'#{instance.number or instance.pk}'
+        text = _text(instance.number, instance.pk)
+        client_id = instance.client_id
+    else:
+        raise TypeError(f'{type(instance).__name__} is not searchable')
+    return SearchDocument(kind=KINDS[type(instance)], object_id=instance.pk, client_id=client_id,
+                          title=title[:255], text=text)
+
+
+def _after_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not SEARCH_FIELDS[sender] & set(update_fields):
+        return
+    document = document_for(instance)
+    SearchDocument.objects.update_or_create(
+        kind=document.kind, object_id=document.object_id,
+        defaults={'client_id': document.client_id, 'title': document.title, 'text': document.text},
+    )
+
+
+def _after_delete(sender, instance, **kwargs):
+    SearchDocument.objects.filter(kind=KINDS[sender], object_id=instance.pk).delete()
+
+
+def connect() -> None:
+    """Підключає оновлення документів (викликається з AppConfig.ready)"""
+    for model in KINDS:
+        uid = f'admin_panel.search.{model.__name__}'
+        post_save.connect(_after_save, sender=model, dispatch_uid=f'{uid}.post_save')
+        post_delete.connect(_after_delete, sender=model, dispatch_uid=f'{uid}.post_delete')
+
+
+def rebuild(batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """Перебудовує всі документи з таблиць (після імпорту або для звірки)"""
+    fields = {
+        Client: ('id', 'first_name', 'last_name', 'company_name', 'email'),
+        Service: ('id', 'client', 'domain', 'product'),
+        Invoice: ('id', 'client', 'number'),
+    }
+    count = 0
+    with transaction.atomic():
+        SearchDocument.objects.all().delete()
+        for model, names in fields.items():
+            batch = []
+            # only() + iterator(): потоково, без завантаження всієї таблиці
+            for instance in model.objects.only(*names).order_by().iterator(chunk_size=batch_size):
+                batch.append(document_for(instance))
+                if len(batch) == batch_size:
+                    SearchDocument.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            SearchDocument.objects.bulk_create(batch)
+            count += len(batch)
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {SearchDocument._meta.db_table}')
+    return count
+
+
+# Пошук
+
+def tokens(query: str) -> List[str]:
+    return _TOKEN_RE.findall(query.lower())
+
+
+def _tsquery(words: Iterable[str]) -> str:
+    # Кожне слово - окремий лексем у лапках з префіксним збігом
+    return ' & '.join("'{}':*".format(word.replace("'", "''").replace('\\', '\\\\')) for word in words)
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def _postgres_ids(query: str, words: List[str], limit: int) -> List[int]:
+    table = SearchDocument._meta.db_table
+    phrase = query.strip().lower()
+    use_trigram = len(phrase) >= MIN_TRIGRAM_LENGTH
+    match = 'd.search_vector @@ q.query'
+    params = [_tsquery(words)]
+    if use_trigram:
+        match += ' OR d.text ILIKE %s'
+        params.append(_like_pattern(phrase))
+    params += [CANDIDATES, phrase, limit]
+    sql = f"""
+        WITH q AS (SELECT to_tsquery('simple', %s) AS query),
+        candidates AS (
+            SELECT d.id, d.search_vector, d.text FROM {table} d, q
+            WHERE {match}
+            LIMIT %s
+        )
+        SELECT c.id FROM candidates c, q
+        ORDER BY ts_rank(c.search_vector, q.query) + similarity(c.text, %s) DESC, c.id DESC
+        LIMIT %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _fallback_ids(words: List[str], limit: int) -> List[int]:
+    queryset = SearchDocument.objects.all()
+    for word in words:
+        queryset = queryset.filter(text__contains=word)
+    return list(queryset.order_by('-id').values_list('id', flat=True)[:limit])
+
+
+def search(query: str, limit: int = DEFAULT_LIMIT) -> List[SearchDocument]:
+    """Документи за запитом, найрелевантніші першими"""
+    words = tokens(query)
+    if len(query.strip()) < MIN_QUERY_LENGTH or not words:
+        return []
+    if connection.vendor == 'postgresql':
+        ids = _postgres_ids(query, words, limit)
+    else:
+        ids = _fallback_ids(words, limit)
+    documents = SearchDocument.objects.select_related('client').only(
+        'kind', 'object_id', 'title', 'client__first_name', 'client__last_name', 'client__email',
+    ).in_bulk(ids)
+    return [documents[pk] for pk in ids if pk in documents]
+
+
+def url_for(document: SearchDocument) -> str:
+    """Сторінка, куди веде результат пошуку"""
+    if document.kind == SearchDocument.Kind.INVOICE:
+        return f"{reverse('admin_invoices')}?client={document.client_id}"
+    return f"{reverse('admin_services')}?client={document.client_id}"
+
+
+def as_json(document: SearchDocument) -> dict:
+    client: Optional[Client] = document.client
+    return {
+        'kind': document.kind,
+        'id': document.object_id,
+        'title': document.title,
+        'client': str(client) if client and document.kind != SearchDocument.Kind.CLIENT else '',
+        'url': url_for(document),
+    }
@@ -0,0 +1,227 @@
+"""
+Попередньо пораховані зведення для дашборду.
+
+Агрегати (клієнти, послуги, рахунки та тікети за статусами, дохід за
+днями) зберігаються в ``SummaryCounter`` і оновлюються інкрементально:
+сигнали моделей рахують дельту між завантаженим і новим станом запису
+та застосовують її через ``UPDATE ... SET count = count + d`` у тій
+самій транзакції. Дашборд читає всі потрібні лічильники одним запитом.
+
+Масові операції (``bulk_create``, ``QuerySet.update``, імпорт) сигналів
+не викликають - після них зведення перераховуються командою
+``rebuild_dashboard_summary`` (її ж варто запускати періодично для
+звірки).
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from whmcs_project.cache import SHARED, invalidate
+
+from .models import Client, Invoice, Service, SummaryCounter, Ticket
+
+DASHBOARD_CACHE_NAMESPACE = 'admin_panel.dashboard'
+
+CLIENTS = 'clients'
+SERVICES = 'services'
+INVOICES = 'invoices'
+TICKETS = 'tickets'
+REVENUE = 'revenue'
+
+STATUS_METRICS = (CLIENTS, SERVICES, INVOICES, TICKETS)
+
+# Статуси тікетів, які WHMCS вважає відкритими
+OPEN_TICKET_STATUSES = tuple(status for status in Ticket.Status.values if status != Ticket.Status.CLOSED)
+
+# (metric, bucket) -> (count, amount)
+Deltas = Dict[Tuple[str, str], List]
+
+
+def _day(value) -> str:
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date().isoformat()
+
+
+def contributions(model, values: Optional[dict]) -> List[Tuple[str, str, int, Decimal]]:
+    """Внесок запису зі значеннями ``values`` у лічильники"""
+    if values is None:
+        return []
+    if model is Client:
+        return [(CLIENTS, values['status'], 1, Decimal(0))]
+    if model is Service:
+        return [(SERVICES, values['status'], 1, Decimal(0))]
+    if model is Ticket:
+        return [(TICKETS, values['status'], 1, Decimal(0))]
+    if model is Invoice:
+        total = Decimal(values['total'] or 0)
+        rows = [(INVOICES, values['status'], 1, total)]
+        if values['status'] == Invoice.Status.PAID and values['date_paid'] is not None:
+            rows.append((REVENUE, _day(values['date_paid']), 1, total))
+        return rows
+    return []
+
+
+def diff(model, old: Optional[dict], new: Optional[dict]) -> Deltas:
+    deltas: Deltas = defaultdict(lambda: [0, Decimal(0)])
+    for metric, bucket, count, amount in contributions(model, new):
+        deltas[metric, bucket][0] += count
+        deltas[metric, bucket][1] += amount
+    for metric, bucket, count, amount in contributions(model, old):
+        deltas[metric, bucket][0] -= count
+        deltas[metric, bucket][1] -= amount
+    return {key: value for key, value in deltas.items() if value[0] or value[1]}
+
+
+def apply(deltas: Deltas) -> None:
+    """Додає дельти до лічильників (створює відсутні рядки)"""
+    if not deltas:
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        # Фіксований порядок: конкурентні транзакції блокують рядки в тій самій послідовності
+        for (metric, bucket), (count, amount) in sorted(deltas.items()):
+            counters = SummaryCounter.objects.filter(metric=metric, bucket=bucket)
+            if counters.update(count=F('count') + count, amount=F('amount') + amount, updated_at=now):
+                continue
+            _counter, created = SummaryCounter.objects.get_or_create(
+                metric=metric, bucket=bucket, defaults={'count': count, 'amount': amount},
+            )
+            if not created:
+                counters.update(count=F('count') + count, amount=F('amount') + amount, updated_at=now)
+    transaction.on_commit(lambda: invalidate(DASHBOARD_CACHE_NAMESPACE, aliases=[SHARED]))
+
+
+# Сигнали
+
+def _stored_values(instance) -> Optional[dict]:
+    """Стан запису в БД до збереження"""
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is not None:
+        return loaded
+    if instance.pk is None:
+        return None
+    # Запис створено не з БД (або з defer()/only()) - читаємо поточний стан
+    return type(instance)._base_manager.filter(pk=instance.pk).values(*instance.tracked_fields).first()
+
+
+def _before_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance._summary_previous = _stored_values(instance)
+
+
+def _after_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_summary_previous', None)
+    current = instance.tracked_values()
+    if update_fields is not None and previous is not None:
+        # save(update_fields=...) записує лише ці поля, решта в БД лишається попередньою
+        current = {name: value if name in update_fields else previous[name] for name, value in current.items()}
+    apply(diff(sender, previous, current))
+    instance._loaded_values = current
+
+
+def _after_delete(sender, instance, **kwargs):
+    previous = getattr(instance, '_loaded_values', None) or instance.tracked_values()
+    apply(diff(sender, previous, None))
+    instance._loaded_values = None
+
+
+TRACKED_MODELS = (Client, Service, Invoice, Ticket)
+
+
+def connect() -> None:
+    """Підключає інкрементальне оновлення (викликається з AppConfig.ready)"""
+    for model in TRACKED_MODELS:
+        uid = f'admin_panel.summary.{model.__name__}'
+        pre_save.connect(_before_save, sender=model, dispatch_uid=f'{uid}.pre_save')
+        post_save.connect(_after_save, sender=model, dispatch_uid=f'{uid}.post_save')
+        post_delete.connect(_after_delete, sender=model, dispatch_uid=f'{uid}.post_delete')
+
+
+# Повний перерахунок
+
+def _status_counts(model, metric: str, amount_field: Optional[str] = None) -> Iterable[SummaryCounter]:
+    aggregates = {'count': Count('pk')}
+    if amount_field:
+        aggregates['amount'] = Sum(amount_field)
+    for row in model.objects.order_by().values('status').annotate(**aggregates):
+        yield SummaryCounter(metric=metric, bucket=row['status'], count=row['count'],
+                             amount=row.get('amount') or 0)
+
+
+def _revenue() -> Iterable[SummaryCounter]:
+    rows = (Invoice.objects.filter(status=Invoice.Status.PAID, date_paid__isnull=False)
+            .annotate(day=TruncDate('date_paid')).order_by()
+            .values('day').annotate(count=Count('pk'), amount=Sum('total')))
+    for row in rows:
+        yield SummaryCounter(metric=REVENUE, bucket=row['day'].isoformat(), count=row['count'],
+                             amount=row['amount'] or 0)
+
+
+def rebuild() -> int:
+    """Перераховує всі лічильники з таблиць (після імпорту або для звірки)"""
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Конкурентні дельти чекають кінця перерахунку і застосовуються вже до нових значень
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {SummaryCounter._meta.db_table} IN EXCLUSIVE MODE')
+        counters = [
+            *_status_counts(Client, CLIENTS),
+            *_status_counts(Service, SERVICES),
+            *_status_counts(Invoice, INVOICES, amount_field='total'),
+            *_status_counts(Ticket, TICKETS),
+            *_revenue(),
+        ]
+        SummaryCounter.objects.all().delete()
+        SummaryCounter.objects.bulk_create(counters, batch_size=1000)
+    transaction.on_commit(lambda: invalidate(DASHBOARD_CACHE_NAMESPACE, aliases=[SHARED]))
+    return len(counters)
+
+
+# Читання
+
+def status_counts(metric: str) -> Dict[str, int]:
+    """Кількість записів за статусами, {статус: кількість}"""
+    return dict(SummaryCounter.objects.filter(metric=metric).values_list('bucket', 'count'))
+
+
+def dashboard_summary(today: Optional[date] = None) -> dict:
+    """Зведення для дашборду одним запитом до SummaryCounter"""
+    today = today or timezone.localdate()
+    month_start = today.replace(day=1)
+    rows = SummaryCounter.objects.filter(
+        Q(metric__in=STATUS_METRICS)
+        | Q(metric=REVENUE, bucket__gte=month_start.isoformat(), bucket__lte=today.isoformat())
+    ).values_list('metric', 'bucket', 'count', 'amount')
+
+    counts: Dict[str, Dict[str, int]] = defaultdict(dict)
+    amounts: Dict[str, Dict[str, Decimal]] = defaultdict(dict)
+    for metric, bucket, count, amount in rows:
+        counts[metric][bucket] = count
+        amounts[metric][bucket] = amount
+
+    return {
+        'active_clients': counts[CLIENTS].get(Client.Status.ACTIVE, 0),
+        'total_clients': sum(counts[CLIENTS].values()),
+        'active_services': counts[SERVICES].get(Service.Status.ACTIVE, 0),
+        'services_by_status': [
+            (label, counts[SERVICES].get(status, 0)) for status, label in Service.Status.choices
+        ],
+        'unpaid_invoices': counts[INVOICES].get(Invoice.Status.UNPAID, 0),
+        'unpaid_amount': amounts[INVOICES].get(Invoice.Status.UNPAID, Decimal(0)),
+        'revenue_period_start': month_start,
+        'revenue_period': sum(amounts[REVENUE].values(), Decimal(0)),
+        'paid_invoices_period': sum(counts[REVENUE].values()),
+        'open_tickets': sum(counts[TICKETS].get(status, 0) for status in OPEN_TICKET_STATUSES),
+    }
@@ -0,0 +1,771 @@
+import gzip
+import io
+import os
+import tempfile
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import checks, importer, search, summary, throttling
+from .pagination import KeysetPaginator
+from whmcs_project import importtime, staticfiles, users
+from whmcs_project.sessions import purge_expired
+
+from .models import (Client, ImportCheckpoint, Invoice, InvoiceItem, SearchDocument, Service, SummaryCounter,
+                     Ticket)
+
+# Лічильники спроб входу живуть у спільному кеші - тестам потрібен ізольований
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'admin-tests-local'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'admin-tests-shared'},
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class AdminViewsTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.admin = User.objects.create_user('admin', password='secret', is_staff=True)
+
+    def test_login_and_dashboard(self):
+        response = self.client.post(reverse('admin_login'), {'username': 'admin', 'password': 'secret'})
+        self.assertRedirects(response, reverse('admin_dashboard'))
+
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['stats']['total_users'].value, 1)
+
+    def test_login_rejects_non_staff(self):
+        User.objects.create_user('client', password='secret')
+        response = self.client.post(reverse('admin_login'), {'username': 'client', 'password': 'secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_dashboard_requires_login(self):
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('admin_login'), response.url)
+
+    def test_profile_update(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(reverse('admin_profile'), {
+            'first_name': 'Іван', 'last_name': 'Петренко', 'email': 'ivan@example.com',
+        })
+        self.assertRedirects(response, reverse('admin_profile'))
+
+        self.admin.refresh_from_db()
+        self.assertEqual(self.admin.first_name, 'Іван')
+        self.assertEqual(self.admin.email, 'ivan@example.com')
+
+    def test_logout(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin_logout'))
+        self.assertRedirects(response, reverse('admin_login'))
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+
+@override_settings(CACHES=TEST_CACHES, LOGIN_THROTTLE_USERNAME_LIMIT=3, LOGIN_THROTTLE_IP_LIMIT=5,
+                   LOGIN_THROTTLE_LOCKOUT_BASE=60)
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        User.objects.create_user('admin', password='secret', is_staff=True)
+
+    def login(self, password, username='admin', ip='10.0.0.1'):
+        return self.client.post(reverse('admin_login'), {'username': username, 'password': password},
+                                REMOTE_ADDR=ip)
+
+    def test_username_lockout_skips_authentication(self):
+        for _ in range(2):
+            self.assertEqual(self.login('wrong').status_code, 200)
+        response = self.login('wrong')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+
+        # Навіть правильний пароль не перевіряється під час блокування
+        self.assertEqual(self.login('secret', ip='10.0.1.1').status_code, 429)
+        self.assertEqual(throttling.stats()['blocked:username'], 1)
+
+    def test_ip_lockout_across_usernames(self):
+        for index in range(5):
+            self.login('wrong', username=f'user{index}')
+        self.assertEqual(self.login('secret').status_code, 429)
+        self.assertEqual(self.login('secret', ip='10.0.0.2').status_code, 302)
+
+    def test_lockout_doubles(self):
+        request = RequestFactory().post('/', REMOTE_ADDR='10.0.0.1')
+        for _ in range(2):
+            throttling.register_failure(request, 'admin')
+        self.assertEqual(throttling.register_failure(request, 'admin').retry_after, 60)
+        self.assertEqual(throttling.register_failure(request, 'admin').retry_after, 120)
+
+    def test_success_resets_username_counter(self):
+        self.login('wrong')
+        self.login('wrong')
+        self.assertEqual(self.login('secret').status_code, 302)
+        self.client.logout()
+        self.login('wrong')
+        self.assertEqual(self.login('wrong').status_code, 200)
+
+    def test_subnet(self):
+        self.assertEqual(throttling.subnet('192.168.1.77'), '192.168.1.0/24')
+        self.assertEqual(throttling.subnet('2001:db8::1'), '2001:db8::/64')
+
+
+@override_settings(CACHES=TEST_CACHES)
+class SummaryTests(TestCase):
+    TODAY = date(2026, 3, 15)
+
+    def setUp(self):
+        self.client_record = Client.objects.create(first_name='Олена', last_name='Коваль', email='olena@example.com',
+                                                   created_at=date(2026, 1, 1))
+
+    def invoice(self, **kwargs):
+        defaults = {'client': self.client_record, 'date': self.TODAY, 'due_date': self.TODAY,
+                    'total': Decimal('100.00')}
+        return Invoice.objects.create(**defaults | kwargs)
+
+    def counters(self):
+        return set(SummaryCounter.objects.exclude(count=0, amount=0).values_list('metric', 'bucket', 'count', 'amount'))
+
+    def test_incremental_updates(self):
+        Service.objects.create(client=self.client_record, product='Hosting', status=Service.Status.ACTIVE)
+        Ticket.objects.create(client=self.client_record, tid='T1', subject='Help',
+                              created_at=datetime(2026, 3, 1, tzinfo=timezone.utc),
+                              updated_at=datetime(2026, 3, 1, tzinfo=timezone.utc))
+        invoice = self.invoice()
+        self.invoice(total=Decimal('50.00'))
+
+        stats = summary.dashboard_summary(self.TODAY)
+        self.assertEqual(stats['active_clients'], 1)
+        self.assertEqual(stats['active_services'], 1)
+        self.assertEqual(stats['open_tickets'], 1)
+        self.assertEqual(stats['unpaid_invoices'], 2)
+        self.assertEqual(stats['unpaid_amount'], Decimal('150.00'))
+
+        invoice = Invoice.objects.get(pk=invoice.pk)
+        invoice.status = Invoice.Status.PAID
+        invoice.date_paid = datetime(2026, 3, 10, 12, tzinfo=timezone.utc)
+        invoice.save()
+
+        stats = summary.dashboard_summary(self.TODAY)
+        self.assertEqual(stats['unpaid_invoices'], 1)
+        self.assertEqual(stats['unpaid_amount'], Decimal('50.00'))
+        self.assertEqual(stats['revenue_period'], Decimal('100.00'))
+        self.assertEqual(stats['paid_invoices_period'], 1)
+        # Дохід попереднього місяця не входить у період
+        self.assertEqual(summary.dashboard_summary(date(2026, 4, 2))['revenue_period'], Decimal(0))
+
+        # Повторне збереження без змін не рахується двічі
+        invoice.save()
+        self.assertEqual(summary.dashboard_summary(self.TODAY)['revenue_period'], Decimal('100.00'))
+
+        self.client_record.delete()
+        stats = summary.dashboard_summary(self.TODAY)
+        self.assertEqual((stats['total_clients'], stats['unpaid_invoices'], stats['revenue_period']), (0, 0, 0))
+
+    def test_rebuild_matches_incremental(self):
+        Service.objects.create(client=self.client_record, product='VPS', status=Service.Status.SUSPENDED)
+        self.invoice(status=Invoice.Status.PAID, date_paid=datetime(2026, 3, 2, tzinfo=timezone.utc))
+        self.invoice()
+        incremental = self.counters()
+
+        SummaryCounter.objects.all().delete()
+        summary.rebuild()
+        self.assertEqual(self.counters(), incremental)
+
+    def test_dashboard_reads_one_query(self):
+        self.invoice()
+        with self.assertNumQueries(1):
+            summary.dashboard_summary(self.TODAY)
+
+    def test_update_fields_counts_only_written_fields(self):
+        invoice = Invoice.objects.get(pk=self.invoice().pk)
+        # Статус змінено лише в пам'яті - зберігається тільки сума
+        invoice.status = Invoice.Status.PAID
+        invoice.date_paid = datetime(2026, 3, 10, 12, tzinfo=timezone.utc)
+        invoice.total = Decimal('80.00')
+        invoice.save(update_fields=['total'])
+
+        stats = summary.dashboard_summary(self.TODAY)
+        self.assertEqual((stats['unpaid_invoices'], stats['unpaid_amount']), (1, Decimal('80.00')))
+        self.assertEqual((stats['paid_invoices_period'], stats['revenue_period']), (0, Decimal(0)))
+
+        # Подальше повне збереження рахує перехід від того, що справді в БД
+        invoice.save()
+        stats = summary.dashboard_summary(self.TODAY)
+        self.assertEqual((stats['unpaid_invoices'], stats['revenue_period']), (0, Decimal('80.00')))
+        incremental = self.counters()
+        summary.rebuild()
+        self.assertEqual(self.counters(), incremental)
+
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ImporterTests(TestCase):
+    CLIENTS = (
+        'id,firstname,lastname,companyname,email,status,datecreated\n'
+        '1,Олена,Коваль,,olena@example.com,Active,2026-01-01\n'
+        '2,Ігор,Бондар,ТОВ "Хост",igor@example.com,Inactive,2026-01-02\n'
+        '3,Без,Дати,,nodate@example.com,Active,0000-00-00\n'
+    )
+    SERVICES = (
+        'id,userid,packageid,domain,domainstatus,billingcycle,amount,regdate,nextduedate\n'
+        '10,1,5,example.com,Active,Monthly,10.00,2026-01-01,2026-02-01\n'
+        '11,2,6,example.org,Suspended,Annually,100.00,2026-01-02,0000-00-00\n'
+        '12,99,5,orphan.com,Active,Monthly,10.00,2026-01-01,2026-02-01\n'
+    )
+    INVOICES = (
+        'id,userid,invoicenum,date,duedate,datepaid,subtotal,tax,tax2,total,status\n'
+        '100,1,INV-100,2026-03-01,2026-03-08,2026-03-02 10:00:00,100.00,20.00,0,120.00,Paid\n'
+        '101,2,,2026-03-01,2026-03-08,0000-00-00 00:00:00,50.00,0,0,50.00,Unpaid\n'
+    )
+    ITEMS = (
+        'id,invoiceid,type,relid,description,amount\n'
+        '1000,100,Hosting,10,Hosting example.com,100.00\n'
+        '1001,999,Hosting,10,Orphan item,5.00\n'
+    )
+    PRODUCTS = 'id,name\n5,Shared Hosting\n'
+
+    def setUp(self):
+        temp = tempfile.TemporaryDirectory()
+        self.addCleanup(temp.cleanup)
+        self.csv_dir = Path(temp.name)
+        for name, content in (('tblclients', self.CLIENTS), ('tblhosting', self.SERVICES),
+                              ('tblinvoices', self.INVOICES), ('tblinvoiceitems', self.ITEMS),
+                              ('tblproducts', self.PRODUCTS)):
+            (self.csv_dir / f'{name}.csv').write_text(content, encoding='utf-8')
+
+    def run_import(self, **kwargs):
+        results = importer.run_import(importer.Source(csv_dir=self.csv_dir), batch_size=2, **kwargs)
+        return {result.table: result for result in results}
+
+    def test_csv_import(self):
+        results = self.run_import()
+
+        self.assertEqual((results['clients'].loaded, results['clients'].skipped), (2, 1))
+        self.assertEqual((results['services'].loaded, results['services'].skipped), (2, 1))
+        self.assertEqual((results['invoices'].loaded, results['invoices'].skipped), (2, 0))
+        self.assertEqual((results['items'].loaded, results['items'].skipped), (1, 1))
+
+        self.assertEqual(Client.objects.get(pk=2).company_name, 'ТОВ "Хост"')
+        self.assertEqual(Service.objects.get(pk=10).product, 'Shared Hosting')
+        self.assertEqual(Service.objects.get(pk=11).product, 'Package #6')
+        self.assertIsNone(Service.objects.get(pk=11).next_due_date)
+        paid = Invoice.objects.get(pk=100)
+        self.assertEqual((paid.tax, paid.total), (Decimal('20.00'), Decimal('120.00')))
+        self.assertIsNotNone(paid.date_paid)
+        self.assertIsNone(Invoice.objects.get(pk=101).date_paid)
+
+        # Послідовність продовжується після імпортованих id
+        created = Client.objects.create(first_name='Нова', last_name='Клієнтка', email='new@example.com',
+                                        created_at=date(2026, 4, 1))
+        self.assertGreater(created.pk, 2)
+
+    def test_resume_skips_completed_batches(self):
+        ImportCheckpoint.objects.create(source=str(self.csv_dir.resolve()), table='clients', batch_size=2,
+                                        done_through=1)
+        results = self.run_import(tables=['clients'])
+
+        self.assertEqual(results['clients'].resumed_batches, 1)
+        self.assertEqual(list(Client.objects.values_list('pk', flat=True)), [])
+
+        self.run_import(tables=['clients'], restart=True)
+        results = self.run_import(tables=['clients'])
+        self.assertTrue(results['clients'].already_finished)
+        self.assertEqual(Client.objects.count(), 2)
+
+    def test_rerun_does_not_duplicate(self):
+        self.run_import()
+        ImportCheckpoint.objects.update(finished=False, done_through=0, completed=[])
+        results = self.run_import()
+
+        self.assertEqual(sum(result.loaded for result in results.values()), 0)
+        self.assertEqual((Client.objects.count(), InvoiceItem.objects.count()), (2, 1))
+
+    def test_batch_size_mismatch(self):
+        ImportCheckpoint.objects.create(source=str(self.csv_dir.resolve()), table='clients', batch_size=500,
+                                        done_through=1)
+        with self.assertRaises(importer.WhmcsImportError):
+            self.run_import(tables=['clients'])
+
+    def test_dump_parsing(self):
+        dump = self.csv_dir / 'whmcs.sql.gz'
+        with gzip.open(dump, 'wt', encoding='utf-8') as f:
+            f.write(
+                'CREATE TABLE `tblclients` (\n'
+                '  `id` int(10) NOT NULL AUTO_INCREMENT,\n'
+                '  `firstname` text NOT NULL,\n'
+                '  `lastname` text NOT NULL,\n'
+                '  PRIMARY KEY (`id`)\n'
+                ') ENGINE=InnoDB;\n'
+                "INSERT INTO `tbladmins` VALUES (1,'admin');\n"
+                "INSERT INTO `tblclients` VALUES (1,'O\\'Brien','a,b (c)'),(2,'Line\\nbreak',NULL);\n"
+                "INSERT INTO `tblclients` (`id`, `lastname`) VALUES (3,'It''s');\n"
+            )
+        rows = list(importer.iter_dump_rows(dump, 'tblclients'))
+
+        self.assertEqual(rows, [
+            {'id': '1', 'firstname': "O'Brien", 'lastname': 'a,b (c)'},
+            {'id': '2', 'firstname': 'Line\nbreak', 'lastname': None},
+            {'id': '3', 'lastname': "It's"},
+        ])
+
+    def test_dump_unsupported_insert(self):
+        dump = self.csv_dir / 'whmcs.sql'
+        dump.write_text(
+            "INSERT INTO `tblclients` (`id`, `firstname`) VALUES (1,'Олена');\n"
+            "INSERT INTO `tblclients` (`id`, `firstname`) VALUES(2,'Ігор');\n",
+            encoding='utf-8',
+        )
+        with self.assertRaisesMessage(importer.WhmcsImportError,
+                                      'tblclients: unsupported INSERT syntax at whmcs.sql:2'):
+            list(importer.iter_dump_rows(dump, 'tblclients'))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ListTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.client_record = Client.objects.create(first_name='Олена', last_name='Коваль', email='olena@example.com',
+                                                   created_at=date(2026, 1, 1))
+        # Кілька рахунків на день: ключ сортування (date, id) з однаковими датами
+        for index in range(7):
+            day = date(2026, 3, 1 + index // 3)
+            Invoice.objects.create(client=self.client_record, date=day, due_date=day, total=Decimal(index),
+                                   status=Invoice.Status.PAID if index % 2 else Invoice.Status.UNPAID)
+        self.expected = list(Invoice.objects.order_by('-date', '-id').values_list('id', flat=True))
+
+    def walk(self, paginator):
+        pages, page = [], paginator.page()
+        while True:
+            pages.append([row['id'] for row in page])
+            if not page.has_next:
+                return pages, page
+            page = paginator.page(page.next_cursor)
+
+    def test_keyset_forward_and_back(self):
+        paginator = KeysetPaginator(Invoice.objects.values('id', 'date'), ('-date', '-id'), per_page=3)
+        pages, last = self.walk(paginator)
+
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        previous = paginator.page(last.previous_cursor)
+        self.assertEqual([row['id'] for row in previous], pages[1])
+        self.assertTrue(previous.has_next and previous.has_previous)
+        first = paginator.page(previous.previous_cursor)
+        self.assertEqual([row['id'] for row in first], pages[0])
+        self.assertFalse(first.has_previous)
+
+    def test_invalid_cursor_shows_first_page(self):
+        paginator = KeysetPaginator(Invoice.objects.values('id', 'date'), ('-date', '-id'), per_page=3)
+        self.assertEqual([row['id'] for row in paginator.page('not-a-cursor')], self.expected[:3])
+
+    def test_list_views(self):
+        self.client.force_login(User.objects.create_user('admin', password='secret', is_staff=True))
+        for name in ('admin_clients', 'admin_services', 'admin_invoices'):
+            self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+
+        response = self.client.get(reverse('admin_invoices'), {'status': 'Paid', 'client': self.client_record.pk})
+        self.assertEqual([row['id'] for row in response.context['page']],
+                         list(Invoice.objects.filter(status='Paid').order_by('-date', '-id')
+                              .values_list('id', flat=True)))
+        self.assertEqual(response.context['filter_query'], f'status=Paid&client={self.client_record.pk}')
+
+    def test_list_requires_staff(self):
+        self.client.force_login(User.objects.create_user('client', password='secret'))
+        self.assertRedirects(self.client.get(reverse('admin_clients')), reverse('admin_login'),
+                             fetch_redirect_response=False)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class SearchTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.olena = Client.objects.create(first_name='Олена', last_name='Коваль', company_name='Хостинг Плюс',
+                                           email='olena@example.com', created_at=date(2026, 1, 1))
+        self.service = Service.objects.create(client=self.olena, product='Shared Hosting', domain='koval-shop.com.ua')
+        self.invoice = Invoice.objects.create(client=self.olena, number='INV-2026-0042', date=date(2026, 3, 1),
+                                              due_date=date(2026, 3, 8))
+
+    def found(self, query):
+        return [(document.kind, document.object_id) for document in search.search(query)]
+
+    def test_documents_follow_saves_and_deletes(self):
+        self.assertEqual(SearchDocument.objects.count(), 3)
+
+        self.olena.email = 'olena.koval@example.org'
+        self.olena.save()
+        self.assertIn('olena.koval@example.org', SearchDocument.objects.get(kind='client').text)
+
+        # Поля поза пошуком не змінюють документ
+        updated_at = SearchDocument.objects.get(kind='invoice').updated_at
+        self.invoice.status = Invoice.Status.PAID
+        self.invoice.save(update_fields=['status'])
+        self.assertEqual(SearchDocument.objects.get(kind='invoice').updated_at, updated_at)
+
+        self.service.delete()
+        self.assertFalse(SearchDocument.objects.filter(kind='service').exists())
+
+    def test_search(self):
+        self.assertEqual(self.found('олена'), [('client', self.olena.pk)])
+        self.assertEqual(self.found('example.com'), [('client', self.olena.pk)])
+        self.assertEqual(self.found('shop'), [('service', self.service.pk)])
+        self.assertEqual(self.found('0042'), [('invoice', self.invoice.pk)])
+        self.assertEqual(self.found('x'), [])
+        self.assertEqual(self.found('nothing-like-this'), [])
+
+    def test_rebuild(self):
+        SearchDocument.objects.all().delete()
+        self.assertEqual(search.rebuild(batch_size=2), 3)
+        self.assertEqual(self.found('олена'), [('client', self.olena.pk)])
+        self.assertEqual(self.found('shop'), [('service', self.service.pk)])
+        self.assertEqual(SearchDocument.objects.get(kind='service').client_id, self.olena.pk)
+
+    def test_suggest_endpoint(self):
+        self.client.force_login(User.objects.create_user('admin', password='secret', is_staff=True))
+        response = self.client.get(reverse('admin_search_suggest'), {'q': 'INV-2026'})
+        self.assertEqual(response.json()['results'], [{
+            'kind': 'invoice', 'id': self.invoice.pk, 'title': '#INV-2026-0042', 'client': 'Олена Коваль',
+            'url': f"{reverse('admin_invoices')}?client={self.olena.pk}",
+        }])
+
+        response = self.client.get(reverse('admin_search'), {'q': 'olena'})
+        self.assertContains(response, 'Олена Коваль')
+
+    def test_suggest_requires_staff(self):
+        self.client.force_login(User.objects.create_user('client', password='secret'))
+        self.assertEqual(self.client.get(reverse('admin_search_suggest'), {'q': 'olena'}).status_code, 403)
+
+
+@override_settings(CACHES=TEST_CACHES, SESSION_ENGINE='whmcs_project.sessions.cached_db')
+class SessionTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.admin = User.objects.create_user('admin', password='secret', is_staff=True)
+        self.client.force_login(self.admin)
+
+    def session_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in queries if 'django_session' in query['sql']]
+
+    def test_unchanged_session_is_not_written(self):
+        # Дані з кешу, запис пропущено: жодного запиту до django_session
+        self.assertEqual(self.session_queries(reverse('admin_dashboard')), [])
+        self.assertEqual(self.session_queries(reverse('admin_profile')), [])
+
+    @override_settings(SESSION_REFRESH_INTERVAL=0)
+    def test_expiry_is_refreshed_after_interval(self):
+        expire_date = Session.objects.get().expire_date
+        queries = self.session_queries(reverse('admin_dashboard'))
+        self.assertTrue(any(sql.startswith('UPDATE') for sql in queries))
+        self.assertGreaterEqual(Session.objects.get().expire_date, expire_date)
+
+    def test_logout_deletes_session(self):
+        self.client.get(reverse('admin_logout'))
+        self.assertFalse(Session.objects.exists())
+
+    @override_settings(SESSION_ENGINE='whmcs_project.sessions.signed_cookies')
+    def test_signed_cookies(self):
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('sessionid', response.cookies)
+        self.assertFalse([query for query in queries if 'django_session' in query['sql']])
+
+        with self.settings(SESSION_REFRESH_INTERVAL=0):
+            response = self.client.get(reverse('admin_dashboard'))
+        self.assertIn('sessionid', response.cookies)
+
+    def test_purge_expired(self):
+        past = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        Session.objects.bulk_create([
+            Session(session_key=f'expired{index:03d}', session_data='', expire_date=past) for index in range(5)
+        ])
+        self.assertEqual(purge_expired(Session, batch_size=2), 5)
+        self.assertEqual(Session.objects.count(), 1)
+
+        Session.objects.create(session_key='expired-again', session_data='', expire_date=past)
+        call_command('purge_sessions', '--batch-size', '10', stdout=io.StringIO())
+        self.assertEqual(Session.objects.count(), 1)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class UserSnapshotTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        self.admin = User.objects.create_user('admin', password='secret', is_staff=True, first_name='Іван')
+        self.client.force_login(self.admin)
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [query['sql'] for query in queries if 'FROM "auth_user"' in query['sql']]
+
+    def test_snapshot_replaces_user_query(self):
+        response, queries = self.user_queries(reverse('admin_profile'))
+        self.assertEqual(len(queries), 1)
+        self.assertIsInstance(response.context['user'], User)
+
+        response, queries = self.user_queries(reverse('admin_profile'))
+        self.assertEqual(queries, [])
+        self.assertIsInstance(response.context['user'], users.UserSnapshot)
+        self.assertContains(response, 'Іван')
+
+    def test_save_invalidates_snapshot(self):
+        self.client.get(reverse('admin_dashboard'))
+        User.objects.filter(pk=self.admin.pk).update(first_name='Петро')
+        response, queries = self.user_queries(reverse('admin_profile'))
+        self.assertEqual(queries, [])
+        self.assertContains(response, 'Іван')
+
+        self.admin.first_name = 'Петро'
+        self.admin.save()
+        response, queries = self.user_queries(reverse('admin_profile'))
+        self.assertEqual(len(queries), 1)
+        self.assertContains(response, 'Петро')
+
+    def test_password_change_ends_session(self):
+        self.client.get(reverse('admin_dashboard'))
+        self.admin.set_password('new-secret')
+        self.admin.save()
+        self.assertEqual(self.client.get(reverse('admin_dashboard')).status_code, 302)
+
+    def test_stale_fingerprint_is_ignored(self):
+        self.client.get(reverse('admin_dashboard'))
+        # Пароль змінено в обхід ORM: знімок лишився, але сесія зі старим хешем не відповідає новому
+        key = f'user-snapshot:{self.admin.pk}'
+        data = caches['shared'].get(key)
+        caches['shared'].set(key, {**data, 'password_fingerprint': 'other'})
+        _response, queries = self.user_queries(reverse('admin_dashboard'))
+        self.assertEqual(len(queries), 1)
+
+    def test_inactive_snapshot_is_rejected(self):
+        self.client.get(reverse('admin_dashboard'))
+        # Масове оновлення не скидає знімок, але is_active=False у знімку не приймається
+        User.objects.filter(pk=self.admin.pk).update(is_active=False)
+        key = f'user-snapshot:{self.admin.pk}'
+        caches['shared'].set(key, {**caches['shared'].get(key), 'is_active': False})
+        response = self.client.get(reverse('admin_dashboard'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('admin_login'), response.url)
+
+    @override_settings(USER_SNAPSHOT_TTL=120)
+    def test_snapshot_ttl(self):
+        with mock.patch.object(caches['shared'], 'set', wraps=caches['shared'].set) as cache_set:
+            self.client.get(reverse('admin_dashboard'))
+        cache_set.assert_any_call(f'user-snapshot:{self.admin.pk}', mock.ANY, timeout=120)
+
+    def test_logout_invalidates_snapshot(self):
+        self.client.get(reverse('admin_dashboard'))
+        self.assertIsNotNone(caches['shared'].get(f'user-snapshot:{self.admin.pk}'))
+        self.client.get(reverse('admin_logout'))
+        self.assertIsNone(caches['shared'].get(f'user-snapshot:{self.admin.pk}'))
+
+    def test_staff_required(self):
+        self.client.force_login(User.objects.create_user('client', password='secret'))
+        for name in ('admin_dashboard', 'admin_profile', 'admin_clients', 'admin_services', 'admin_invoices',
+                     'admin_search'):
+            self.assertRedirects(self.client.get(reverse(name)), reverse('admin_login'),
+                                 fetch_redirect_response=False)
+        self.assertEqual(self.client.get(reverse('admin_search_suggest')).status_code, 403)
+
+
+class StaticFilesTests(TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        source, self.root = Path(temp_dir.name) / 'source', Path(temp_dir.name) / 'static'
+        (source / 'css').mkdir(parents=True)
+        (source / 'img').mkdir()
+        (source / 'img' / 'logo.svg').write_text('<svg xmlns="http://www.w3.org/2000/svg"></svg>')
+        (source / 'css' / 'app.css').write_text('.logo { background: url(../img/logo.svg); }\n' * 200)
+
+        settings_override = override_settings(
+            STATIC_ROOT=self.root, STATICFILES_DIRS=[source], STATIC_SERVE=True,
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'whmcs_project.staticfiles.CompressedManifestStaticFilesStorage'},
+            },
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+        from django.contrib.staticfiles.storage import staticfiles_storage
+        self.css = staticfiles_storage.stored_name('css/app.css')
+        self.middleware = staticfiles.StaticFilesMiddleware(lambda request: HttpResponse('view'))
+        self.factory = RequestFactory()
+
+    def get(self, name, method='get', **headers):
+        return self.middleware(getattr(self.factory, method)(f'/static/{name}', **headers))
+
+    def test_collectstatic_writes_hashed_compressed_files(self):
+        self.assertRegex(self.css, r'^css/app\.[0-9a-f]{12}\.css$')
+        content = (self.root / self.css).read_bytes()
+        self.assertIn(b'logo.', content)
+        self.assertEqual(gzip.decompress((self.root / f'{self.css}.gz').read_bytes()), content)
+        self.assertEqual((self.root / f'{self.css}.br').exists(), staticfiles.brotli is not None)
+
+    def test_serves_precompressed_variant(self):
+        response = self.get(self.css, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Cache-Control'], staticfiles.IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['Content-Type'], 'text/css; charset=utf-8')
+        self.assertEqual(response.content, (self.root / f'{self.css}.gz').read_bytes())
+
+        response = self.get(self.css, HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, (self.root / self.css).read_bytes())
+
+        # Оригінал без хешу в імені - з ревалідацією
+        response = self.get('css/app.css')
+        self.assertEqual(response['Cache-Control'], staticfiles.REVALIDATE_CACHE_CONTROL)
+
+    def test_conditional_get(self):
+        response = self.get(self.css)
+        self.assertEqual(self.get(self.css, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(self.get(self.css, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+        self.assertEqual(self.get(self.css, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304)
+        # ETag залежить від кодування
+        self.assertEqual(self.get(self.css, HTTP_ACCEPT_ENCODING='gzip',
+                                  HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_range(self):
+        content = (self.root / self.css).read_bytes()
+        response = self.get(self.css, HTTP_RANGE='bytes=0-9', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 206)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, content[:10])
+        self.assertEqual(response['Content-Range'], f'bytes 0-9/{len(content)}')
+
+        self.assertEqual(self.get(self.css, HTTP_RANGE='bytes=-5').content, content[-5:])
+        response = self.get(self.css, HTTP_RANGE=f'bytes={len(content)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(content)}')
+        self.assertEqual(self.get(self.css, HTTP_RANGE='bytes=0-1,5-6').status_code, 200)
+        self.assertEqual(self.get(self.css, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"').status_code, 200)
+
+    def test_head_and_fallthrough(self):
+        response = self.get(self.css, method='head')
+        self.assertEqual(response.content, b'')
+        self.assertEqual(int(response['Content-Length']), (self.root / self.css).stat().st_size)
+
+        self.assertEqual(self.get('css/missing.css').content, b'view')
+        self.assertEqual(self.get(self.css, method='post').content, b'view')
+
+
+class VendorAssetsTests(TestCase):
+    def test_vendored_assets_are_committed(self):
+        self.assertEqual(checks.check_vendor_assets(None), [])
+
+    def test_missing_assets_fail_the_deploy_check(self):
+        with tempfile.TemporaryDirectory() as source, override_settings(
+                STATICFILES_DIRS=[source], STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder']):
+            errors = checks.check_vendor_assets(None)
+        self.assertEqual([error.id for error in errors], ['admin_panel.E001'] * len(checks.VENDOR_ASSETS))
+        self.assertTrue(all(error.is_serious() for error in errors))
+
+    def test_manifest_storage_hashes_vendored_assets(self):
+        # Source map та шрифти, на які посилаються css/js, мають бути в репозиторії,
+        # інакше collectstatic у продакшн збірці падає
+        with tempfile.TemporaryDirectory() as root, override_settings(
+                STATIC_ROOT=root, STATICFILES_DIRS=[Path(__file__).resolve().parent / 'static'],
+                STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+                STORAGES={
+                    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'},
+                }):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            from django.contrib.staticfiles.storage import staticfiles_storage
+            names = [staticfiles_storage.stored_name(path) for path in checks.VENDOR_ASSETS]
+            fontawesome = (Path(root) / names[2]).read_text()
+        self.assertTrue(all(name != path for name, path in zip(names, checks.VENDOR_ASSETS)))
+        self.assertRegex(fontawesome, r'url\("\.\./webfonts/fa-solid-900\.[0-9a-f]{12}\.woff2"\)')
+
+
+@override_settings(CACHES=TEST_CACHES)
+class BootstrapCommandTests(TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        messages_dir = Path(temp_dir.name) / 'uk' / 'LC_MESSAGES'
+        messages_dir.mkdir(parents=True)
+        self.po = messages_dir / 'django.po'
+        self.po.write_text('msgid ""\nmsgstr "Content-Type: text/plain; charset=UTF-8\\n"\n\n'
+                           'msgid "Dashboard"\nmsgstr "Панель"\n', encoding='utf-8')
+        self.locale_dir = temp_dir.name
+
+    def bootstrap(self, *args):
+        out = io.StringIO()
+        with self.settings(LOCALE_PATHS=[self.locale_dir]):
+            call_command('bootstrap', *args, stdout=out)
+        return out.getvalue()
+
+    def test_steps_are_idempotent(self):
+        output = self.bootstrap('--create-admin')
+        self.assertRegex(output, r'migrate +актуальні \(\d+ мс\)')
+        self.assertIn('скомпільовано 1 з 1', output)
+        self.assertTrue(User.objects.filter(is_superuser=True).exists())
+        self.assertTrue(self.po.with_suffix('.mo').exists())
+
+        output = self.bootstrap('--create-admin')
+        self.assertRegex(output, r'admin +вже існує')
+        self.assertIn('актуальні (1)', output)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_recompiles_changed_catalog(self):
+        self.bootstrap()
+        mo = self.po.with_suffix('.mo')
+        stale = mo.stat().st_mtime - 10
+        os.utime(mo, (stale, stale))
+        self.assertIn('скомпільовано 1 з 1', self.bootstrap())
+
+
+class StartupTests(TestCase):
+    # Запас у кілька разів від поточних ~0.3 с: ловить регресії, а не шум (STARTUP_IMPORT_BUDGET_MS для CI)
+    IMPORT_BUDGET_MS = int(os.environ.get('STARTUP_IMPORT_BUDGET_MS', 1500))
+    # Важкі та debug-модулі, що мають завантажуватись при першому використанні
+    LAZY_MODULES = ('dev_dashboard.views', 'dev_dashboard.catalog_index', 'admin_panel.importer',
+                    'whmcs_project.i18n', 'whmcs_project.importtime')
+
+    def test_parse(self):
+        records = importtime.parse([
+            'import time: self [us] | cumulative | imported package',
+            'import time:       120 |        120 |     whmcs_project.cache',
+            'import time:       300 |        420 |   whmcs_project.users',
+            'import time:        80 |        500 | whmcs_project',
+            'Traceback (most recent call last):',
+        ])
+        self.assertEqual([(record.module, record.depth) for record in records],
+                         [('whmcs_project.cache', 2), ('whmcs_project.users', 1), ('whmcs_project', 0)])
+        report = importtime.ImportReport('setup', records, wall_seconds=0.1)
+        self.assertEqual(report.total_us, 500)
+        self.assertEqual(report.slowest(1, cumulative=False)[0].module, 'whmcs_project.users')
+        self.assertEqual(report.by_group(['whmcs_project.users']), {'whmcs_project.users': 300, 'whmcs_project': 200})
+
+    def test_worker_startup(self):
+        # DEBUG: dev_dashboard встановлений, але його views не завантажуються до першого запиту
+        report = importtime.measure('worker', env={'DEBUG': 'True'})
+        self.assertIn('dev_dashboard.urls', report.loaded)
+        for module in self.LAZY_MODULES:
+            self.assertNotIn(module, report.loaded)
+        self.assertLess(report.total_us / 1000, self.IMPORT_BUDGET_MS)
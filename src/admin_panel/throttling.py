@@ -0,0 +1,178 @@
+"""
+Захист форми входу від перебору паролів.
+
+Невдалі спроби рахуються ковзними вікнами (два сусідні фіксовані вікна
+з ваговим коефіцієнтом) окремо для логіна, IP адреси та підмережі
+(/24 для IPv4, /64 для IPv6) у спільному кеші, тому ліміти діють для
+всіх воркерів. Після перевищення ліміту ключ блокується на
+LOGIN_THROTTLE_LOCKOUT_BASE секунд, кожне наступне блокування вдвічі
+довше (до LOGIN_THROTTLE_LOCKOUT_MAX).
+
+``check()`` викликається до ``authenticate()``, тому заблоковані
+запити не витрачають CPU на хешування пароля.
+"""
+
+import hashlib
+import ipaddress
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from whmcs_project.cache import SHARED
+
+logger = logging.getLogger(__name__)
+
+SCOPES = ('username', 'ip', 'subnet')
+
+# Рівень блокування пам'ятається добу, щоб повторні атаки блокувались довше
+LEVEL_TIMEOUT = 24 * 3600
+
+
+@dataclass
+class Decision:
+    blocked: bool
+    scope: Optional[str] = None
+    retry_after: int = 0
+
+
+def _cache():
+    return caches[SHARED]
+
+
+def _limits() -> Dict[str, int]:
+    return {
+        'username': settings.LOGIN_THROTTLE_USERNAME_LIMIT,
+        'ip': settings.LOGIN_THROTTLE_IP_LIMIT,
+        'subnet': settings.LOGIN_THROTTLE_SUBNET_LIMIT,
+    }
+
+
+def client_ip(request) -> str:
+    """IP клієнта з урахуванням LOGIN_THROTTLE_PROXY_COUNT довірених проксі"""
+    proxies = settings.LOGIN_THROTTLE_PROXY_COUNT
+    if proxies:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def subnet(ip: str) -> str:
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return ip
+    prefix = 24 if address.version == 4 else 64
+    return str(ipaddress.ip_network(f'{address}/{prefix}', strict=False))
+
+
+def identifiers(request, username: str) -> List[Tuple[str, str]]:
+    """Пари (scope, ідентифікатор) для запиту"""
+    ip = client_ip(request)
+    result = [('ip', ip), ('subnet', subnet(ip))]
+    username = (username or '').strip().lower()
+    if username:
+        result.insert(0, ('username', username))
+    return result
+
+
+def _key(scope: str, identifier: str, suffix) -> str:
+    digest = hashlib.md5(identifier.encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'throttle:{scope}:{digest}:{suffix}'
+
+
+def _window_keys(scope: str, identifier: str, now: float) -> Tuple[str, str, float]:
+    window = settings.LOGIN_THROTTLE_WINDOW
+    current = int(now // window)
+    elapsed = (now % window) / window
+    return _key(scope, identifier, current - 1), _key(scope, identifier, current), elapsed
+
+
+def _record_metric(name: str) -> None:
+    cache = _cache()
+    key = f'throttle:stats:{name}'
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def check(request, username: str) -> Decision:
+    """Чи заблоковано спробу входу (одне звернення до кешу)"""
+    if not settings.LOGIN_THROTTLE_ENABLED:
+        return Decision(blocked=False)
+
+    pairs = identifiers(request, username)
+    keys = {_key(scope, identifier, 'lock'): scope for scope, identifier in pairs}
+    locks = _cache().get_many(list(keys))
+    if not locks:
+        return Decision(blocked=False)
+
+    now = time.time()
+    key, until = max(locks.items(), key=lambda item: item[1])
+    retry_after = max(1, math.ceil(until - now))
+    scope = keys[key]
+    _record_metric(f'blocked:{scope}')
+    logger.warning('Login attempt blocked by %s throttle for %s s', scope, retry_after)
+    return Decision(blocked=True, scope=scope, retry_after=retry_after)
+
+
+def register_failure(request, username: str) -> Decision:
+    """Враховує невдалу спробу; блокує ключі, що перевищили ліміт"""
+    if not settings.LOGIN_THROTTLE_ENABLED:
+        return Decision(blocked=False)
+
+    cache = _cache()
+    now = time.time()
+    limits = _limits()
+    window = settings.LOGIN_THROTTLE_WINDOW
+    _record_metric('failures')
+
+    decision = Decision(blocked=False)
+    for scope, identifier in identifiers(request, username):
+        previous_key, current_key, elapsed = _window_keys(scope, identifier, now)
+        cache.add(current_key, 0, timeout=window * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            cache.set(current_key, 1, timeout=window * 2)
+            current = 1
+        previous = cache.get(previous_key, 0)
+
+        if previous * (1 - elapsed) + current < limits[scope]:
+            continue
+
+        level_key = _key(scope, identifier, 'level')
+        level = cache.get(level_key, 0) + 1
+        cache.set(level_key, level, timeout=LEVEL_TIMEOUT)
+        duration = min(settings.LOGIN_THROTTLE_LOCKOUT_BASE * 2 ** (level - 1),
+                       settings.LOGIN_THROTTLE_LOCKOUT_MAX)
+        cache.set(_key(scope, identifier, 'lock'), now + duration, timeout=duration)
+        _record_metric(f'lockouts:{scope}')
+        logger.warning('Login throttle: %s locked for %s s (level %s)', scope, duration, level)
+        if duration > decision.retry_after:
+            decision = Decision(blocked=True, scope=scope, retry_after=duration)
+    return decision
+
+
+def register_success(request, username: str) -> None:
+    """Після успішного входу скидає лічильники логіна (IP лічильники лишаються)"""
+    if not settings.LOGIN_THROTTLE_ENABLED:
+        return
+
+    identifier = (username or '').strip().lower()
+    previous_key, current_key, _ = _window_keys('username', identifier, time.time())
+    _cache().delete_many([previous_key, current_key, _key('username', identifier, 'level')])
+
+
+def stats() -> Dict[str, int]:
+    """Лічильники: невдалі спроби, блокування та відхилені запити за scope"""
+    names = ['failures'] + [f'{kind}:{scope}' for kind in ('lockouts', 'blocked') for scope in SCOPES]
+    values = _cache().get_many([f'throttle:stats:{name}' for name in names])
+    return {name: values.get(f'throttle:stats:{name}', 0) for name in names}
@@ -6,5 +6,10 @@ urlpatterns = [
     path('login/', views.admin_login, name='admin_login'),
     path('dashboard/', views.admin_dashboard, name='admin_dashboard'),
     path('profile/', views.admin_profile, name='admin_profile'),
+    path('clients/', views.admin_clients, name='admin_clients'),
+    path('services/', views.admin_services, name='admin_services'),
+    path('invoices/', views.admin_invoices, name='admin_invoices'),
+    path('search/', views.admin_search, name='admin_search'),
+    path('search/suggest/', views.admin_search_suggest, name='admin_search_suggest'),
     path('logout/', views.admin_logout, name='admin_logout'),
 ]
\ No newline at end of file
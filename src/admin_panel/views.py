@@ -1,69 +1,212 @@
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
-from django.contrib.auth import authenticate, login, logout
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth import aauthenticate, alogin, alogout
 from django.contrib import messages
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.http import JsonResponse
+from django.utils.http import urlencode
 
+from whmcs_project.cache import SHARED, cached_fragment
+from whmcs_project.rowcounts import row_count
 
-def admin_login(request):
+from . import search, summary, throttling
+from .decorators import staff_required
+from .models import Client, Invoice, Service
+from .pagination import KeysetPaginator
+from .summary import DASHBOARD_CACHE_NAMESPACE, dashboard_summary
+
+# Рендеринг шаблонів синхронний (context processors можуть звертатись до БД)
+arender = sync_to_async(render)
+
+
+@cached_fragment(DASHBOARD_CACHE_NAMESPACE, timeout=60, alias=SHARED)
+def dashboard_stats():
+    """Статистика для карток дашборду, спільна для всіх воркерів
+
+    Інвалідація: зміни User (apps.AdminPanelConfig) та лічильників зведень.
+    """
+    return {
+        'total_users': row_count(User),
+        **dashboard_summary(),
+    }
+
+
+def list_page(request, queryset, ordering, statuses, metric):
+    """Контекст сторінки списку: keyset пагінація та фільтри status/client
+
+    Кількості беруться з лічильників зведень та оцінок rowcounts - COUNT(*)
+    по великих таблицях на кожну сторінку не виконується.
+    """
+    filters = {}
+    status = request.GET.get('status', '')
+    if status in statuses.values:
+        queryset = queryset.filter(status=status)
+        filters['status'] = status
+    client_id = request.GET.get('client', '')
+    if client_id.isdigit():
+        queryset = queryset.filter(client_id=int(client_id))
+        filters['client'] = client_id
+
+    counts = summary.status_counts(metric)
+    if 'client' in filters:
+        total = None
+    elif 'status' in filters:
+        total = counts.get(status, 0)
+    else:
+        total = row_count(queryset.model)
+
+    return {
+        'page': KeysetPaginator(queryset, ordering).page(request.GET.get('cursor')),
+        'filters': filters,
+        'filter_query': urlencode(filters),
+        'status': filters.get('status', ''),
+        'statuses': [(value, label, counts.get(value, 0)) for value, label in statuses.choices],
+        'client_filter': Client.objects.filter(pk=client_id).first() if 'client' in filters else None,
+        'total': total,
+    }
+
+
+async def admin_login(request):
     """Форма авторизації адміністратора"""
-    if request.user.is_authenticated:
+    user = await request.auser()
+    if user.is_authenticated:
         return redirect('admin_dashboard')
     
     if request.method == 'POST':
         username = request.POST.get('username')
         password = request.POST.get('password')
         
-        user = authenticate(request, username=username, password=password)
+        # Перевірка до authenticate(): заблоковані спроби не хешують пароль
+        decision = await sync_to_async(throttling.check)(request, username)
+        if decision.blocked:
+            return await throttled_response(request, decision)
+        
+        user = await aauthenticate(request, username=username, password=password)
         if user is not None and user.is_staff:
-            login(request, user)
+            await sync_to_async(throttling.register_success)(request, username)
+            await alogin(request, user)
             return redirect('admin_dashboard')
         else:
+            decision = await sync_to_async(throttling.register_failure)(request, username)
+            if decision.blocked:
+                return await throttled_response(request, decision)
             messages.error(request, 'Невірний логін або пароль, або у вас немає прав адміністратора')
     
-    return render(request, 'admin_panel/login.html', {
+    return await arender(request, 'admin_panel/login.html', {
         'debug': settings.DEBUG
     })
 
 
-@login_required
-def admin_dashboard(request):
+async def throttled_response(request, decision):
+    """Сторінка входу з 429 та Retry-After для заблокованої спроби"""
+    minutes = max(1, (decision.retry_after + 59) // 60)
+    messages.error(request, f'Забагато невдалих спроб входу. Спробуйте через {minutes} хв.')
+    response = await arender(request, 'admin_panel/login.html', {
+        'debug': settings.DEBUG
+    }, status=429)
+    response['Retry-After'] = str(decision.retry_after)
+    return response
+
+
+@staff_required
+async def admin_dashboard(request):
     """Головна сторінка приватного кабінету"""
-    if not request.user.is_staff:
-        messages.error(request, 'У вас немає прав доступу до адміністративної панелі')
-        return redirect('admin_login')
-    
-    return render(request, 'admin_panel/dashboard.html', {
-        'user': request.user,
+    user = await request.auser()
+    return await arender(request, 'admin_panel/dashboard.html', {
+        'user': user,
+        'stats': await sync_to_async(dashboard_stats)(),
         'debug': settings.DEBUG
     })
 
 
-@login_required
-def admin_profile(request):
+@staff_required
+async def admin_profile(request):
     """Налаштування профілю адміністратора"""
-    if not request.user.is_staff:
-        messages.error(request, 'У вас немає прав доступу до адміністративної панелі')
-        return redirect('admin_login')
-    
+    user = await request.auser()
     if request.method == 'POST':
-        user = request.user
-        user.first_name = request.POST.get('first_name', '')
-        user.last_name = request.POST.get('last_name', '')
-        user.email = request.POST.get('email', '')
-        user.save()
+        # request.user - знімок з кешу; зберігається повна модель (знімок інвалідується сигналом)
+        account = await User.objects.aget(pk=user.pk)
+        account.first_name = request.POST.get('first_name', '')
+        account.last_name = request.POST.get('last_name', '')
+        account.email = request.POST.get('email', '')
+        await account.asave()
         messages.success(request, 'Профіль успішно оновлено')
         return redirect('admin_profile')
     
-    return render(request, 'admin_panel/profile.html', {
-        'user': request.user,
+    return await arender(request, 'admin_panel/profile.html', {
+        'user': user,
         'debug': settings.DEBUG
     })
 
 
-def admin_logout(request):
+async def admin_logout(request):
     """Вихід з системи"""
-    logout(request)
+    await alogout(request)
     messages.success(request, 'Ви успішно вийшли з системи')
-    return redirect('admin_login')
\ No newline at end of file
+    return redirect('admin_login')
+
+
+@staff_required
+async def admin_clients(request):
+    """Список клієнтів"""
+    user = await request.auser()
+    queryset = Client.objects.values('id', 'first_name', 'last_name', 'company_name', 'email', 'status',
+                                     'created_at')
+    context = await sync_to_async(list_page)(request, queryset, ('-id',), Client.Status, summary.CLIENTS)
+    return await arender(request, 'admin_panel/clients.html', {
+        **context,
+        'user': user,
+        'debug': settings.DEBUG
+    })
+
+
+@staff_required
+async def admin_services(request):
+    """Список послуг"""
+    user = await request.auser()
+    queryset = Service.objects.values('id', 'client_id', 'client__first_name', 'client__last_name', 'product',
+                                      'domain', 'status', 'billing_cycle', 'amount', 'next_due_date')
+    context = await sync_to_async(list_page)(request, queryset, ('-id',), Service.Status, summary.SERVICES)
+    return await arender(request, 'admin_panel/services.html', {
+        **context,
+        'user': user,
+        'debug': settings.DEBUG
+    })
+
+
+@staff_required
+async def admin_invoices(request):
+    """Список рахунків"""
+    user = await request.auser()
+    # Лише колонки індексів invoice_date_id_idx / invoice_status_date_idx
+    queryset = Invoice.objects.values('id', 'number', 'client_id', 'client__first_name', 'client__last_name',
+                                      'date', 'due_date', 'total', 'status')
+    context = await sync_to_async(list_page)(request, queryset, ('-date', '-id'), Invoice.Status,
+                                             summary.INVOICES)
+    return await arender(request, 'admin_panel/invoices.html', {
+        **context,
+        'user': user,
+        'debug': settings.DEBUG
+    })
+
+
+@staff_required
+async def admin_search(request):
+    """Результати пошуку з навбару"""
+    user = await request.auser()
+    query = request.GET.get('q', '').strip()
+    documents = await sync_to_async(search.search)(query, limit=50)
+    return await arender(request, 'admin_panel/search.html', {
+        'query': query,
+        'results': [search.as_json(document) for document in documents],
+        'user': user,
+        'debug': settings.DEBUG
+    })
+
+
+@staff_required(json_response=True)
+async def admin_search_suggest(request):
+    """JSON для підказок у полі пошуку (type-ahead)"""
+    documents = await sync_to_async(search.search)(request.GET.get('q', ''))
+    return JsonResponse({'results': [search.as_json(document) for document in documents]})
\ No newline at end of file
@@ -1,5 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+# Простір імен кешу сторінок dev dashboard (інвалідація: cache.invalidate).
+# Тут, а не у views, щоб ready() не імпортував views під час старту
+CACHE_NAMESPACE = 'dev_dashboard'
+
+
+def _invalidate_cache(sender, **kwargs):
+    from whmcs_project.cache import LOCAL, invalidate
+    invalidate(CACHE_NAMESPACE, aliases=[LOCAL])
 
 
 class DevDashboardConfig(AppConfig):
     name = 'dev_dashboard'
+
+    def ready(self):
+        from django.contrib.auth.models import User
+        from whmcs_project.cache import LOCAL, invalidate_on
+
+        invalidate_on(User, namespaces=[CACHE_NAMESPACE], aliases=[LOCAL], ignore_fields=['last_login'])
+        post_migrate.connect(_invalidate_cache, dispatch_uid='dev_dashboard.invalidate_cache')
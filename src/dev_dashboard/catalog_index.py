@@ -0,0 +1,112 @@
+"""
+Індекс каталогів перекладів для dev dashboard.
+
+Кожен django.po розбирається один раз; результат кешується за ключем
+(path, mtime, size), тому повторні запити сторінки чи JSON API коштують
+по одному stat() на файл, поки каталог не зміниться на диску.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from whmcs_project.i18n.po import POCatalog, POParseError
+
+
+def _stat(path: Path) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except FileNotFoundError:
+        return None
+
+
+class CatalogIndex:
+    """Кеш зведеної статистики .po файлів"""
+
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[Tuple[int, int], dict]] = {}
+        self._lock = threading.Lock()
+
+    def summary(self, po_file: Path, stat: os.stat_result) -> dict:
+        """Зведення каталогу; перерахунок тільки якщо змінились mtime або розмір"""
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._entries.get(po_file)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        summary = self._build_summary(po_file)
+        with self._lock:
+            self._entries[po_file] = (signature, summary)
+        return summary
+
+    @staticmethod
+    def _build_summary(po_file: Path) -> dict:
+        try:
+            catalog = POCatalog.from_file(po_file)
+        except (OSError, UnicodeDecodeError, POParseError) as e:
+            return {
+                'total_strings': 0,
+                'translated_strings': 0,
+                'empty_strings': 0,
+                'fuzzy_strings': 0,
+                'plural_strings': 0,
+                'obsolete_strings': 0,
+                'percentage': 0,
+                'untranslated': [],
+                'error': str(e),
+            }
+
+        stats = catalog.stats()
+        total = stats['total']
+        return {
+            'total_strings': total,
+            'translated_strings': stats['translated'],
+            'empty_strings': stats['empty'],
+            'fuzzy_strings': stats['fuzzy'],
+            'plural_strings': stats['plural'],
+            'obsolete_strings': stats['obsolete'],
+            'percentage': (stats['translated'] * 100 // total) if total > 0 else 0,
+            'untranslated': [
+                {
+                    'msgid': entry.msgid,
+                    'msgid_plural': entry.msgid_plural,
+                    'msgctxt': entry.msgctxt,
+                    'fuzzy': entry.fuzzy,
+                    'references': entry.references,
+                }
+                for entry in catalog
+                if entry.fuzzy or not entry.translated
+            ],
+            'error': None,
+        }
+
+    def language_info(self, locale_dir: Path, code: str, name: str) -> dict:
+        """Інформація про мову: файли, їх розміри та статистика перекладів"""
+        messages_dir = Path(locale_dir) / code / 'LC_MESSAGES'
+        po_file = messages_dir / 'django.po'
+        po_stat = _stat(po_file)
+        mo_stat = _stat(messages_dir / 'django.mo')
+
+        info = {
+            'code': code,
+            'name': name,
+            'po_exists': po_stat is not None,
+            'mo_exists': mo_stat is not None,
+            'po_size': po_stat.st_size if po_stat else 0,
+            'mo_size': mo_stat.st_size if mo_stat else 0,
+            'mo_outdated': bool(po_stat and mo_stat and po_stat.st_mtime > mo_stat.st_mtime),
+        }
+        if po_stat is not None:
+            info.update(self.summary(po_file, po_stat))
+        return info
+
+    def languages(self, locale_dir: Path, languages: List[Tuple[str, str]]) -> List[dict]:
+        return [self.language_info(locale_dir, code, name) for code, name in languages]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+catalog_index = CatalogIndex()
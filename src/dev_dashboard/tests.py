@@ -1,3 +1,416 @@
-from django.test import TestCase
+import os
+import runpy
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.template import Context, Template, engines
+from django.template.response import TemplateResponse
+from django.db.utils import ConnectionHandler
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import include, path, reverse
+
+from whmcs_project.cache import cached_fragment, cached_view, invalidate
+from whmcs_project import profiling
+from whmcs_project import querylog, rowcounts
+from whmcs_project.db import pool_stats, table_stats
+from whmcs_project.sampler import StackSampler, sampler
+
+from .catalog_index import CatalogIndex
+from .views import database_user_count
+
+# whmcs_project.urls підключає dev dashboard тільки при DEBUG на момент
+# імпорту, а тест-раннер вимикає DEBUG, тому тести мають власний URLconf
+urlpatterns = [
+    path('dev/', include('dev_dashboard.urls')),
+]
+
+# Сторінки для CacheTests: з CSRF токеном, з читанням сесії та без них
+cached_view_calls = []
+
+
+@cached_view(timeout=60, namespace='tests.views')
+def cached_form_view(request):
+    cached_view_calls.append('form')
+    form = engines['django'].from_string('<form method="post">{% csrf_token %}</form>')
+    return TemplateResponse(request, form)
+
+
+@cached_view(timeout=60, namespace='tests.views')
+def cached_session_view(request):
+    cached_view_calls.append('session')
+    return HttpResponse(request.session.get('greeting', 'hello'))
+
+
+@cached_view(timeout=60, namespace='tests.views')
+def cached_plain_view(request):
+    cached_view_calls.append('plain')
+    return HttpResponse('plain')
+
+
+urlpatterns += [
+    path('cached/form/', cached_form_view),
+    path('cached/session/', cached_session_view),
+    path('cached/plain/', cached_plain_view),
+]
+
+
+PO_CONTENT = '''msgid ""
+msgstr ""
+"Language: uk\\n"
+
+#: admin_panel/templates/admin_panel/base.html:20
+msgid "Dashboard"
+msgstr "Панель управління"
+
+#: admin_panel/templates/admin_panel/base.html:23
+msgid ""
+"Long message "
+"on two lines"
+msgstr ""
+
+#, fuzzy
+msgid "Profile"
+msgstr "Профіль"
+
+msgid "%(count)s client"
+msgid_plural "%(count)s clients"
+msgstr[0] "%(count)s клієнт"
+msgstr[1] "%(count)s клієнти"
+'''
+
+
+class CatalogIndexTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.locale_dir = Path(self.tmp.name)
+        self.po_file = self.locale_dir / 'uk' / 'LC_MESSAGES' / 'django.po'
+        self.po_file.parent.mkdir(parents=True)
+        self.po_file.write_text(PO_CONTENT, encoding='utf-8')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_language_info(self):
+        info = CatalogIndex().language_info(self.locale_dir, 'uk', 'Українська')
+
+        self.assertTrue(info['po_exists'])
+        self.assertFalse(info['mo_exists'])
+        self.assertEqual(info['total_strings'], 4)
+        self.assertEqual(info['translated_strings'], 2)
+        self.assertEqual(info['fuzzy_strings'], 1)
+        self.assertEqual(info['plural_strings'], 1)
+        self.assertEqual(
+            [entry['msgid'] for entry in info['untranslated']],
+            ['Long message on two lines', 'Profile'],
+        )
+
+    def test_summary_is_cached_until_file_changes(self):
+        index = CatalogIndex()
+        first = index.language_info(self.locale_dir, 'uk', 'Українська')
+        second = index.language_info(self.locale_dir, 'uk', 'Українська')
+        self.assertIs(first['untranslated'], second['untranslated'])
+
+        self.po_file.write_text(PO_CONTENT.replace('msgstr ""\n\n#, fuzzy', 'msgstr "Довге"\n\n#, fuzzy'),
+                                encoding='utf-8')
+        stat = self.po_file.stat()
+        os.utime(self.po_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        third = index.language_info(self.locale_dir, 'uk', 'Українська')
+        self.assertEqual(third['translated_strings'], 3)
+
+    def test_missing_catalog(self):
+        info = CatalogIndex().language_info(self.locale_dir, 'de', 'Deutsch')
+        self.assertFalse(info['po_exists'])
+        self.assertNotIn('total_strings', info)
+
+
+@override_settings(DEBUG=True, ROOT_URLCONF='dev_dashboard.tests')
+class TranslationsApiTests(TestCase):
+    def test_returns_all_languages(self):
+        response = self.client.get(reverse('dev_dashboard:translations_api'))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([lang['code'] for lang in data['languages']], ['en', 'uk'])
+        self.assertIn('untranslated', data['languages'][0])
+
+    def test_untranslated_list_can_be_skipped(self):
+        response = self.client.get(reverse('dev_dashboard:translations_api'), {'untranslated': '0'})
+        self.assertNotIn('untranslated', response.json()['languages'][0])
+
+    @override_settings(DEBUG=False)
+    def test_forbidden_without_debug(self):
+        response = self.client.get(reverse('dev_dashboard:translations_api'))
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-local'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-shared'},
+})
+class CacheTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        caches['shared'].clear()
+        cached_view_calls.clear()
+
+    @override_settings(ROOT_URLCONF='dev_dashboard.tests')
+    def test_view_with_csrf_token_is_not_cached(self):
+        # Cookie csrftoken ставить CsrfViewMiddleware вже після view
+        tokens = []
+        for client in (self.client_class(), self.client_class()):
+            response = client.get('/cached/form/')
+            self.assertIn('csrftoken', response.cookies)
+            tokens.append(response.context['csrf_token'])
+        self.assertEqual(cached_view_calls, ['form', 'form'])
+        self.assertNotEqual(tokens[0], tokens[1])
+
+    @override_settings(ROOT_URLCONF='dev_dashboard.tests')
+    def test_view_reading_session_is_not_cached(self):
+        self.client.get('/cached/session/')
+        self.client.get('/cached/session/')
+        self.assertEqual(cached_view_calls, ['session', 'session'])
+
+    @override_settings(ROOT_URLCONF='dev_dashboard.tests')
+    def test_view_without_session_or_csrf_is_cached(self):
+        for _ in range(2):
+            response = self.client.get('/cached/plain/')
+            self.assertEqual(response.content, b'plain')
+            # Сесію читав request.user, тож відповідь і далі залежить від cookie
+            self.assertIn('Cookie', response['Vary'])
+        self.assertEqual(cached_view_calls, ['plain'])
+
+    def test_fragment_is_cached_until_invalidated(self):
+        calls = []
+
+        @cached_fragment('tests.fragment')
+        def fragment(value):
+            calls.append(value)
+            return value * 2
+
+        self.assertEqual(fragment(2), 4)
+        self.assertEqual(fragment(2), 4)
+        self.assertEqual(calls, [2])
+
+        invalidate('tests.fragment')
+        fragment(2)
+        self.assertEqual(calls, [2, 2])
+
+    def test_user_changes_invalidate_database_page(self):
+        self.assertEqual(database_user_count().value, 0)
+        user = User.objects.create_user('operator')
+        self.assertEqual(database_user_count().value, 1)
+
+        # Вхід зберігає тільки last_login і не скидає кеш
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+            database_user_count()
+
+
+class PoolStatsTests(TestCase):
+    def test_without_pool(self):
+        stats = pool_stats()
+        self.assertIn(stats['mode'], ('off', 'persistent'))
+        self.assertIsNone(stats['checkouts'])
+        self.assertGreaterEqual(stats['connections_created'], 0)
+
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    ConnectionPool = None
+
+
+@skipUnless(ConnectionPool, 'psycopg_pool is not installed')
+class PoolSettingsTests(SimpleTestCase):
+    ALIAS = 'pool_settings_test'
+
+    def load_database(self, **env):
+        env = {'DB_ENGINE': 'postgresql', 'DB_POOL_MODE': 'pool', **env}
+        with mock.patch.dict(os.environ, env):
+            namespace = runpy.run_path(str(Path(settings.BASE_DIR) / 'whmcs_project' / 'settings.py'))
+        return namespace['DATABASES']['default']
+
+    def test_pool_checks_connections_on_checkout(self):
+        database = self.load_database(DB_CONN_HEALTH_CHECKS='False')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('check', database['OPTIONS']['pool'])
+
+        # Пул не відкривається при створенні, тож БД не потрібна
+        wrapper = ConnectionHandler({'default': database, self.ALIAS: database})[self.ALIAS]
+        self.addCleanup(type(wrapper)._connection_pools.pop, self.ALIAS, None)
+        self.assertIs(wrapper.pool._check, ConnectionPool.check_connection)
+
+
+class RowCountTests(TestCase):
+    def setUp(self):
+        caches['shared'].clear()
+
+    def test_exact_count_is_cached_until_rows_change(self):
+        count = rowcounts.row_count(User)
+        self.assertTrue(count.exact)
+        self.assertEqual(count.value, 0)
+        with self.assertNumQueries(0 if connection.vendor != 'postgresql' else 1):
+            rowcounts.row_count(User)
+
+        user = User.objects.create_user('operator')
+        self.assertEqual(rowcounts.row_count(User).value, 1)
+        user.delete()
+        self.assertEqual(rowcounts.row_count(User).value, 0)
+
+    @override_settings(ROWCOUNT_REFRESH_AFTER=0)
+    def test_stale_count_is_served_while_refreshing(self):
+        caches['shared'].set(rowcounts._cache_key('default', User._meta.db_table), (42, 0))
+        with mock.patch.object(rowcounts, '_schedule_refresh') as schedule:
+            self.assertEqual(str(rowcounts.row_count(User)), '42')
+        schedule.assert_called_once()
+
+    def test_estimate_above_threshold(self):
+        self.assertEqual(str(rowcounts.RowCount(value=150000, exact=False)), '~150000')
+
+
+class TemplatesTests(TestCase):
+    def test_all_templates_compile(self):
+        call_command('check_templates', stdout=StringIO())
+
+    @override_settings(DEBUG=True, ROOT_URLCONF='dev_dashboard.tests')
+    def test_settings_page_renders(self):
+        response = self.client.get(reverse('dev_dashboard:settings'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'LANGUAGE_CODE')
+
+
+# PROFILING_ENABLED залежить від DEBUG на момент імпорту settings
+PROFILED_MIDDLEWARE = ['whmcs_project.profiling.ProfilingMiddleware'] + [
+    name for name in settings.MIDDLEWARE if name != 'whmcs_project.profiling.ProfilingMiddleware'
+]
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        profiling.buffer.clear()
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(profiling.percentile(values, 50), 50)
+        self.assertEqual(profiling.percentile(values, 95), 95)
+        self.assertEqual(profiling.percentile(values, 99), 99)
+        self.assertEqual(profiling.percentile([7.0], 99), 7.0)
+
+    def test_middleware_records_queries_and_templates(self):
+        def view(request):
+            User.objects.count()
+            User.objects.exists()
+            return HttpResponse(Template('{{ value }}').render(Context({'value': 'ok'})))
+
+        middleware = profiling.ProfilingMiddleware(view)
+        middleware(RequestFactory().get('/profiled/'))
+
+        record, = profiling.buffer.records()
+        self.assertEqual(record.queries, 2)
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.template_ms, 0)
+        self.assertGreaterEqual(record.wall_ms, record.sql_ms)
+
+    @override_settings(DEBUG=True, ROOT_URLCONF='dev_dashboard.tests', MIDDLEWARE=PROFILED_MIDDLEWARE)
+    def test_page_lists_url_names(self):
+        self.client.get(reverse('dev_dashboard:translations_api'))
+        response = self.client.get(reverse('dev_dashboard:profiling'))
+
+        self.assertEqual(response.status_code, 200)
+        rows = {row['view_name']: row for row in response.context['rows']}
+        self.assertIn('dev_dashboard:profiling', rows)
+        self.assertEqual(rows['dev_dashboard:translations_api']['summary'].count, 1)
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class StackSamplerTests(TestCase):
+    def test_claim_counts_down_and_filters(self):
+        stack_sampler = StackSampler()
+        stack_sampler.arm(2, url_name='admin_login')
+
+        self.assertFalse(stack_sampler.claim('admin_dashboard'))
+        self.assertFalse(stack_sampler.claim('dev_dashboard:profiling'))
+        self.assertTrue(stack_sampler.claim('admin_login'))
+        self.assertTrue(stack_sampler.claim('admin_login'))
+        self.assertFalse(stack_sampler.armed)
+
+    def test_collects_request_thread_stacks(self):
+        stack_sampler = StackSampler()
+        stack_sampler.arm(1, interval=0.001)
+        token = stack_sampler.begin()
+        busy_loop(0.1)
+        stack_sampler.end(token)
+
+        self.assertGreater(stack_sampler.samples, 0)
+        top = stack_sampler.functions('self')[0]
+        self.assertTrue(top.label.startswith('busy_loop '))
+        self.assertIn('busy_loop (dev_dashboard/tests.py:', stack_sampler.collapsed())
+
+    @override_settings(DEBUG=True, ROOT_URLCONF='dev_dashboard.tests', MIDDLEWARE=PROFILED_MIDDLEWARE)
+    def test_dashboard_arms_sampler(self):
+        sampler.clear()
+        self.client.post(reverse('dev_dashboard:sampler'), {
+            'action': 'start', 'requests': '1', 'url_name': 'dev_dashboard:translations_api',
+        })
+        # Власні сторінки dev dashboard та невідомі URL не витрачають сесію
+        self.client.get(reverse('dev_dashboard:translations_api'))
+        self.client.get('/missing/')
+        self.assertTrue(sampler.armed)
+        self.assertEqual(sampler.requests, 0)
+
+        self.client.post(reverse('dev_dashboard:sampler'), {'action': 'stop'})
+        self.assertFalse(sampler.armed)
+
+        response = self.client.get(reverse('dev_dashboard:sampler'), {'sort': 'total'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(reverse('dev_dashboard:sampler_collapsed'))
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+
+
+class QueryLogTests(TestCase):
+    def setUp(self):
+        querylog.query_log.clear()
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            querylog.fingerprint("SELECT * FROM \"t1\" WHERE id IN (%s, %s, %s) AND name = 'x''y'  LIMIT 21"),
+            'SELECT * FROM "t1" WHERE id IN (...) AND name = ? LIMIT ?',
+        )
+
+    @override_settings(QUERYLOG_EXPLAIN_THRESHOLD_MS=0)
+    def test_records_calls_and_explains_slow_selects(self):
+        querylog.install()  # ідемпотентно, навіть якщо QUERYLOG_ENABLED вимкнено
+        User.objects.filter(pk=1).exists()
+        User.objects.filter(pk=2).exists()
+
+        stats, = querylog.query_log.queries()
+        self.assertEqual(stats.calls, 2)
+        self.assertGreaterEqual(stats.total_ms, stats.max_ms)
+        self.assertTrue(stats.explain)
+        self.assertNotIn('EXPLAIN failed', stats.explain)
+
+    def test_table_stats(self):
+        names = [table['name'] for table in table_stats()]
+        self.assertIn('auth_user', names)
+
+    @override_settings(DEBUG=True, ROOT_URLCONF='dev_dashboard.tests')
+    def test_database_page(self):
+        response = self.client.get(reverse('dev_dashboard:database'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'auth_user')
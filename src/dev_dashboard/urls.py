@@ -1,14 +1,23 @@
 from django.urls import path
-from . import views
+
+from whmcs_project.lazy import lazy_view
+
+# Модуль views (з профілюванням, каталогами перекладів тощо) імпортується
+# при першому запиті до /dev/, а не при завантаженні URLconf
 
 app_name = 'dev_dashboard'
 
 urlpatterns = [
-    path('', views.dev_dashboard, name='dashboard'),
-    path('urls/', views.url_patterns_view, name='urls'),
-    path('apps/', views.apps_info_view, name='apps'),
-    path('settings/', views.settings_view, name='settings'),
-    path('database/', views.database_info_view, name='database'),
-    path('translations/', views.translations_info_view, name='translations'),
-    path('system/', views.system_info_view, name='system'),
+    path('', lazy_view('dev_dashboard.views.dev_dashboard'), name='dashboard'),
+    path('urls/', lazy_view('dev_dashboard.views.url_patterns_view'), name='urls'),
+    path('apps/', lazy_view('dev_dashboard.views.apps_info_view'), name='apps'),
+    path('settings/', lazy_view('dev_dashboard.views.settings_view'), name='settings'),
+    path('database/', lazy_view('dev_dashboard.views.database_info_view'), name='database'),
+    path('translations/', lazy_view('dev_dashboard.views.translations_info_view'), name='translations'),
+    path('translations/api/', lazy_view('dev_dashboard.views.translations_api_view'), name='translations_api'),
+    path('system/', lazy_view('dev_dashboard.views.system_info_view'), name='system'),
+    path('profiling/', lazy_view('dev_dashboard.views.profiling_view'), name='profiling'),
+    path('profiling/sampler/', lazy_view('dev_dashboard.views.sampler_view'), name='sampler'),
+    path('profiling/sampler/collapsed/', lazy_view('dev_dashboard.views.sampler_collapsed_view'),
+         name='sampler_collapsed'),
 ]
\ No newline at end of file
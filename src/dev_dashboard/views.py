@@ -1,21 +1,40 @@
-from django.shortcuts import render
-from django.http import JsonResponse
+from django.shortcuts import redirect, render
+from django.http import HttpResponse, JsonResponse
 from django.urls import get_resolver
 from django.conf import settings
 from django.apps import apps
 from django.contrib.auth.models import User
-from django.db import connection
 import os
 import sys
 import django
+from functools import wraps
 from pathlib import Path
 
+from admin_panel import throttling
+from whmcs_project.cache import cached_fragment, cached_view
+from whmcs_project import profiling
+from whmcs_project.db import pool_stats, table_stats
+from whmcs_project.querylog import query_log
+from whmcs_project.rowcounts import row_count
+from whmcs_project.sampler import IGNORED_NAMESPACES, sampler
 
+from .apps import CACHE_NAMESPACE
+from .catalog_index import catalog_index
+
+
+def debug_only(view_func):
+    """Дозволяє view тільки в DEBUG режимі"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not settings.DEBUG:
+            return JsonResponse({'error': 'Dev dashboard доступний тільки в DEBUG режимі'}, status=403)
+        return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+@debug_only
 def dev_dashboard(request):
     """Головна сторінка dev dashboard"""
-    if not settings.DEBUG:
-        return JsonResponse({'error': 'Dev dashboard доступний тільки в DEBUG режимі'}, status=403)
-    
     context = {
         'title': 'Development Dashboard',
         'project_name': 'WHMCS Admin Panel',
@@ -23,37 +42,44 @@ def dev_dashboard(request):
     return render(request, 'dev_dashboard/dashboard.html', context)
 
 
+def extract_urls(urlpatterns, prefix='', namespace=''):
+    """Обходить resolver і повертає всі URL patterns з повними іменами view"""
+    urls = []
+    for pattern in urlpatterns:
+        if hasattr(pattern, 'url_patterns'):
+            # Include pattern
+            child_namespace = namespace
+            if getattr(pattern, 'namespace', None):
+                child_namespace = f'{namespace}{pattern.namespace}:'
+            urls.extend(extract_urls(pattern.url_patterns, prefix + str(pattern.pattern), child_namespace))
+        else:
+            # Regular URL pattern
+            url_info = {
+                'pattern': prefix + str(pattern.pattern),
+                'name': getattr(pattern, 'name', None),
+                'view': None,
+                'view_name': None,
+                'methods': ['GET', 'POST']  # Default
+            }
+            
+            if hasattr(pattern, 'callback'):
+                if hasattr(pattern.callback, '__name__'):
+                    url_info['view'] = pattern.callback.__name__
+                elif hasattr(pattern.callback, 'view_class'):
+                    url_info['view'] = pattern.callback.view_class.__name__
+                else:
+                    url_info['view'] = str(pattern.callback)
+                # Те саме ім'я, що й у request.resolver_match.view_name
+                url_info['view_name'] = namespace + (url_info['name'] or pattern.lookup_str)
+            
+            urls.append(url_info)
+    return urls
+
+
+@debug_only
+@cached_view(timeout=60, namespace=CACHE_NAMESPACE)
 def url_patterns_view(request):
     """Показує всі URL patterns проекту"""
-    if not settings.DEBUG:
-        return JsonResponse({'error': 'Dev dashboard доступний тільки в DEBUG режимі'}, status=403)
-    
-    def extract_urls(urlpatterns, prefix=''):
-        urls = []
-        for pattern in urlpatterns:
-            if hasattr(pattern, 'url_patterns'):
-                # Include pattern
-                urls.extend(extract_urls(pattern.url_patterns, prefix + str(pattern.pattern)))
-            else:
-                # Regular URL pattern
-                url_info = {
-                    'pattern': prefix + str(pattern.pattern),
-                    'name': getattr(pattern, 'name', None),
-                    'view': None,
-                    'methods': ['GET', 'POST']  # Default
-                }
-                
-                if hasattr(pattern, 'callback'):
-                    if hasattr(pattern.callback, '__name__'):
-                        url_info['view'] = pattern.callback.__name__
-                    elif hasattr(pattern.callback, 'view_class'):
-                        url_info['view'] = pattern.callback.view_class.__name__
-                    else:
-                        url_info['view'] = str(pattern.callback)
-                
-                urls.append(url_info)
-        return urls
-    
     resolver = get_resolver()
     all_urls = extract_urls(resolver.url_patterns)
     
@@ -64,11 +90,10 @@ def url_patterns_view(request):
     return render(request, 'dev_dashboard/urls.html', context)
 
 
+@debug_only
+@cached_view(timeout=60, namespace=CACHE_NAMESPACE)
 def apps_info_view(request):
     """Показує інформацію про всі Django apps"""
-    if not settings.DEBUG:
-        return JsonResponse({'error': 'Dev dashboard доступний тільки в DEBUG режимі'}, status=403)
-    
     apps_info = []
     for app_config in apps.get_app_configs():
         models_info = []
@@ -96,13 +121,12 @@ def apps_info_view(request):
     return render(request, 'dev_dashboard/apps.html', context)
 
 
+@debug_only
+@cached_view(timeout=60, namespace=CACHE_NAMESPACE)
 def settings_view(request):
     """Показує налаштування Django"""
-    if not settings.DEBUG:
-        return JsonResponse({'error': 'Dev dashboard доступний тільки в DEBUG режимі'}, status=403)
-    
     # Безпечні налаштування для показу
-    safe_settings = {}
+    safe_settings = []
     sensitive_keys = ['SECRET_KEY', 'PASSWORD', 'KEY', 'TOKEN', 'API']
     
     for key in dir(settings):
@@ -110,9 +134,10 @@ def settings_view(request):
             value = getattr(settings, key)
             # Приховуємо чутливі дані
             if any(sensitive in key for sensitive in sensitive_keys):
-                safe_settings[key] = '***HIDDEN***'
+                safe_settings.append((key, '***HIDDEN***', 'str'))
             else:
-                safe_settings[key] = value
+                # Шаблони не мають доступу до атрибутів з підкресленням
+                safe_settings.append((key, value, type(value).__name__))
     
     context = {
         'settings': safe_settings,
@@ -123,10 +148,24 @@ def settings_view(request):
     return render(request, 'dev_dashboard/settings.html', context)
 
 
+@cached_fragment(CACHE_NAMESPACE, timeout=30)
+def database_tables():
+    """Статистика таблиць одним запитом (інвалідується після migrate)"""
+    return table_stats()
+
+
+@cached_fragment(CACHE_NAMESPACE, timeout=300)
+def database_user_count():
+    """Кількість користувачів (інвалідується при зміні User)"""
+    return row_count(User)
+
+
+@debug_only
 def database_info_view(request):
     """Показує інформацію про базу даних"""
-    if not settings.DEBUG:
-        return JsonResponse({'error': 'Dev dashboard доступний тільки в DEBUG режимі'}, status=403)
+    if request.method == 'POST':
+        query_log.clear()
+        return redirect('dev_dashboard:database')
     
     db_info = {}
     
@@ -137,78 +176,28 @@ def database_info_view(request):
     db_info['host'] = db_config.get('HOST', 'localhost')
     db_info['port'] = db_config.get('PORT', 'default')
     
-    # Статистика таблиць
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public'
-            ORDER BY table_name
-        """)
-        tables = [row[0] for row in cursor.fetchall()]
-    
-    # Кількість користувачів
-    user_count = User.objects.count()
+    tables = database_tables()
+    user_count = database_user_count()
     
     context = {
         'db_info': db_info,
         'tables': tables,
         'tables_count': len(tables),
-        'user_count': user_count
+        'user_count': user_count,
+        'pool': pool_stats(),
+        'querylog_enabled': settings.QUERYLOG_ENABLED,
+        'explain_threshold': settings.QUERYLOG_EXPLAIN_THRESHOLD_MS,
+        'queries': query_log.queries()[:100],
+        'queries_dropped': query_log.dropped,
     }
     return render(request, 'dev_dashboard/database.html', context)
 
 
+@debug_only
 def translations_info_view(request):
     """Показує інформацію про переклади"""
-    if not settings.DEBUG:
-        return JsonResponse({'error': 'Dev dashboard доступний тільки в DEBUG режимі'}, status=403)
-    
     locale_dir = Path(settings.BASE_DIR) / 'locale'
-    languages_info = []
-    
-    for lang_code, lang_name in settings.LANGUAGES:
-        po_file = locale_dir / lang_code / 'LC_MESSAGES' / 'django.po'
-        mo_file = locale_dir / lang_code / 'LC_MESSAGES' / 'django.mo'
-        
-        lang_info = {
-            'code': lang_code,
-            'name': lang_name,
-            'po_exists': po_file.exists(),
-            'mo_exists': mo_file.exists(),
-            'po_size': po_file.stat().st_size if po_file.exists() else 0,
-            'mo_size': mo_file.stat().st_size if mo_file.exists() else 0,
-        }
-        
-        # Статистика перекладів
-        if po_file.exists():
-            try:
-                with open(po_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                import re
-                total = len(re.findall(r'^msgid "([^"]*)"', content, re.MULTILINE))
-                translated = len(re.findall(r'^msgstr "([^"]+)"', content, re.MULTILINE))
-                empty = len(re.findall(r'^msgstr ""', content, re.MULTILINE))
-                
-                if total > 0:
-                    total -= 1  # Subtract header
-                    
-                lang_info.update({
-                    'total_strings': total,
-                    'translated_strings': translated,
-                    'empty_strings': empty,
-                    'percentage': (translated * 100 // total) if total > 0 else 0
-                })
-            except Exception:
-                lang_info.update({
-                    'total_strings': 0,
-                    'translated_strings': 0,
-                    'empty_strings': 0,
-                    'percentage': 0
-                })
-        
-        languages_info.append(lang_info)
+    languages_info = catalog_index.languages(locale_dir, settings.LANGUAGES)
     
     context = {
         'languages': languages_info,
@@ -219,11 +208,28 @@ def translations_info_view(request):
     return render(request, 'dev_dashboard/translations.html', context)
 
 
+@debug_only
+def translations_api_view(request):
+    """JSON статистика перекладів для зовнішніх інструментів"""
+    locale_dir = Path(settings.BASE_DIR) / 'locale'
+    include_untranslated = request.GET.get('untranslated', '1') not in ('0', 'false')
+    
+    languages_info = []
+    for lang_info in catalog_index.languages(locale_dir, settings.LANGUAGES):
+        if not include_untranslated:
+            lang_info = {key: value for key, value in lang_info.items() if key != 'untranslated'}
+        languages_info.append(lang_info)
+    
+    return JsonResponse({
+        'default_language': settings.LANGUAGE_CODE,
+        'languages': languages_info,
+    })
+
+
+@debug_only
+@cached_view(timeout=60, namespace=CACHE_NAMESPACE)
 def system_info_view(request):
     """Показує системну інформацію"""
-    if not settings.DEBUG:
-        return JsonResponse({'error': 'Dev dashboard доступний тільки в DEBUG режимі'}, status=403)
-    
     # Інформація про середовище
     env_info = {
         'python_version': sys.version,
@@ -246,6 +252,88 @@ def system_info_view(request):
         'env_info': env_info,
         'env_vars': dict(sorted(env_vars.items())),
         'installed_apps': settings.INSTALLED_APPS,
-        'middleware': settings.MIDDLEWARE
+        'middleware': settings.MIDDLEWARE,
+        'throttle_enabled': settings.LOGIN_THROTTLE_ENABLED,
+        'throttle_stats': throttling.stats(),
     }
     return render(request, 'dev_dashboard/system.html', context)
+
+
+@debug_only
+def profiling_view(request):
+    """Перцентилі часу відповіді по URL (буфер поточного воркера)"""
+    if request.method == 'POST':
+        profiling.buffer.clear()
+        return redirect('dev_dashboard:profiling')
+    
+    records = profiling.buffer.records()
+    summaries = profiling.summarize(records)
+    
+    # Всі URL з resolver, навіть ті, що ще не викликались
+    rows = []
+    seen = set()
+    for url in extract_urls(get_resolver().url_patterns):
+        view_name = url['view_name']
+        if view_name is None or view_name in seen:
+            continue
+        seen.add(view_name)
+        rows.append({'pattern': url['pattern'], 'view_name': view_name, 'summary': summaries.get(view_name)})
+    for view_name, summary in summaries.items():
+        if view_name not in seen:
+            rows.append({'pattern': None, 'view_name': view_name, 'summary': summary})
+    rows.sort(key=lambda row: -(row['summary'].p95 if row['summary'] else -1))
+    
+    context = {
+        'rows': rows,
+        'records_count': len(records),
+        'buffer_size': profiling.buffer.maxlen,
+        'enabled': settings.PROFILING_ENABLED,
+        'sample_rate': settings.PROFILING_SAMPLE_RATE,
+        'recent': list(reversed(records[-20:])),
+    }
+    return render(request, 'dev_dashboard/profiling.html', context)
+
+
+@debug_only
+def sampler_view(request):
+    """Профайлер стеків на вимогу: наступні N запитів або запити до одного URL"""
+    if request.method == 'POST':
+        action = request.POST.get('action')
+        if action == 'start':
+            try:
+                requests_count = int(request.POST.get('requests', 10))
+                interval_ms = float(request.POST.get('interval_ms', 2))
+            except ValueError:
+                return JsonResponse({'error': 'Невірні параметри профайлера'}, status=400)
+            sampler.arm(requests_count, request.POST.get('url_name'), interval_ms / 1000)
+        elif action == 'stop':
+            sampler.disarm()
+        elif action == 'clear':
+            sampler.clear()
+        return redirect('dev_dashboard:sampler')
+    
+    sort = request.GET.get('sort', 'self')
+    functions = sampler.functions(sort)
+    url_names = sorted({
+        url['view_name'] for url in extract_urls(get_resolver().url_patterns)
+        if url['view_name'] and not url['view_name'].startswith(IGNORED_NAMESPACES)
+    })
+    
+    context = {
+        'sampler': sampler,
+        'profiling_enabled': settings.PROFILING_ENABLED,
+        'functions': functions[:200],
+        'functions_count': len(functions),
+        'stacks_count': len(sampler.stacks),
+        'sort': sort,
+        'url_names': url_names,
+    }
+    return render(request, 'dev_dashboard/sampler.html', context)
+
+
+@debug_only
+def sampler_collapsed_view(request):
+    """Collapsed stacks для flamegraph.pl / speedscope"""
+    response = HttpResponse(sampler.collapsed(), content_type='text/plain; charset=utf-8')
+    response['Content-Disposition'] = 'attachment; filename="stacks.collapsed.txt"'
+    return response
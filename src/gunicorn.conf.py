@@ -0,0 +1,39 @@
+"""
+Конфігурація gunicorn для продакшн режиму (BUILD_MODE=production).
+
+SERVER_INTERFACE=asgi (за замовчуванням) - воркери uvicorn, async views
+виконуються нативно в event loop. SERVER_INTERFACE=wsgi - потокові
+воркери gthread для середовищ без ASGI.
+
+Запуск: gunicorn -c gunicorn.conf.py
+"""
+
+import multiprocessing
+
+# gunicorn читає всі імена модуля як налаштування, а 'config' - одне з них
+from decouple import config as env
+
+SERVER_INTERFACE = env('SERVER_INTERFACE', default='asgi')  # asgi | wsgi
+
+if SERVER_INTERFACE == 'wsgi':
+    wsgi_app = 'whmcs_project.wsgi:application'
+    worker_class = 'gthread'
+    threads = env('GUNICORN_THREADS', default=4, cast=int)
+else:
+    wsgi_app = 'whmcs_project.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+
+bind = env('GUNICORN_BIND', default='0.0.0.0:8000')
+workers = env('WEB_CONCURRENCY', default=min(multiprocessing.cpu_count() * 2 + 1, 8), cast=int)
+
+timeout = env('GUNICORN_TIMEOUT', default=30, cast=int)
+graceful_timeout = env('GUNICORN_GRACEFUL_TIMEOUT', default=30, cast=int)
+keepalive = env('GUNICORN_KEEPALIVE', default=5, cast=int)
+
+# Перезапуск воркерів проти поступового росту пам'яті
+max_requests = env('GUNICORN_MAX_REQUESTS', default=2000, cast=int)
+max_requests_jitter = env('GUNICORN_MAX_REQUESTS_JITTER', default=200, cast=int)
+
+accesslog = env('GUNICORN_ACCESS_LOG', default='-')
+errorlog = '-'
+loglevel = env('GUNICORN_LOG_LEVEL', default='info')
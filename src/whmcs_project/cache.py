@@ -0,0 +1,159 @@
+"""
+Кешування на рівні проекту.
+
+Аліаси кешу (див. CACHES у settings.py):
+    LOCAL  ('default') - LRU в пам'яті воркера, для гарячих даних
+    SHARED ('shared')  - спільний для всіх воркерів (файли, БД або Redis)
+
+Ключі групуються в простори імен (namespace) з версією: ``invalidate()``
+збільшує версію простору, і всі старі ключі перестають читатися без
+перебору. Версія зберігається в тому ж аліасі, що й дані, тому для
+LOCAL інвалідація діє в межах воркера, а між воркерами - через TTL.
+"""
+
+import hashlib
+from functools import wraps
+from typing import Callable, Iterable, Optional
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db.models.signals import post_delete, post_save
+from django.utils.translation import get_language
+
+LOCAL = 'default'
+SHARED = 'shared'
+
+# Відсутнє значення (None теж можна кешувати)
+_MISSING = object()
+
+
+def _version_key(namespace: str) -> str:
+    return f'ns:{namespace}'
+
+
+def namespace_version(namespace: str, alias: str = LOCAL) -> int:
+    """Поточна версія простору імен"""
+    cache = caches[alias]
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        version = 1
+        cache.add(_version_key(namespace), version, timeout=None)
+    return version
+
+
+def make_key(namespace: str, *parts, alias: str = LOCAL) -> str:
+    """Ключ кешу для простору імен та довільних частин"""
+    digest = hashlib.md5(repr(parts).encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'{namespace}:v{namespace_version(namespace, alias)}:{digest}'
+
+
+def invalidate(*namespaces: str, aliases: Iterable[str] = (LOCAL, SHARED)) -> None:
+    """Інвалідує всі ключі вказаних просторів імен"""
+    for alias in aliases:
+        cache = caches[alias]
+        for namespace in namespaces:
+            try:
+                cache.incr(_version_key(namespace))
+            except ValueError:
+                cache.set(_version_key(namespace), 2, timeout=None)
+
+
+def invalidate_on(*models, namespaces: Iterable[str], aliases: Iterable[str] = (LOCAL, SHARED),
+                  ignore_fields: Iterable[str] = ()) -> None:
+    """Інвалідує простори імен при збереженні або видаленні моделей
+
+    ``ignore_fields`` - поля, збереження тільки яких (``save(update_fields=...)``)
+    не впливає на закешовані дані, наприклад ``last_login`` при вході.
+    """
+    namespaces = tuple(namespaces)
+    aliases = tuple(aliases)
+    ignore_fields = frozenset(ignore_fields)
+
+    def handler(sender, update_fields=None, **kwargs):
+        if update_fields and ignore_fields and set(update_fields) <= ignore_fields:
+            return
+        invalidate(*namespaces, aliases=aliases)
+
+    for model in models:
+        uid = f'invalidate:{model._meta.label}:{",".join(namespaces)}'
+        post_save.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+        post_delete.connect(handler, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
+
+
+def cached_fragment(namespace: str, timeout: Optional[int] = DEFAULT_TIMEOUT, alias: str = LOCAL) -> Callable:
+    """Кешує результат функції за її аргументами
+
+    Підходить для даних та HTML фрагментів, які дорого рахувати:
+
+        @cached_fragment('dashboard.stats', timeout=60)
+        def dashboard_stats():
+            ...
+
+    Декорована функція отримує атрибут ``invalidate()``.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = caches[alias]
+            key = make_key(namespace, func.__qualname__, args, sorted(kwargs.items()), alias=alias)
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.set(key, value, timeout=timeout)
+            return value
+
+        wrapper.invalidate = lambda: invalidate(namespace, aliases=(alias,))
+        return wrapper
+
+    return decorator
+
+
+def cached_view(timeout: Optional[int] = DEFAULT_TIMEOUT, namespace: str = 'views', alias: str = LOCAL,
+                vary_on_user: bool = True) -> Callable:
+    """Кешує відповіді GET/HEAD запитів view
+
+    Ключ враховує шлях з query string, активну мову та (за замовчуванням)
+    користувача. Кешуються тільки відповіді 200 без cookies, для яких view
+    і шаблон не зверталися до сесії та не брали CSRF токен: ці cookie
+    CsrfViewMiddleware і SessionMiddleware додають уже після view, тож
+    сторінка з ``{% csrf_token %}`` або даними сесії не потрапляє в кеш.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            cache = caches[alias]
+            user_id = request.user.pk if vary_on_user and hasattr(request, 'user') else None
+            key = make_key(namespace, request.get_full_path(), get_language(), user_id, alias=alias)
+
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+            # request.user вище вже читав сесію: рахується лише доступ з view та шаблону
+            session = getattr(request, 'session', None)
+            accessed_before = session is not None and session.accessed
+            if session is not None:
+                session.accessed = False
+
+            def store(response):
+                if response.status_code == 200 and not response.cookies and not response.streaming \
+                        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE') \
+                        and not (session is not None and (session.accessed or session.modified)):
+                    cache.set(key, response, timeout=timeout)
+                if session is not None:
+                    # SessionMiddleware за цим прапорцем додає Vary: Cookie
+                    session.accessed = session.accessed or accessed_before
+
+            response = view_func(request, *args, **kwargs)
+            if getattr(response, 'is_rendered', True):
+                store(response)
+            else:
+                response.add_post_render_callback(store)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,140 @@
+"""
+Метрики з'єднань з базою даних та статистика таблиць.
+
+Режим з'єднань задається DB_POOL_MODE (див. settings.py). У режимі
+``pool`` статистику веде сам ``psycopg_pool.ConnectionPool``; в інших
+режимах рахуємо відкриті воркером з'єднання через сигнал
+``connection_created``. Усі лічильники - в межах процесу.
+"""
+
+import threading
+from collections import Counter
+from typing import List, Optional
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_lock = threading.Lock()
+_created: Counter = Counter()
+
+
+def _count_connection(sender, connection, **kwargs):
+    with _lock:
+        _created[connection.alias] += 1
+
+
+def install() -> None:
+    """Підключає лічильник нових з'єднань (викликається з AppConfig.ready)"""
+    connection_created.connect(_count_connection, dispatch_uid='whmcs_project.db.count_connections')
+
+
+def pool_mode(alias: str = 'default') -> str:
+    settings_dict = connections[alias].settings_dict
+    if settings_dict.get('OPTIONS', {}).get('pool'):
+        return 'pool'
+    if settings_dict.get('CONN_MAX_AGE'):
+        return 'persistent'
+    return 'off'
+
+
+def pool_stats(alias: str = 'default') -> dict:
+    """Метрики з'єднань: видачі, очікування, розмір пулу та помилки
+
+    Поля, які не мають сенсу для поточного режиму, дорівнюють None.
+    """
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    stats = {
+        'alias': alias,
+        'vendor': connection.vendor,
+        'mode': pool_mode(alias),
+        'health_checks': bool(settings_dict.get('CONN_HEALTH_CHECKS')),
+        'conn_max_age': settings_dict.get('CONN_MAX_AGE'),
+        'connections_created': _created[alias],
+        'checkouts': None,
+        'waits': None,
+        'wait_ms': None,
+        'pool_size': None,
+        'pool_available': None,
+        'pool_min': None,
+        'pool_max': None,
+        'failures': None,
+    }
+
+    pool = getattr(connection, 'pool', None) if stats['mode'] == 'pool' else None
+    if pool is not None:
+        raw = pool.get_stats()
+        stats.update({
+            'connections_created': raw.get('connections_num', 0),
+            'checkouts': raw.get('requests_num', 0),
+            'waits': raw.get('requests_queued', 0),
+            'wait_ms': raw.get('requests_wait_ms', 0),
+            'pool_size': raw.get('pool_size', 0),
+            'pool_available': raw.get('pool_available', 0),
+            'pool_min': raw.get('pool_min'),
+            'pool_max': raw.get('pool_max'),
+            'failures': sum(raw.get(name, 0) for name in (
+                'requests_errors', 'connections_errors', 'connections_lost', 'returns_bad',
+            )),
+        })
+    return stats
+
+
+def reset_stats(alias: Optional[str] = None) -> None:
+    """Скидає лічильник створених з'єднань (для тестів та бенчмарків)"""
+    with _lock:
+        if alias is None:
+            _created.clear()
+        else:
+            _created.pop(alias, None)
+
+
+# Одним запитом: оцінка рядків (reltuples), розміри та використання індексів
+TABLE_STATS_SQL = """
+    SELECT c.relname,
+           c.reltuples::bigint,
+           pg_total_relation_size(c.oid),
+           pg_relation_size(c.oid),
+           pg_indexes_size(c.oid),
+           s.seq_scan,
+           s.idx_scan,
+           s.n_live_tup,
+           s.n_dead_tup,
+           GREATEST(s.last_vacuum, s.last_autovacuum),
+           GREATEST(s.last_analyze, s.last_autoanalyze)
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE c.relkind IN ('r', 'p') AND n.nspname = current_schema()
+    ORDER BY pg_total_relation_size(c.oid) DESC, c.relname
+"""
+
+TABLE_STATS_COLUMNS = (
+    'name', 'rows_estimate', 'total_size', 'table_size', 'indexes_size',
+    'seq_scan', 'idx_scan', 'live_rows', 'dead_rows', 'last_vacuum', 'last_analyze',
+)
+
+
+def table_stats(alias: str = 'default') -> List[dict]:
+    """Статистика таблиць без COUNT(*) по кожній таблиці
+
+    Для PostgreSQL - з pg_class та pg_stat_user_tables; для інших БД
+    повертаються тільки імена таблиць.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        with connection.cursor() as cursor:
+            names = connection.introspection.table_names(cursor)
+        return [dict.fromkeys(TABLE_STATS_COLUMNS, None) | {'name': name, 'idx_usage': None} for name in names]
+
+    with connection.cursor() as cursor:
+        cursor.execute(TABLE_STATS_SQL)
+        rows = [dict(zip(TABLE_STATS_COLUMNS, row)) for row in cursor.fetchall()]
+
+    for row in rows:
+        # reltuples = -1 для таблиць, які ще не аналізувались
+        if row['rows_estimate'] is not None and row['rows_estimate'] < 0:
+            row['rows_estimate'] = row['live_rows']
+        scans = (row['seq_scan'] or 0) + (row['idx_scan'] or 0)
+        row['idx_usage'] = round(row['idx_scan'] * 100 / scans) if scans and row['idx_scan'] is not None else None
+    return rows
@@ -0,0 +1,6 @@
+"""
+Інструменти для роботи з каталогами перекладів gettext (.po/.mo).
+
+Модулі пакету не залежать від налаштувань Django, тому їх можна
+використовувати як з dev_tools/translations.py, так і всередині проекту.
+"""
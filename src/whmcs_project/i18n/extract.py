@@ -0,0 +1,513 @@
+"""
+Витягування рядків для перекладу з Python коду та Django шаблонів.
+
+Замінює зв'язку ``makemessages`` → ``xgettext`` → ``msgmerge``: джерела
+проходяться один раз, з них будується шаблонний каталог у пам'яті, який
+потім зливається з каталогом кожної мови (``merge_catalog``).
+Семантика тегів ``{% trans %}``/``{% blocktrans %}`` повторює
+``django.utils.translation.template.templatize``.
+"""
+
+import ast
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import re
+import sqlite3
+import tokenize
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .po import POCatalog, POEntry, iter_entries
+
+TRANSLATOR_COMMENT_MARK = 'Translators'
+
+# Змінюється при зміні логіки витягування, щоб скинути ExtractionCache
+EXTRACTOR_VERSION = 1
+
+# Розширення файлів домену "django", які обробляє makemessages
+SOURCE_EXTENSIONS = ('.html', '.txt', '.py')
+
+# Тести містять рядки-фікстури для gettext, які не мають потрапляти в каталоги
+DEFAULT_IGNORE_PATTERNS = ('CVS', '.*', '*~', '*.pyc', 'venv', 'staticfiles', 'locale', 'tests.py', 'tests')
+
+# Ключові слова xgettext, з якими makemessages запускає витягування:
+# функція -> (індекс msgctxt, індекс msgid, індекс msgid_plural)
+PYTHON_KEYWORDS: Dict[str, Tuple[Optional[int], int, Optional[int]]] = {
+    '_': (None, 0, None),
+    'gettext': (None, 0, None),
+    'gettext_lazy': (None, 0, None),
+    'gettext_noop': (None, 0, None),
+    'ngettext': (None, 0, 1),
+    'ngettext_lazy': (None, 0, 1),
+    'pgettext': (0, 1, None),
+    'pgettext_lazy': (0, 1, None),
+    'npgettext': (0, 1, 2),
+    'npgettext_lazy': (0, 1, 2),
+}
+
+_PYTHON_FORMAT_RE = re.compile(
+    r'%(?:\([^)]*\))?[#0\- +]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[hlL]?([diouxXeEfFgGcrsa%])'
+)
+
+
+@dataclass
+class ExtractedMessage:
+    """Рядок для перекладу, знайдений у вихідному файлі"""
+
+    msgid: str
+    reference: str
+    msgid_plural: Optional[str] = None
+    msgctxt: Optional[str] = None
+    comments: List[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> Tuple[Optional[str], str]:
+        return self.msgctxt, self.msgid
+
+    @property
+    def flags(self) -> List[str]:
+        texts = [self.msgid] + ([self.msgid_plural] if self.msgid_plural else [])
+        if any(is_python_format(text) for text in texts):
+            return ['python-format']
+        return []
+
+
+def is_python_format(text: str) -> bool:
+    """Чи містить рядок %-директиви форматування (крім ``%%``)"""
+    return any(match.group(1) != '%' for match in _PYTHON_FORMAT_RE.finditer(text))
+
+
+def is_ignored(path: Path, root: Path, patterns: Sequence[str]) -> bool:
+    parts = path.relative_to(root).parts
+    return any(fnmatch.fnmatchcase(part, pattern) for part in parts for pattern in patterns)
+
+
+def find_source_files(root: Path, ignore_patterns: Sequence[str] = DEFAULT_IGNORE_PATTERNS) -> List[Path]:
+    """Відсортований список файлів, з яких витягуються переклади"""
+    root = Path(root)
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        current = Path(dirpath)
+        dirnames[:] = [
+            name for name in dirnames if not is_ignored(current / name, root, ignore_patterns)
+        ]
+        for name in filenames:
+            path = current / name
+            if path.suffix in SOURCE_EXTENSIONS and not is_ignored(path, root, ignore_patterns):
+                files.append(path)
+    return sorted(files)
+
+
+def _unquote(value: str) -> str:
+    if value[:1] in ('"', "'") and value[-1:] == value[:1]:
+        return value[1:-1]
+    return value
+
+
+def extract_template(source: str, filename: str) -> List[ExtractedMessage]:
+    """Витягує рядки з тегів перекладу Django шаблону"""
+    from django.template.base import Lexer, TokenType
+    from django.utils.translation import trim_whitespace
+    from django.utils.translation.template import (
+        block_re, constant_re, context_re, endblock_re, inline_re, plural_re,
+    )
+
+    messages: List[ExtractedMessage] = []
+    comments: List[str] = []
+
+    def add(msgid: str, lineno: int, plural: Optional[str] = None, context: Optional[str] = None) -> None:
+        messages.append(ExtractedMessage(
+            msgid=msgid,
+            msgid_plural=plural,
+            msgctxt=context,
+            reference=f'{filename}:{lineno}',
+            comments=list(comments),
+        ))
+        comments.clear()
+
+    def add_constant(value: str, lineno: int) -> None:
+        add(_unquote(value), lineno)
+
+    def context_of(match_group: Optional[str]) -> Optional[str]:
+        if not match_group:
+            return None
+        return _unquote(context_re.match(match_group)[1])
+
+    intrans = inplural = trimmed = incomment = False
+    context: Optional[str] = None
+    block_lineno = 0
+    singular: List[str] = []
+    plural: List[str] = []
+    comment_parts: List[str] = []
+
+    for token in Lexer(source).tokenize():
+        if incomment:
+            if token.token_type == TokenType.BLOCK and token.contents == 'endcomment':
+                lines = ''.join(comment_parts).splitlines()
+                for index, line in enumerate(lines):
+                    if line.lstrip().startswith(TRANSLATOR_COMMENT_MARK):
+                        comments[:] = [item.strip() for item in lines[index:]]
+                        break
+                incomment = False
+                comment_parts = []
+            else:
+                comment_parts.append(token.contents)
+        elif intrans:
+            if token.token_type == TokenType.BLOCK:
+                if endblock_re.match(token.contents):
+                    msgid = ''.join(singular)
+                    msgid_plural = ''.join(plural) if inplural else None
+                    if trimmed:
+                        msgid = trim_whitespace(msgid)
+                        msgid_plural = trim_whitespace(msgid_plural) if inplural else None
+                    add(msgid, block_lineno, msgid_plural, context)
+                    intrans = inplural = False
+                    context = None
+                    singular, plural = [], []
+                elif plural_re.match(token.contents):
+                    inplural = True
+                else:
+                    raise SyntaxError(
+                        'Translation blocks must not include other block tags: '
+                        f'{token.contents} (file {filename}, line {token.lineno})'
+                    )
+            elif token.token_type in (TokenType.VAR, TokenType.TEXT):
+                if token.token_type == TokenType.VAR:
+                    part = f'%({token.contents})s'
+                else:
+                    part = token.contents.replace('%', '%%')
+                (plural if inplural else singular).append(part)
+        elif token.token_type == TokenType.BLOCK:
+            inline = inline_re.match(token.contents)
+            block = block_re.match(token.contents)
+            constants = constant_re.findall(token.contents)
+            if inline:
+                add(_unquote(inline[1]).replace('%', '%%'), token.lineno, context=context_of(inline[2]))
+            elif block:
+                for constant in constants:
+                    add_constant(constant, token.lineno)
+                context = context_of(block[1])
+                intrans, inplural = True, False
+                trimmed = 'trimmed' in token.split_contents()
+                block_lineno = token.lineno
+                singular, plural = [], []
+            elif constants:
+                for constant in constants:
+                    add_constant(constant, token.lineno)
+            elif token.contents == 'comment':
+                incomment = True
+            else:
+                comments.clear()
+        elif token.token_type == TokenType.VAR:
+            parts = token.contents.split('|')
+            constant = constant_re.match(parts[0])
+            if constant:
+                add_constant(constant[1], token.lineno)
+            for part in parts[1:]:
+                if ':_(' in part:
+                    argument = constant_re.match(part.split(':', 1)[1])
+                    if argument:
+                        add_constant(argument[1], token.lineno)
+            if not constant:
+                comments.clear()
+        elif token.token_type == TokenType.COMMENT:
+            if token.contents.lstrip().startswith(TRANSLATOR_COMMENT_MARK):
+                comments[:] = [token.contents.strip()]
+        elif token.contents.strip():
+            comments.clear()
+
+    return messages
+
+
+def _python_comments(source: str) -> Dict[int, str]:
+    """Коментарі, які займають окремий рядок, за номером рядка"""
+    result = {}
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type == tokenize.COMMENT and not token.line[:token.start[1]].strip():
+                result[token.start[0]] = token.string[1:].strip()
+    except (tokenize.TokenError, SyntaxError):
+        pass
+    return result
+
+
+def _translator_comments(comments: Dict[int, str], lineno: int) -> List[str]:
+    block = []
+    line = lineno - 1
+    while line in comments:
+        block.insert(0, comments[line])
+        line -= 1
+    for index, comment in enumerate(block):
+        if comment.startswith(TRANSLATOR_COMMENT_MARK):
+            return block[index:]
+    return []
+
+
+def extract_python(source: str, filename: str) -> List[ExtractedMessage]:
+    """Витягує виклики gettext-функцій з рядковими аргументами"""
+    try:
+        tree = ast.parse(source, filename=filename)
+    except SyntaxError:
+        return []
+
+    comments: Optional[Dict[int, str]] = None
+    messages = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else getattr(func, 'attr', None)
+        spec = PYTHON_KEYWORDS.get(name)
+        if spec is None:
+            continue
+
+        values = []
+        for index in spec:
+            if index is None:
+                values.append(None)
+                continue
+            if index >= len(node.args):
+                break
+            argument = node.args[index]
+            if not (isinstance(argument, ast.Constant) and isinstance(argument.value, str)):
+                break
+            values.append(argument)
+        else:
+            context, msgid, plural = values
+            if comments is None:
+                comments = _python_comments(source) if TRANSLATOR_COMMENT_MARK in source else {}
+            messages.append(ExtractedMessage(
+                msgid=msgid.value,
+                msgid_plural=plural.value if plural is not None else None,
+                msgctxt=context.value if context is not None else None,
+                reference=f'{filename}:{msgid.lineno}',
+                comments=_translator_comments(comments, node.lineno),
+            ))
+
+    messages.sort(key=lambda message: int(message.reference.rsplit(':', 1)[1]))
+    return messages
+
+
+def extract_source(source: str, filename: str) -> List[ExtractedMessage]:
+    """Витягує рядки з вмісту файлу, тип визначається за розширенням"""
+    if filename.endswith('.py'):
+        return extract_python(source, filename)
+    return extract_template(source, filename)
+
+
+def extract_file(path: Path, root: Path) -> List[ExtractedMessage]:
+    """Витягує рядки з одного файлу (шлях у посиланнях відносно ``root``)"""
+    filename = Path(path).relative_to(root).as_posix()
+    with open(path, 'r', encoding='utf-8') as f:
+        return extract_source(f.read(), filename)
+
+
+class ExtractionCache:
+    """Постійний кеш витягнутих рядків у SQLite
+
+    Для кожного файлу зберігаються mtime, розмір, SHA-256 та витягнуті
+    рядки. Файл повторно розбирається тільки якщо змінився його вміст;
+    якщо змінився лише mtime (checkout, touch), оновлюються метадані.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(self.path))
+        self.hits = 0
+        self.misses = 0
+        self._setup()
+
+    def __enter__(self) -> 'ExtractionCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _setup(self) -> None:
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)'
+            )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS files ('
+                'path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, '
+                'sha256 TEXT NOT NULL, messages TEXT NOT NULL)'
+            )
+            row = self.connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(EXTRACTOR_VERSION):
+                self.connection.execute('DELETE FROM files')
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                    (str(EXTRACTOR_VERSION),),
+                )
+
+    def extract(self, path: Path, root: Path) -> List[ExtractedMessage]:
+        """Повертає рядки файлу з кешу або розбирає файл і кешує результат"""
+        path = Path(path)
+        filename = path.relative_to(root).as_posix()
+        stat = path.stat()
+        row = self.connection.execute(
+            'SELECT mtime_ns, size, sha256, messages FROM files WHERE path = ?', (filename,)
+        ).fetchone()
+
+        if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            self.hits += 1
+            return self._decode(row[3])
+
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if row is not None and row[2] == digest:
+            self.hits += 1
+            self.connection.execute(
+                'UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?',
+                (stat.st_mtime_ns, stat.st_size, filename),
+            )
+            return self._decode(row[3])
+
+        self.misses += 1
+        messages = extract_source(data.decode('utf-8'), filename)
+        self.connection.execute(
+            'INSERT OR REPLACE INTO files (path, mtime_ns, size, sha256, messages) VALUES (?, ?, ?, ?, ?)',
+            (filename, stat.st_mtime_ns, stat.st_size, digest,
+             json.dumps([asdict(message) for message in messages], ensure_ascii=False)),
+        )
+        return messages
+
+    def prune(self, files: Iterable[Path], root: Path) -> int:
+        """Видаляє з кешу файли, яких більше немає серед джерел"""
+        keep = {Path(path).relative_to(root).as_posix() for path in files}
+        stale = [
+            (name,) for (name,) in self.connection.execute('SELECT path FROM files')
+            if name not in keep
+        ]
+        self.connection.executemany('DELETE FROM files WHERE path = ?', stale)
+        return len(stale)
+
+    def close(self) -> None:
+        self.connection.commit()
+        self.connection.close()
+
+    @staticmethod
+    def _decode(payload: str) -> List[ExtractedMessage]:
+        return [ExtractedMessage(**item) for item in json.loads(payload)]
+
+
+def build_template_catalog(messages: Iterable[ExtractedMessage]) -> POCatalog:
+    """Збирає шаблонний каталог (аналог .pot) з витягнутих рядків
+
+    Порядок записів — порядок першої появи, як у ``xgettext``; посилання
+    та коментарі однакових рядків об'єднуються.
+    """
+    catalog = POCatalog()
+    for message in messages:
+        entry = catalog.get(message.msgid, message.msgctxt)
+        if entry is None:
+            if not message.msgid:
+                continue
+            entry = POEntry(
+                msgid=message.msgid,
+                msgid_plural=message.msgid_plural,
+                msgctxt=message.msgctxt,
+                flags=message.flags,
+            )
+            catalog.add(entry)
+        elif message.msgid_plural and not entry.msgid_plural:
+            entry.msgid_plural = message.msgid_plural
+        if message.reference not in entry.references:
+            entry.references.append(message.reference)
+        for comment in message.comments:
+            if comment not in entry.extracted_comments:
+                entry.extracted_comments.append(comment)
+        for flag in message.flags:
+            if flag not in entry.flags:
+                entry.flags.append(flag)
+    return catalog
+
+
+def _plural_count(catalog: POCatalog) -> int:
+    match = re.search(r'nplurals\s*=\s*(\d+)', catalog.metadata.get('Plural-Forms', ''))
+    return int(match.group(1)) if match else 2
+
+
+def touch_creation_date(catalog: POCatalog, now: Optional[datetime] = None) -> None:
+    """Оновлює POT-Creation-Date у заголовку каталогу"""
+    if catalog.header is None:
+        return
+    timestamp = (now or datetime.now(timezone.utc)).strftime('%Y-%m-%d %H:%M%z')
+    catalog.header.msgstr = re.sub(
+        r'^POT-Creation-Date:.*$', f'POT-Creation-Date: {timestamp}', catalog.header.msgstr,
+        count=1, flags=re.MULTILINE,
+    )
+
+
+def merge_catalog(catalog: POCatalog, template: POCatalog) -> POCatalog:
+    """Зливає шаблонний каталог з перекладами мови (аналог ``msgmerge --update``)
+
+    Існуючі переклади, коментарі перекладачів та прапорець fuzzy
+    зберігаються; посилання та прапорці формату беруться з шаблону.
+    Записи, яких більше немає в джерелах, стають obsolete, а obsolete
+    записи, що знову з'явилися, відновлюються.
+    """
+    merged = POCatalog(path=catalog.path)
+    nplurals = _plural_count(catalog)
+    revived = {entry.key: entry for entry in catalog.obsolete}
+
+    if catalog.header is not None:
+        merged.add(catalog.header)
+
+    for source in template:
+        existing = catalog.get(source.msgid, source.msgctxt) or revived.pop(source.key, None)
+        entry = POEntry(
+            msgid=source.msgid,
+            msgid_plural=source.msgid_plural,
+            msgctxt=source.msgctxt,
+            references=list(source.references),
+            extracted_comments=list(source.extracted_comments),
+            flags=list(source.flags),
+        )
+        if existing is not None:
+            entry.comments = list(existing.comments)
+            entry.previous = list(existing.previous) if existing.fuzzy else []
+            entry.set_fuzzy(existing.fuzzy)
+            if entry.is_plural:
+                entry.msgstr_plural = dict(existing.msgstr_plural) or {0: existing.msgstr}
+            else:
+                entry.msgstr = existing.msgstr or existing.msgstr_plural.get(0, '')
+        if entry.is_plural:
+            for index in range(nplurals):
+                entry.msgstr_plural.setdefault(index, '')
+        merged.add(entry)
+
+    for entry in catalog:
+        if entry.key not in template:
+            entry.obsolete = True
+            entry.references = []
+            merged.add(entry)
+    for entry in catalog.obsolete:
+        if entry.key in revived:
+            merged.add(entry)
+
+    return merged
+
+
+def merge_po_file(po_path: Path, template: POCatalog) -> Dict[str, int]:
+    """Зливає шаблон з .po файлом на диску і повертає статистику каталогу
+
+    Файл перезаписується (з новою POT-Creation-Date) тільки якщо змінився
+    його вміст, щоб не провокувати зайву перекомпіляцію та шум у git.
+    """
+    po_path = Path(po_path)
+    with open(po_path, 'r', encoding='utf-8') as f:
+        original = f.read()
+
+    catalog = merge_catalog(POCatalog(iter_entries(original.splitlines(True), po_path), path=po_path), template)
+    if catalog.serialize() != original:
+        touch_creation_date(catalog)
+        catalog.save(po_path)
+    return catalog.stats()
@@ -0,0 +1,168 @@
+"""
+Компілятор каталогів .po у бінарний формат GNU .mo.
+
+Формат повністю сумісний з ``msgfmt``: відсортовані таблиці рядків та
+хеш-таблиця (hashpjw з подвійним хешуванням), яку використовує glibc.
+Python ``gettext`` (а отже і Django) читає такі файли напряму, тому
+для компіляції не потрібні ні ``msgfmt``, ні запуск Django.
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Tuple, Union
+
+from .po import POCatalog, POEntry
+
+MO_MAGIC = 0x950412de
+
+# Змінюється при зміні формату виводу, щоб інвалідувати збережені хеші
+COMPILER_VERSION = 1
+
+
+def hashpjw(data: bytes) -> int:
+    """Хеш-функція gettext для пошуку рядків у .mo"""
+    hval = 0
+    for byte in data:
+        hval = ((hval << 4) + byte) & 0xffffffff
+        high = hval & 0xf0000000
+        if high:
+            hval ^= high >> 24
+            hval ^= high
+    return hval
+
+
+def _is_prime(number: int) -> bool:
+    if number < 2:
+        return False
+    divisor = 2
+    while divisor * divisor <= number:
+        if number % divisor == 0:
+            return False
+        divisor += 1
+    return True
+
+
+def _next_prime(number: int) -> int:
+    number |= 1
+    while not _is_prime(number):
+        number += 2
+    return number
+
+
+def _entry_messages(entry: POEntry) -> Tuple[bytes, bytes]:
+    msgid = entry.msgid
+    if entry.msgctxt is not None:
+        msgid = f'{entry.msgctxt}\x04{msgid}'
+    if entry.is_plural:
+        key = f'{msgid}\x00{entry.msgid_plural}'
+        value = '\x00'.join(entry.msgstr_plural[index] for index in sorted(entry.msgstr_plural))
+    else:
+        key, value = msgid, entry.msgstr
+    return key.encode('utf-8'), value.encode('utf-8')
+
+
+def compiled_messages(catalog: POCatalog) -> List[Tuple[bytes, bytes]]:
+    """Повертає відсортовані пари (msgid, msgstr), які потрапляють у .mo
+
+    Як і ``msgfmt``, пропускає fuzzy та неперекладені записи; заголовок
+    включається завжди (без поля POT-Creation-Date).
+    """
+    messages = []
+    if catalog.header is not None:
+        # msgfmt прибирає дату генерації шаблону для відтворюваних збірок
+        header = ''.join(
+            line for line in catalog.header.msgstr.splitlines(keepends=True)
+            if not line.startswith('POT-Creation-Date:')
+        )
+        messages.append((b'', header.encode('utf-8')))
+    for entry in catalog.entries:
+        if entry.fuzzy or not entry.translated:
+            continue
+        messages.append(_entry_messages(entry))
+    messages.sort(key=lambda item: item[0])
+    return messages
+
+
+def build_mo(messages: Iterable[Tuple[bytes, bytes]]) -> bytes:
+    """Збирає вміст .mo файлу з відсортованих пар (msgid, msgstr)"""
+    messages = list(messages)
+    count = len(messages)
+    hash_size = max(3, _next_prime(count * 4 // 3)) if count else 0
+
+    originals_offset = 7 * 4
+    translations_offset = originals_offset + count * 8
+    hash_offset = translations_offset + count * 8
+    strings_offset = hash_offset + hash_size * 4
+
+    originals = bytearray()
+    translations = bytearray()
+    original_table: List[int] = []
+    translation_table: List[int] = []
+
+    for msgid, _ in messages:
+        original_table += [len(msgid), strings_offset + len(originals)]
+        originals += msgid + b'\x00'
+
+    translations_start = strings_offset + len(originals)
+    for _, msgstr in messages:
+        translation_table += [len(msgstr), translations_start + len(translations)]
+        translations += msgstr + b'\x00'
+
+    hash_table = [0] * hash_size
+    for index, (msgid, _) in enumerate(messages):
+        hval = hashpjw(msgid.split(b'\x00', 1)[0])
+        slot = hval % hash_size
+        increment = 1 + (hval % (hash_size - 2))
+        while hash_table[slot]:
+            slot += increment
+            if slot >= hash_size:
+                slot -= hash_size
+        hash_table[slot] = index + 1
+
+    header = struct.pack(
+        '<7I', MO_MAGIC, 0, count, originals_offset, translations_offset, hash_size, hash_offset
+    )
+    return b''.join([
+        header,
+        struct.pack(f'<{count * 2}I', *original_table),
+        struct.pack(f'<{count * 2}I', *translation_table),
+        struct.pack(f'<{hash_size}I', *hash_table),
+        bytes(originals),
+        bytes(translations),
+    ])
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """SHA-256 вмісту файлу"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_atomic(path: Union[str, Path], data: bytes) -> None:
+    """Записує файл через тимчасовий файл, щоб сервер не прочитав його наполовину"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def compile_catalog(po_path: Union[str, Path], mo_path: Union[str, Path, None] = None) -> int:
+    """Компілює .po у .mo поруч (або за вказаним шляхом), повертає кількість рядків"""
+    po_path = Path(po_path)
+    mo_path = Path(mo_path) if mo_path is not None else po_path.with_suffix('.mo')
+    messages = compiled_messages(POCatalog.from_file(po_path))
+    write_atomic(mo_path, build_mo(messages))
+    return len(messages)
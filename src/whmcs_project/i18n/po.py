@@ -0,0 +1,376 @@
+"""
+Потоковий парсер та серіалізатор каталогів gettext (.po).
+
+Файл читається построково за один прохід, кожен запис збирається в
+структурований ``POEntry`` (msgctxt, msgid, msgid_plural, msgstr[n],
+прапорці, посилання, коментарі та позначка obsolete). Підтримуються
+багаторядкові рядки (``msgid ""`` + продовження) та множинні форми.
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Ширина рядка, з якою gettext (msgmerge/xgettext) форматує каталоги
+DEFAULT_WIDTH = 79
+
+_ESCAPES = {
+    '\\': '\\\\',
+    '"': '\\"',
+    '\n': '\\n',
+    '\t': '\\t',
+    '\r': '\\r',
+    '\a': '\\a',
+    '\b': '\\b',
+    '\f': '\\f',
+    '\v': '\\v',
+}
+_UNESCAPES = {value[1]: key for key, value in _ESCAPES.items()}
+_UNESCAPE_RE = re.compile(r'\\(?:([0-7]{1,3})|x([0-9a-fA-F]+)|(.))')
+_BREAK_RE = re.compile(r'(?<= )(?=[^ ?!)\]},.:;/])')
+_KEYWORD_RE = re.compile(r'^(msgctxt|msgid_plural|msgid|msgstr(?:\[(\d+)\])?)\s+"(.*)"\s*$')
+
+
+class POParseError(ValueError):
+    """Помилка синтаксису .po файлу"""
+
+    def __init__(self, message: str, lineno: int, path: Optional[Path] = None):
+        location = f"{path}:{lineno}" if path else f"line {lineno}"
+        super().__init__(f"{location}: {message}")
+        self.lineno = lineno
+        self.path = path
+
+
+def unescape(text: str) -> str:
+    """Розкодовує C-escape послідовності рядка .po"""
+    if '\\' not in text:
+        return text
+
+    def replace(match: 're.Match[str]') -> str:
+        octal, hexadecimal, char = match.groups()
+        if octal:
+            return chr(int(octal, 8))
+        if hexadecimal:
+            return chr(int(hexadecimal, 16))
+        return _UNESCAPES.get(char, char)
+
+    return _UNESCAPE_RE.sub(replace, text)
+
+
+def escape(text: str) -> str:
+    """Кодує рядок для запису в .po"""
+    return ''.join(_ESCAPES.get(char, char) for char in text)
+
+
+@dataclass
+class POEntry:
+    """Один запис каталогу перекладів"""
+
+    msgid: str = ''
+    msgstr: str = ''
+    msgid_plural: Optional[str] = None
+    msgstr_plural: Dict[int, str] = field(default_factory=dict)
+    msgctxt: Optional[str] = None
+    flags: List[str] = field(default_factory=list)
+    references: List[str] = field(default_factory=list)
+    comments: List[str] = field(default_factory=list)
+    extracted_comments: List[str] = field(default_factory=list)
+    previous: List[str] = field(default_factory=list)
+    obsolete: bool = False
+    lineno: int = 0
+
+    @property
+    def key(self) -> Tuple[Optional[str], str]:
+        """Ключ запису в каталозі: (msgctxt, msgid)"""
+        return self.msgctxt, self.msgid
+
+    @property
+    def is_header(self) -> bool:
+        return self.msgid == '' and self.msgctxt is None
+
+    @property
+    def is_plural(self) -> bool:
+        return self.msgid_plural is not None
+
+    @property
+    def fuzzy(self) -> bool:
+        return 'fuzzy' in self.flags
+
+    @property
+    def translated(self) -> bool:
+        """Чи заповнені всі форми перекладу (без урахування fuzzy)"""
+        if self.is_plural:
+            return bool(self.msgstr_plural) and all(self.msgstr_plural.values())
+        return bool(self.msgstr)
+
+    def set_fuzzy(self, value: bool) -> None:
+        if value and not self.fuzzy:
+            self.flags.insert(0, 'fuzzy')
+        elif not value and self.fuzzy:
+            self.flags.remove('fuzzy')
+
+
+class _EntryBuilder:
+    """Накопичує рядки одного запису під час потокового розбору"""
+
+    def __init__(self) -> None:
+        self.entry = POEntry()
+        self.field: Optional[Tuple[str, Optional[int]]] = None
+        self.has_keywords = False
+        self.has_msgstr = False
+
+    def start(self, keyword: str, index: Optional[int], value: str, lineno: int) -> None:
+        if not self.has_keywords:
+            self.entry.lineno = lineno
+        self.has_keywords = True
+        self.field = (keyword, index)
+        if keyword == 'msgstr':
+            self.has_msgstr = True
+            if index is None:
+                self.entry.msgstr = value
+            else:
+                self.entry.msgstr_plural[index] = value
+        else:
+            setattr(self.entry, keyword, value)
+
+    def append(self, value: str) -> bool:
+        if self.field is None:
+            return False
+        keyword, index = self.field
+        entry = self.entry
+        if keyword == 'msgstr' and index is not None:
+            entry.msgstr_plural[index] += value
+        else:
+            setattr(entry, keyword, getattr(entry, keyword) + value)
+        return True
+
+
+def iter_entries(lines: Iterable[str], path: Optional[Path] = None) -> Iterator[POEntry]:
+    """Потоково розбирає рядки .po файлу і повертає записи по одному"""
+    builder = _EntryBuilder()
+
+    for lineno, raw_line in enumerate(lines, start=1):
+        line = raw_line.strip()
+
+        if not line:
+            if builder.has_keywords:
+                yield builder.entry
+                builder = _EntryBuilder()
+            continue
+
+        obsolete = line.startswith('#~')
+        if obsolete:
+            line = line[2:].lstrip()
+            if not line:
+                continue
+
+        if line.startswith('#'):
+            # Коментар після msgstr починає новий запис
+            if builder.has_msgstr:
+                yield builder.entry
+                builder = _EntryBuilder()
+            _parse_comment(builder.entry, line)
+            continue
+
+        if obsolete:
+            builder.entry.obsolete = True
+            if line.startswith('|'):
+                builder.entry.previous.append(line[1:].strip())
+                continue
+
+        if line.startswith('"'):
+            if not line.endswith('"') or len(line) < 2:
+                raise POParseError('unterminated string', lineno, path)
+            if not builder.append(unescape(line[1:-1])):
+                raise POParseError('string continuation without keyword', lineno, path)
+            continue
+
+        match = _KEYWORD_RE.match(line)
+        if not match:
+            raise POParseError(f'unexpected line: {line[:40]!r}', lineno, path)
+
+        keyword, index, value = match.group(1), match.group(2), unescape(match.group(3))
+        if keyword.startswith('msgstr'):
+            keyword = 'msgstr'
+        elif builder.has_msgstr and keyword in ('msgctxt', 'msgid'):
+            # Новий запис без порожнього рядка-розділювача
+            yield builder.entry
+            builder = _EntryBuilder()
+            builder.entry.obsolete = obsolete
+
+        builder.start(keyword, int(index) if index is not None else None, value, lineno)
+
+    if builder.has_keywords:
+        yield builder.entry
+
+
+def _parse_comment(entry: POEntry, line: str) -> None:
+    marker = line[1:2]
+    text = line[2:].strip() if marker in (',', ':', '.', '|') else line[1:]
+    if marker == ',':
+        entry.flags.extend(flag.strip() for flag in text.split(',') if flag.strip())
+    elif marker == ':':
+        entry.references.extend(text.split())
+    elif marker == '.':
+        entry.extracted_comments.append(text)
+    elif marker == '|':
+        entry.previous.append(text)
+    else:
+        entry.comments.append(text[1:] if text.startswith(' ') else text)
+
+
+class POCatalog:
+    """Каталог перекладів, зібраний за один прохід по файлу"""
+
+    def __init__(self, entries: Optional[Iterable[POEntry]] = None, path: Optional[Path] = None):
+        self.path = path
+        self.header: Optional[POEntry] = None
+        self.entries: List[POEntry] = []
+        self.obsolete: List[POEntry] = []
+        self._index: Dict[Tuple[Optional[str], str], POEntry] = {}
+        for entry in entries or ():
+            self.add(entry)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> 'POCatalog':
+        path = Path(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(iter_entries(f, path), path=path)
+
+    def add(self, entry: POEntry) -> None:
+        if entry.obsolete:
+            self.obsolete.append(entry)
+        elif entry.is_header and self.header is None:
+            self.header = entry
+        else:
+            self.entries.append(entry)
+            self._index[entry.key] = entry
+
+    def get(self, msgid: str, msgctxt: Optional[str] = None) -> Optional[POEntry]:
+        return self._index.get((msgctxt, msgid))
+
+    def __iter__(self) -> Iterator[POEntry]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Tuple[Optional[str], str]) -> bool:
+        return key in self._index
+
+    @property
+    def metadata(self) -> Dict[str, str]:
+        """Поля заголовку (Language, Plural-Forms тощо)"""
+        if self.header is None:
+            return {}
+        result = {}
+        for line in self.header.msgstr.splitlines():
+            name, sep, value = line.partition(':')
+            if sep:
+                result[name.strip()] = value.strip()
+        return result
+
+    def untranslated(self) -> List[POEntry]:
+        return [entry for entry in self.entries if not entry.translated and not entry.fuzzy]
+
+    def fuzzy_entries(self) -> List[POEntry]:
+        return [entry for entry in self.entries if entry.fuzzy]
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика перекладів каталогу"""
+        translated = fuzzy = plural = 0
+        for entry in self.entries:
+            if entry.is_plural:
+                plural += 1
+            if entry.fuzzy:
+                fuzzy += 1
+            elif entry.translated:
+                translated += 1
+
+        total = len(self.entries)
+        return {
+            'total': total,
+            'translated': translated,
+            'empty': total - translated - fuzzy,
+            'fuzzy': fuzzy,
+            'plural': plural,
+            'obsolete': len(self.obsolete),
+        }
+
+    def save(self, path: Optional[Union[str, Path]] = None, width: int = DEFAULT_WIDTH) -> None:
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            raise ValueError('Catalog path is not set')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.serialize(width))
+
+    def serialize(self, width: int = DEFAULT_WIDTH) -> str:
+        entries = ([self.header] if self.header is not None else []) + self.entries + self.obsolete
+        return '\n'.join(format_entry(entry, width) for entry in entries)
+
+
+def parse_po(path: Union[str, Path]) -> POCatalog:
+    """Читає .po файл у ``POCatalog``"""
+    return POCatalog.from_file(path)
+
+
+def _split_line(text: str, width: int) -> List[str]:
+    """Розбиває екранований рядок на частини не довші за ``width`` по пробілах
+
+    Як і gettext, не переносить рядок перед закриваючими дужками та
+    розділовими знаками (правила UAX #14 для класів CL/CP/EX/IS/SY).
+    """
+    if len(text) <= width:
+        return [text]
+
+    chunks: List[str] = []
+    current = ''
+    for word in _BREAK_RE.split(text):
+        if current and len(current) + len(word) > width:
+            chunks.append(current)
+            current = word
+        else:
+            current += word
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _format_string(keyword: str, text: str, width: int) -> List[str]:
+    escaped = escape(text)
+    parts = [part for part in re.split(r'(?<=\\n)', escaped) if part]
+
+    if len(parts) <= 1 and len(keyword) + len(escaped) + 3 <= width:
+        return [f'{keyword} "{escaped}"']
+
+    lines = [f'{keyword} ""']
+    for part in parts:
+        lines.extend(f'"{chunk}"' for chunk in _split_line(part, width - 2))
+    return lines
+
+
+def format_entry(entry: POEntry, width: int = DEFAULT_WIDTH) -> str:
+    """Форматує запис у вигляді, сумісному з gettext"""
+    lines: List[str] = []
+    lines.extend(f'# {comment}' if comment else '#' for comment in entry.comments)
+    lines.extend(f'#. {comment}' for comment in entry.extracted_comments)
+    lines.extend(f'#: {reference}' for reference in entry.references)
+    if entry.flags:
+        lines.append('#, ' + ', '.join(entry.flags))
+
+    body: List[str] = [f'#| {previous}' for previous in entry.previous]
+    if entry.msgctxt is not None:
+        body.extend(_format_string('msgctxt', entry.msgctxt, width))
+    body.extend(_format_string('msgid', entry.msgid, width))
+    if entry.is_plural:
+        body.extend(_format_string('msgid_plural', entry.msgid_plural, width))
+        for index in sorted(entry.msgstr_plural):
+            body.extend(_format_string(f'msgstr[{index}]', entry.msgstr_plural[index], width))
+    else:
+        body.extend(_format_string('msgstr', entry.msgstr, width))
+
+    if entry.obsolete:
+        body = [f'#~ {line}' if not line.startswith('#|') else f'#~{line[1:]}' for line in body]
+
+    return '\n'.join(lines + body) + '\n'
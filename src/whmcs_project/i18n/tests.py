@@ -0,0 +1,435 @@
+import gettext
+import importlib.util
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+
+from .extract import (EXTRACTOR_VERSION, ExtractedMessage, ExtractionCache, build_template_catalog, extract_python,
+                      extract_source, extract_template, merge_catalog)
+from .mo import build_mo, compile_catalog, compiled_messages, hashpjw
+from .po import POCatalog, POParseError, iter_entries
+
+LOCALE_DIR = Path(__file__).resolve().parent.parent.parent / 'locale'
+PROJECT_ROOT = LOCALE_DIR.parent.parent
+
+SAMPLE_PO = '''\
+# Ukrainian translation.
+msgid ""
+msgstr ""
+"Language: uk\\n"
+"Content-Type: text/plain; charset=UTF-8\\n"
+"Plural-Forms: nplurals=3; plural=(n%10==1 && n%100!=11 ? 0 : n%10>=2 && "
+"n%10<=4 && (n%100<10 || n%100>=20) ? 1 : 2);\\n"
+
+#. Translators: dashboard heading
+#: admin_panel/templates/admin_panel/dashboard.html:5
+#: admin_panel/views.py:40
+msgid "Dashboard"
+msgstr "Панель"
+
+#: admin_panel/views.py:52
+msgid ""
+"A long message that gettext wraps over several lines because it does not fit "
+"into the line width"
+msgstr ""
+"Довге повідомлення, яке gettext переносить на кілька рядків, бо воно не "
+"вміщується в ширину рядка"
+
+#: admin_panel/views.py:60
+#, python-format
+msgid "%(count)s client"
+msgid_plural "%(count)s clients"
+msgstr[0] "%(count)s клієнт"
+msgstr[1] "%(count)s клієнти"
+msgstr[2] "%(count)s клієнтів"
+
+#: admin_panel/templates/admin_panel/base.html:20
+msgctxt "navigation"
+msgid "Home"
+msgstr "Головна"
+
+#: admin_panel/views.py:70
+#, fuzzy, python-format
+msgid "Welcome, %s"
+msgstr "Вітаємо, %s"
+
+msgid "Line\\tbreak \\"quoted\\"\\n"
+msgstr ""
+
+#~ msgid "Removed"
+#~ msgstr "Видалено"
+'''
+
+
+class POCatalogTests(SimpleTestCase):
+    def setUp(self):
+        self.catalog = POCatalog(iter_entries(SAMPLE_PO.splitlines(keepends=True)))
+
+    def test_round_trip_committed_catalogs(self):
+        for po_file in sorted(LOCALE_DIR.glob('*/LC_MESSAGES/django.po')):
+            with self.subTest(po_file=po_file.parent.parent.name):
+                self.assertEqual(POCatalog.from_file(po_file).serialize(), po_file.read_text(encoding='utf-8'))
+
+    def test_round_trip_sample(self):
+        self.assertEqual(self.catalog.serialize(), SAMPLE_PO)
+
+    def test_header(self):
+        self.assertTrue(self.catalog.header.is_header)
+        self.assertEqual(self.catalog.header.comments, ['Ukrainian translation.'])
+        self.assertEqual(self.catalog.metadata['Language'], 'uk')
+        self.assertTrue(self.catalog.metadata['Plural-Forms'].startswith('nplurals=3;'))
+
+    def test_multiline_continuation(self):
+        entry = self.catalog.entries[1]
+        self.assertEqual(entry.msgid, 'A long message that gettext wraps over several lines because it does not '
+                                      'fit into the line width')
+        self.assertTrue(entry.msgstr.endswith('не вміщується в ширину рядка'))
+        self.assertEqual(entry.lineno, 16)
+
+    def test_references_comments_and_flags(self):
+        entry = self.catalog.get('Dashboard')
+        self.assertEqual(entry.references, ['admin_panel/templates/admin_panel/dashboard.html:5',
+                                            'admin_panel/views.py:40'])
+        self.assertEqual(entry.extracted_comments, ['Translators: dashboard heading'])
+
+        entry = self.catalog.get('Welcome, %s')
+        self.assertEqual(entry.flags, ['fuzzy', 'python-format'])
+        self.assertTrue(entry.fuzzy)
+        entry.set_fuzzy(False)
+        self.assertEqual(entry.flags, ['python-format'])
+
+    def test_plural(self):
+        entry = self.catalog.get('%(count)s client')
+        self.assertTrue(entry.is_plural)
+        self.assertEqual(entry.msgid_plural, '%(count)s clients')
+        self.assertEqual(entry.msgstr_plural, {0: '%(count)s клієнт', 1: '%(count)s клієнти',
+                                               2: '%(count)s клієнтів'})
+        self.assertTrue(entry.translated)
+        entry.msgstr_plural[2] = ''
+        self.assertFalse(entry.translated)
+
+    def test_context(self):
+        self.assertIsNone(self.catalog.get('Home'))
+        entry = self.catalog.get('Home', msgctxt='navigation')
+        self.assertEqual(entry.msgstr, 'Головна')
+        self.assertIn(('navigation', 'Home'), self.catalog)
+
+    def test_escapes(self):
+        self.assertIsNotNone(self.catalog.get('Line\tbreak "quoted"\n'))
+
+    def test_obsolete(self):
+        self.assertEqual(len(self.catalog.obsolete), 1)
+        entry = self.catalog.obsolete[0]
+        self.assertTrue(entry.obsolete)
+        self.assertEqual((entry.msgid, entry.msgstr), ('Removed', 'Видалено'))
+        self.assertIsNone(self.catalog.get('Removed'))
+
+    def test_stats(self):
+        self.assertEqual(len(self.catalog), 6)
+        self.assertEqual(self.catalog.stats(), {
+            'total': 6, 'translated': 4, 'empty': 1, 'fuzzy': 1, 'plural': 1, 'obsolete': 1,
+        })
+        self.assertEqual([entry.msgid for entry in self.catalog.untranslated()], ['Line\tbreak "quoted"\n'])
+        self.assertEqual([entry.msgid for entry in self.catalog.fuzzy_entries()], ['Welcome, %s'])
+
+    def test_entries_without_blank_line(self):
+        catalog = POCatalog(iter_entries(['msgid "One"\n', 'msgstr "Один"\n', 'msgid "Two"\n', 'msgstr "Два"\n']))
+        self.assertEqual([(entry.msgid, entry.msgstr) for entry in catalog], [('One', 'Один'), ('Two', 'Два')])
+
+    def test_syntax_errors(self):
+        for lines in (['msgid "Unterminated\n'], ['"continuation"\n'], ['msgfoo "x"\n']):
+            with self.subTest(lines=lines), self.assertRaises(POParseError) as context:
+                list(iter_entries(lines))
+            self.assertEqual(context.exception.lineno, 1)
+
+
+class MOCompilerTests(SimpleTestCase):
+    def translations(self, po_text):
+        catalog = POCatalog(iter_entries(po_text.splitlines(keepends=True)))
+        return gettext.GNUTranslations(io.BytesIO(build_mo(compiled_messages(catalog))))
+
+    def test_gnu_translations_reads_output(self):
+        translations = self.translations(SAMPLE_PO)
+        self.assertEqual(translations.gettext('Dashboard'), 'Панель')
+        self.assertEqual(translations.gettext('A long message that gettext wraps over several lines because it '
+                                              'does not fit into the line width'),
+                         'Довге повідомлення, яке gettext переносить на кілька рядків, бо воно не вміщується в '
+                         'ширину рядка')
+        for count, expected in ((1, 'клієнт'), (3, 'клієнти'), (5, 'клієнтів'), (21, 'клієнт')):
+            self.assertEqual(translations.ngettext('%(count)s client', '%(count)s clients', count),
+                             f'%(count)s {expected}')
+        self.assertEqual(translations.pgettext('navigation', 'Home'), 'Головна')
+        self.assertEqual(translations.gettext('Home'), 'Home')
+        # fuzzy, неперекладені та obsolete записи в .mo не потрапляють
+        self.assertEqual(translations.gettext('Welcome, %s'), 'Welcome, %s')
+        self.assertEqual(translations.gettext('Removed'), 'Removed')
+
+    def test_hash_table_lookup(self):
+        # Багато записів - хеш-таблиця з колізіями; glibc шукає рядки саме в ній
+        messages = sorted((f'message {index}'.encode(), f'повідомлення {index}'.encode()) for index in range(500))
+        data = build_mo(messages)
+        hash_size, hash_offset = int.from_bytes(data[20:24], 'little'), int.from_bytes(data[24:28], 'little')
+        self.assertGreater(hash_size, len(messages))
+        table = [int.from_bytes(data[hash_offset + slot * 4:hash_offset + slot * 4 + 4], 'little')
+                 for slot in range(hash_size)]
+        for index, (msgid, _msgstr) in enumerate(messages):
+            hval = hashpjw(msgid)
+            slot, increment = hval % hash_size, 1 + hval % (hash_size - 2)
+            while table[slot] != index + 1:
+                self.assertNotEqual(table[slot], 0, msgid)
+                slot = (slot + increment) % hash_size
+
+    def test_hashpjw(self):
+        self.assertEqual(hashpjw(b''), 0)
+        self.assertEqual(hashpjw(b'a'), 0x61)
+        self.assertEqual(hashpjw(b'ab'), (0x61 << 4) + 0x62)
+        # Старші 4 біти згортаються в молодші, результат лишається 32-бітним
+        self.assertLess(hashpjw(b'\xff' * 64), 1 << 28)
+
+    def test_committed_catalogs_are_current(self):
+        # .mo з репозиторію зібрані msgfmt, компілятор має давати ті самі байти
+        for po_file in sorted(LOCALE_DIR.glob('*/LC_MESSAGES/django.po')):
+            with self.subTest(po_file=po_file.parent.parent.name):
+                expected = po_file.with_suffix('.mo').read_bytes()
+                self.assertEqual(build_mo(compiled_messages(POCatalog.from_file(po_file))), expected)
+
+    @skipUnless(shutil.which('msgfmt'), 'msgfmt is not installed')
+    def test_matches_msgfmt(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for po_file in sorted(LOCALE_DIR.glob('*/LC_MESSAGES/django.po')):
+                with self.subTest(po_file=po_file.parent.parent.name):
+                    expected, actual = Path(temp_dir) / 'msgfmt.mo', Path(temp_dir) / 'compiled.mo'
+                    subprocess.run(['msgfmt', '-o', str(expected), str(po_file)], check=True)
+                    compile_catalog(po_file, actual)
+                    self.assertEqual(actual.read_bytes(), expected.read_bytes())
+
+
+class CompileStateTests(SimpleTestCase):
+    """Пропуск незмінених каталогів у dev_tools/translations.py compile"""
+
+    def setUp(self):
+        spec = importlib.util.spec_from_file_location('translations', PROJECT_ROOT / 'dev_tools' / 'translations.py')
+        self.module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.manager = self.module.TranslationManager()
+        self.manager.LOCALE_DIR = Path(temp_dir.name) / 'locale'
+        self.manager.CACHE_DIR = Path(temp_dir.name) / '.cache'
+        shutil.copytree(LOCALE_DIR, self.manager.LOCALE_DIR, ignore=shutil.ignore_patterns('*.mo'))
+
+    def compile(self):
+        with mock.patch.object(self.module, 'compile_catalog', wraps=compile_catalog) as compiled, \
+                redirect_stdout(io.StringIO()):
+            self.assertTrue(self.manager.compile_translations(['uk']))
+        return [call.args[0] for call in compiled.call_args_list]
+
+    def test_skips_unchanged_catalogs(self):
+        po_file = self.manager.get_po_file('uk')
+        self.assertEqual(self.compile(), [po_file])
+        self.assertEqual(po_file.with_suffix('.mo').read_bytes(),
+                         (LOCALE_DIR / 'uk' / 'LC_MESSAGES' / 'django.mo').read_bytes())
+        self.assertEqual(self.compile(), [])
+
+        # Той самий вміст з новим mtime - без перекомпіляції
+        po_file.write_bytes(po_file.read_bytes())
+        self.assertEqual(self.compile(), [])
+
+        po_file.write_text(po_file.read_text(encoding='utf-8').replace('msgstr "Усі"', 'msgstr "Всі"'),
+                           encoding='utf-8')
+        self.assertEqual(self.compile(), [po_file])
+        translations = gettext.GNUTranslations(io.BytesIO(po_file.with_suffix('.mo').read_bytes()))
+        self.assertEqual(translations.gettext('All'), 'Всі')
+
+        # Змінений або видалений .mo компілюється заново
+        po_file.with_suffix('.mo').unlink()
+        self.assertEqual(self.compile(), [po_file])
+
+    def test_update_leaves_committed_catalogs_unchanged(self):
+        # Рядки-фікстури з тестів не повинні потрапляти в каталоги
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(self.manager.update_translations(use_cache=False))
+        for lang in self.manager.SUPPORTED_LANGUAGES:
+            for name in ('django.po', 'django.mo'):
+                with self.subTest(lang=lang, file=name):
+                    self.assertEqual((self.manager.LOCALE_DIR / lang / 'LC_MESSAGES' / name).read_bytes(),
+                                     (LOCALE_DIR / lang / 'LC_MESSAGES' / name).read_bytes())
+
+
+class ExtractTests(SimpleTestCase):
+    TEMPLATE = '''{% load i18n %}
+<h1>{% trans "Clients" %}</h1>
+{% trans "Open" context "ticket status" %}
+{# Translators: shown above the invoice list #}
+{% blocktrans trimmed count counter=invoices|length %}
+  {{ counter }} invoice
+{% plural %}
+  {{ counter }} invoices
+{% endblocktrans %}
+{% blocktrans context "greeting" with name=user.first_name %}Hello, {{ name }}! 100%{% endblocktrans %}
+{{ _("Search") }}
+'''
+
+    PYTHON = '''from django.utils.translation import gettext as _, gettext_lazy, ngettext, pgettext
+
+TITLE = gettext_lazy('Dashboard')
+
+
+def view(count, name):
+    # Translators: flash message after saving
+    message = _('Saved %(name)s') % {'name': name}
+    label = ngettext('%(count)s service', '%(count)s services', count)
+    status = pgettext('invoice status', 'Open')
+    ignored = _(name)
+    return message, label, status, ignored
+'''
+
+    def test_template(self):
+        messages = extract_template(self.TEMPLATE, 'admin_panel/templates/sample.html')
+        self.assertEqual(
+            [(message.msgctxt, message.msgid, message.msgid_plural, message.reference) for message in messages], [
+                (None, 'Clients', None, 'admin_panel/templates/sample.html:2'),
+                ('ticket status', 'Open', None, 'admin_panel/templates/sample.html:3'),
+                (None, '%(counter)s invoice', '%(counter)s invoices', 'admin_panel/templates/sample.html:5'),
+                ('greeting', 'Hello, %(name)s! 100%%', None, 'admin_panel/templates/sample.html:10'),
+                (None, 'Search', None, 'admin_panel/templates/sample.html:11'),
+            ])
+        self.assertEqual(messages[2].comments, ['Translators: shown above the invoice list'])
+        self.assertEqual(messages[2].flags, ['python-format'])
+        self.assertEqual(messages[0].flags, [])
+
+    def test_template_rejects_nested_blocks(self):
+        with self.assertRaises(SyntaxError):
+            extract_template('{% load i18n %}{% blocktrans %}{% if x %}{% endif %}{% endblocktrans %}', 'bad.html')
+
+    def test_python(self):
+        messages = extract_python(self.PYTHON, 'admin_panel/sample.py')
+        self.assertEqual(
+            [(message.msgctxt, message.msgid, message.msgid_plural, message.reference) for message in messages], [
+                (None, 'Dashboard', None, 'admin_panel/sample.py:3'),
+                (None, 'Saved %(name)s', None, 'admin_panel/sample.py:8'),
+                (None, '%(count)s service', '%(count)s services', 'admin_panel/sample.py:9'),
+                ('invoice status', 'Open', None, 'admin_panel/sample.py:10'),
+            ])
+        self.assertEqual(messages[1].comments, ['Translators: flash message after saving'])
+        self.assertEqual(extract_python('def broken(:\n', 'broken.py'), [])
+
+    def test_template_catalog(self):
+        messages = (extract_template(self.TEMPLATE, 'sample.html') + extract_python(self.PYTHON, 'sample.py')
+                    + extract_python("_('Clients')\n", 'other.py'))
+        catalog = build_template_catalog(messages)
+        self.assertEqual(catalog.get('Clients').references, ['sample.html:2', 'other.py:1'])
+        # Однаковий msgid з різним контекстом - окремі записи
+        self.assertEqual(catalog.get('Open', 'ticket status').references, ['sample.html:3'])
+        self.assertEqual(catalog.get('Open', 'invoice status').references, ['sample.py:10'])
+        self.assertEqual(catalog.get('Saved %(name)s').flags, ['python-format'])
+        self.assertIsNone(catalog.header)
+
+    def test_merge(self):
+        catalog = POCatalog(iter_entries(SAMPLE_PO.splitlines(keepends=True)))
+        template = build_template_catalog([
+            ExtractedMessage(msgid='Dashboard', reference='admin_panel/views.py:41'),
+            ExtractedMessage(msgid='%(count)s client', msgid_plural='%(count)s clients',
+                             reference='admin_panel/views.py:61'),
+            ExtractedMessage(msgid='Home', msgctxt='navigation', reference='base.html:21'),
+            ExtractedMessage(msgid='Welcome, %s', reference='admin_panel/views.py:71'),
+            ExtractedMessage(msgid='New message', reference='admin_panel/views.py:80'),
+            ExtractedMessage(msgid='%(count)s invoice', msgid_plural='%(count)s invoices',
+                             reference='admin_panel/views.py:90'),
+            ExtractedMessage(msgid='Removed', reference='admin_panel/views.py:95'),
+        ])
+        merged = merge_catalog(catalog, template)
+
+        self.assertIs(merged.header, catalog.header)
+        self.assertEqual([entry.msgid for entry in merged][:3], ['Dashboard', '%(count)s client', 'Home'])
+        dashboard = merged.get('Dashboard')
+        self.assertEqual((dashboard.msgstr, dashboard.references), ('Панель', ['admin_panel/views.py:41']))
+        self.assertEqual(merged.get('%(count)s client').msgstr_plural[2], '%(count)s клієнтів')
+        self.assertEqual(merged.get('Home', 'navigation').msgstr, 'Головна')
+        self.assertTrue(merged.get('Welcome, %s').fuzzy)
+
+        new = merged.get('New message')
+        self.assertEqual((new.msgstr, new.references), ('', ['admin_panel/views.py:80']))
+        self.assertEqual(merged.get('%(count)s invoice').msgstr_plural, {0: '', 1: '', 2: ''})
+        # Obsolete запис, що знову з'явився в джерелах, відновлюється з перекладом
+        self.assertEqual(merged.get('Removed').msgstr, 'Видалено')
+
+        obsolete = {entry.msgid: entry for entry in merged.obsolete}
+        self.assertEqual(set(obsolete), {'A long message that gettext wraps over several lines because it does not '
+                                         'fit into the line width', 'Line\tbreak "quoted"\n'})
+        self.assertTrue(all(entry.obsolete and not entry.references for entry in obsolete.values()))
+
+        # Повторне злиття з тим самим шаблоном нічого не змінює
+        self.assertEqual(merge_catalog(merged, template).serialize(), merged.serialize())
+
+
+class ExtractionCacheTests(SimpleTestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name) / 'src'
+        self.root.mkdir()
+        self.source = self.root / 'views.py'
+        self.source.write_text("_('Clients')\n", encoding='utf-8')
+        self.cache_path = Path(temp_dir.name) / 'cache' / 'extract.sqlite3'
+        self.cache = ExtractionCache(self.cache_path)
+        self.addCleanup(lambda: self.cache.close())
+
+    def extract(self, path=None):
+        with mock.patch('whmcs_project.i18n.extract.extract_source', wraps=extract_source) as parsed:
+            messages = self.cache.extract(path or self.source, self.root)
+        return [message.msgid for message in messages], parsed.call_count
+
+    def test_unchanged_file_is_a_hit(self):
+        self.assertEqual(self.extract(), (['Clients'], 1))
+        self.assertEqual(self.extract(), (['Clients'], 0))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        # Кеш переживає перезапуск
+        self.cache.close()
+        self.cache = ExtractionCache(self.cache_path)
+        self.assertEqual(self.extract(), (['Clients'], 0))
+
+    def test_touched_file_is_not_parsed(self):
+        self.extract()
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.extract(), (['Clients'], 0))
+        self.assertEqual(self.cache.hits, 1)
+        # Новий mtime збережено - наступний виклик не читає файл
+        with mock.patch.object(Path, 'read_bytes', side_effect=AssertionError('file was read')):
+            self.assertEqual(self.extract(), (['Clients'], 0))
+
+    def test_changed_content_is_a_miss(self):
+        self.extract()
+        stat = self.source.stat()
+        self.source.write_text("_('Invoices')\n", encoding='utf-8')
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.extract(), (['Invoices'], 1))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_prune_deleted_files(self):
+        other = self.root / 'other.py'
+        other.write_text("_('Services')\n", encoding='utf-8')
+        self.extract()
+        self.extract(other)
+        other.unlink()
+        self.assertEqual(self.cache.prune([self.source], self.root), 1)
+        self.assertEqual(self.cache.prune([self.source], self.root), 0)
+        rows = self.cache.connection.execute('SELECT path FROM files').fetchall()
+        self.assertEqual(rows, [('views.py',)])
+
+    def test_extractor_version_resets_cache(self):
+        self.extract()
+        self.cache.close()
+        with mock.patch('whmcs_project.i18n.extract.EXTRACTOR_VERSION', EXTRACTOR_VERSION + 1):
+            self.cache = ExtractionCache(self.cache_path)
+        self.assertEqual(self.extract(), (['Clients'], 1))
@@ -0,0 +1,116 @@
+"""
+Час імпорту модулів під час старту воркера (``python -X importtime``).
+
+``measure()`` запускає окремий інтерпретатор з тими ж налаштуваннями,
+виконує сценарій старту (``TARGETS``) і розбирає рядки, які Python пише
+в stderr:
+
+    import time: self [us] | cumulative | imported package
+    import time:       543 |       9011 |   dev_dashboard.views
+
+Відступ імені - глибина вкладеності (2 пробіли на рівень), ``self`` -
+час самого модуля, ``cumulative`` - разом з модулями, які він
+імпортував уперше. Сума ``cumulative`` модулів верхнього рівня - весь
+час імпорту. Звіт: ``manage.py importtime``.
+
+Модулі, завантажені через ``importlib.import_module`` (застосунки з
+INSTALLED_APPS, їхні models, ``include()`` в URLconf), Python не
+вимірює: їхній власний час додається до найближчого виміряного предка
+(зазвичай ``whmcs_project.asgi``). Повний список завантажених модулів -
+``ImportReport.loaded`` (вміст ``sys.modules`` після старту).
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from django.conf import settings
+
+# Сценарії старту: worker - те, що робить воркер gunicorn до першої відповіді
+TARGETS = {
+    'setup': 'import django; django.setup()',
+    'asgi': 'import whmcs_project.asgi',
+    'wsgi': 'import whmcs_project.wsgi',
+    'worker': 'import whmcs_project.asgi; from django.urls import get_resolver; get_resolver().url_patterns',
+}
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)\s*$')
+
+
+class ImportTimeError(Exception):
+    pass
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    target: str
+    records: List[ImportRecord]
+    wall_seconds: float
+    # Усі модулі в sys.modules після старту, разом з невиміряними
+    loaded: Set[str] = field(default_factory=set)
+
+    @property
+    def total_us(self) -> int:
+        return sum(record.cumulative_us for record in self.records if record.depth == 0)
+
+    def slowest(self, limit: int = 20, cumulative: bool = True) -> List[ImportRecord]:
+        key = (lambda record: record.cumulative_us) if cumulative else (lambda record: record.self_us)
+        return sorted(self.records, key=key, reverse=True)[:limit]
+
+    def by_group(self, prefixes: Sequence[str] = ()) -> Dict[str, int]:
+        """Власний час, згрупований за найдовшим з prefixes (застосунки Django)
+        або за пакетом верхнього рівня; {група: мкс}, найповільніші першими"""
+        ordered = sorted(prefixes, key=len, reverse=True)
+        groups: Dict[str, int] = defaultdict(int)
+        for record in self.records:
+            group = next((prefix for prefix in ordered
+                          if record.module == prefix or record.module.startswith(prefix + '.')),
+                         record.module.split('.', 1)[0])
+            groups[group] += record.self_us
+        return dict(sorted(groups.items(), key=lambda item: item[1], reverse=True))
+
+
+def parse(lines: Iterable[str]) -> List[ImportRecord]:
+    """Записи з виводу -X importtime (інші рядки stderr пропускаються)"""
+    records = []
+    for line in lines:
+        match = _LINE_RE.match(line)
+        if match:
+            records.append(ImportRecord(
+                module=match[4], self_us=int(match[1]), cumulative_us=int(match[2]),
+                depth=(len(match[3]) - 1) // 2,
+            ))
+    return records
+
+
+def measure(target: str = 'worker', env: Optional[Dict[str, str]] = None) -> ImportReport:
+    """Запускає сценарій target у новому інтерпретаторі з -X importtime"""
+    if target not in TARGETS:
+        raise ImportTimeError(f'Unknown target {target!r}, expected one of: {", ".join(TARGETS)}')
+    child_env = {**os.environ, **(env or {})}
+    child_env.setdefault('DJANGO_SETTINGS_MODULE', 'whmcs_project.settings')
+    code = f"{TARGETS[target]}\nimport sys\nprint('\\n'.join(sorted(sys.modules)))"
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=str(settings.BASE_DIR), env=child_env, capture_output=True, text=True,
+    )
+    wall_seconds = time.perf_counter() - started
+    if result.returncode != 0:
+        tail = '\n'.join(line for line in result.stderr.splitlines() if not _LINE_RE.match(line))[-2000:]
+        raise ImportTimeError(f'{target} failed with exit code {result.returncode}:\n{tail}')
+    return ImportReport(target=target, records=parse(result.stderr.splitlines()), wall_seconds=wall_seconds,
+                        loaded=set(result.stdout.split()))
@@ -0,0 +1,43 @@
+"""
+Відкладене завантаження важких і debug-модулів.
+
+URLconf завантажується при першому запиті воркера, і звичайний
+``from . import views`` тягне за собою весь модуль views з його
+залежностями, навіть якщо жодна з цих сторінок так і не буде відкрита.
+``lazy_view`` реєструє маршрут за шляхом до функції, а сам модуль
+імпортується при першому запиті до нього.
+
+Так підключені dev dashboard і мають підключатися майбутні звіти та
+генерація PDF. Атрибути, які middleware читає з view до виклику
+(``csrf_exempt`` тощо), треба ставити на сам ``lazy_view(...)``.
+"""
+
+
+from django.utils.module_loading import import_string
+
+
+def _resolve(wrapper):
+    view = wrapper.__dict__.get('_view')
+    if view is None:
+        view = wrapper._view = import_string(wrapper.lazy_path)
+    return view
+
+
+def lazy_view(path: str, is_async: bool = False):
+    """View за шляхом ``'app.views.name'``, що імпортується при першому виклику
+
+    ``is_async=True`` для ``async def`` view: Django має знати тип view
+    ще до імпорту модуля.
+    """
+    if is_async:
+        async def wrapper(request, *args, **kwargs):
+            return await _resolve(wrapper)(request, *args, **kwargs)
+    else:
+        def wrapper(request, *args, **kwargs):
+            return _resolve(wrapper)(request, *args, **kwargs)
+
+    module, _, name = path.rpartition('.')
+    # Ім'я та модуль як у справжньої view: lookup_str, профілювання, dev dashboard
+    wrapper.__module__, wrapper.__name__, wrapper.__qualname__ = module, name, name
+    wrapper.lazy_path = path
+    return wrapper
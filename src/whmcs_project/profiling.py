@@ -0,0 +1,293 @@
+"""
+Профілювання запитів.
+
+``ProfilingMiddleware`` для кожного (вибраного семплінгом) запиту
+записує загальний час, CPU час, кількість та сумарний час SQL запитів і
+час рендерингу шаблонів у кільцевий буфер воркера. Лічильники запиту
+живуть у ContextVar, тому SQL з потоків ``sync_to_async`` в async views
+теж враховується.
+
+Налаштування (settings.py):
+    PROFILING_ENABLED      - підключити middleware (за замовчуванням DEBUG)
+    PROFILING_SAMPLE_RATE  - частка запитів, що профілюються (0..1)
+    PROFILING_BUFFER_SIZE  - кількість останніх запитів у буфері
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.template.base import Template
+from django.urls import Resolver404, resolve
+
+from .sampler import sampler
+
+
+@dataclass
+class RequestStats:
+    """Лічильники одного запиту"""
+    queries: int = 0
+    sql_time: float = 0.0
+    template_time: float = 0.0
+    template_depth: int = 0
+
+
+@dataclass
+class ProfileRecord:
+    view_name: str
+    method: str
+    path: str
+    status: int
+    timestamp: float
+    wall_ms: float
+    cpu_ms: float
+    queries: int
+    sql_ms: float
+    template_ms: float
+
+
+@dataclass
+class ViewSummary:
+    view_name: str
+    count: int = 0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    max: float = 0.0
+    avg_cpu_ms: float = 0.0
+    avg_queries: float = 0.0
+    avg_sql_ms: float = 0.0
+    avg_template_ms: float = 0.0
+    statuses: Dict[int, int] = field(default_factory=dict)
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar('profiling_stats', default=None)
+
+
+class RingBuffer:
+    """Останні N записів воркера; deque з maxlen витісняє найстаріші"""
+
+    def __init__(self, size: int):
+        self._records = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def append(self, record: ProfileRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def records(self) -> List[ProfileRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def resize(self, size: int) -> None:
+        with self._lock:
+            self._records = deque(self._records, maxlen=size)
+
+    @property
+    def maxlen(self) -> int:
+        return self._records.maxlen
+
+
+buffer = RingBuffer(getattr(settings, 'PROFILING_BUFFER_SIZE', 1000))
+
+
+def _sql_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.sql_time += time.perf_counter() - started
+
+
+def _install_sql_wrapper(sender, connection, **kwargs):
+    if _sql_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_wrapper)
+
+
+_original_render = Template.render
+
+
+def _profiled_render(self, context):
+    stats = _current.get()
+    if stats is None:
+        return _original_render(self, context)
+    # Вкладені шаблони ({% include %}) вже враховані зовнішнім
+    stats.template_depth += 1
+    started = time.perf_counter()
+    try:
+        return _original_render(self, context)
+    finally:
+        stats.template_depth -= 1
+        if stats.template_depth == 0:
+            stats.template_time += time.perf_counter() - started
+
+
+_installed = False
+
+
+def install() -> None:
+    """Підключає лічильники SQL та шаблонів (один раз на процес)"""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    connection_created.connect(_install_sql_wrapper, dispatch_uid='whmcs_project.profiling.sql')
+    # З'єднання, відкриті до підключення сигналу
+    from django.db import connections
+    for connection in connections.all(initialized_only=True):
+        _install_sql_wrapper(None, connection)
+    Template.render = _profiled_render
+
+
+def _view_name(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None else '<unresolved>'
+
+
+class ProfilingMiddleware:
+    """Записує метрики запитів у кільцевий буфер воркера"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 1.0)
+        if buffer.maxlen != getattr(settings, 'PROFILING_BUFFER_SIZE', 1000):
+            buffer.resize(settings.PROFILING_BUFFER_SIZE)
+        install()
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    @staticmethod
+    def _deep_profiled(request) -> bool:
+        """Чи потрапляє запит у сесію профайлера стеків (dev dashboard)"""
+        if not sampler.armed:
+            return False
+        try:
+            view_name = resolve(request.path_info, getattr(request, 'urlconf', None)).view_name
+        except Resolver404:
+            return False
+        return sampler.claim(view_name)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if self._deep_profiled(request):
+            token = sampler.begin()
+            try:
+                return self._profile(request)
+            finally:
+                sampler.end(token)
+        if not self._sampled():
+            return self.get_response(request)
+        return self._profile(request)
+
+    def _profile(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, stats, started, time.thread_time() - cpu_started)
+        return response
+
+    async def __acall__(self, request):
+        if self._deep_profiled(request):
+            token = sampler.begin(all_threads=True)
+            try:
+                return await self._aprofile(request)
+            finally:
+                sampler.end(token)
+        if not self._sampled():
+            return await self.get_response(request)
+        return await self._aprofile(request)
+
+    async def _aprofile(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        # В async режимі робота запиту розподілена між потоками, тому CPU
+        # час рахується для процесу (з домішкою паралельних запитів)
+        started, cpu_started = time.perf_counter(), time.process_time()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, stats, started, time.process_time() - cpu_started)
+        return response
+
+    @staticmethod
+    def _record(request, response, stats: RequestStats, started: float, cpu: float) -> None:
+        buffer.append(ProfileRecord(
+            view_name=_view_name(request),
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            timestamp=time.time(),
+            wall_ms=(time.perf_counter() - started) * 1000,
+            cpu_ms=cpu * 1000,
+            queries=stats.queries,
+            sql_ms=stats.sql_time * 1000,
+            template_ms=stats.template_time * 1000,
+        ))
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Перцентиль методом nearest-rank для відсортованого списку"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(records: Optional[List[ProfileRecord]] = None) -> Dict[str, ViewSummary]:
+    """Зведення по view: p50/p95/p99 загального часу та середні метрики"""
+    if records is None:
+        records = buffer.records()
+
+    grouped: Dict[str, List[ProfileRecord]] = {}
+    for record in records:
+        grouped.setdefault(record.view_name, []).append(record)
+
+    summaries = {}
+    for view_name, items in grouped.items():
+        walls = sorted(item.wall_ms for item in items)
+        count = len(items)
+        statuses: Dict[int, int] = {}
+        for item in items:
+            statuses[item.status] = statuses.get(item.status, 0) + 1
+        summaries[view_name] = ViewSummary(
+            view_name=view_name,
+            count=count,
+            p50=percentile(walls, 50),
+            p95=percentile(walls, 95),
+            p99=percentile(walls, 99),
+            max=walls[-1],
+            avg_cpu_ms=sum(item.cpu_ms for item in items) / count,
+            avg_queries=sum(item.queries for item in items) / count,
+            avg_sql_ms=sum(item.sql_ms for item in items) / count,
+            avg_template_ms=sum(item.template_ms for item in items) / count,
+            statuses=dict(sorted(statuses.items())),
+        )
+    return summaries
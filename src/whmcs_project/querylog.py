@@ -0,0 +1,142 @@
+"""
+Журнал SQL запитів з групуванням за fingerprint.
+
+Обгортка ``connection.execute_wrapper`` нормалізує SQL (літерали та
+списки IN замінюються на ``?``) і накопичує для кожного fingerprint
+кількість викликів, сумарний та максимальний час. Для SELECT запитів,
+повільніших за QUERYLOG_EXPLAIN_THRESHOLD_MS, один раз зберігається
+план виконання (``EXPLAIN (ANALYZE off)`` у PostgreSQL, ``EXPLAIN
+QUERY PLAN`` у SQLite). Статистика - в межах воркера.
+
+Налаштування (settings.py):
+    QUERYLOG_ENABLED                - підключити журнал (за замовчуванням DEBUG)
+    QUERYLOG_EXPLAIN_THRESHOLD_MS   - поріг для EXPLAIN
+    QUERYLOG_MAX_FINGERPRINTS       - максимум різних запитів у журналі
+"""
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.backends.signals import connection_created
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s|\?')
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+EXPLAIN_PREFIXES = {
+    'postgresql': 'EXPLAIN (ANALYZE off) ',
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+}
+
+
+def fingerprint(sql: str) -> str:
+    """Нормалізований SQL: однакові запити з різними параметрами збігаються"""
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _PLACEHOLDER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+@dataclass
+class QueryStats:
+    fingerprint: str
+    sql: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    explain: Optional[str] = None
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class QueryLog:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queries = {}
+        self.dropped = 0
+        # Запити самого журналу (EXPLAIN, savepoint) не записуються
+        self._local = threading.local()
+
+    def record(self, sql: str, duration_ms: float) -> Optional[QueryStats]:
+        key = fingerprint(sql)
+        with self._lock:
+            stats = self._queries.get(key)
+            if stats is None:
+                if len(self._queries) >= settings.QUERYLOG_MAX_FINGERPRINTS:
+                    self.dropped += 1
+                    return None
+                stats = self._queries[key] = QueryStats(fingerprint=key, sql=sql)
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+        return stats
+
+    def queries(self, sort: str = 'total_ms') -> List[QueryStats]:
+        with self._lock:
+            items = list(self._queries.values())
+        return sorted(items, key=lambda item: getattr(item, sort), reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queries.clear()
+            self.dropped = 0
+
+    @property
+    def paused(self) -> bool:
+        return getattr(self._local, 'paused', False)
+
+    def explain(self, connection, stats: QueryStats, sql: str, params) -> None:
+        prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+        if prefix is None or not sql.lstrip().upper().startswith('SELECT'):
+            return
+        self._local.paused = True
+        try:
+            # Savepoint: помилка EXPLAIN не повинна зламати транзакцію запиту
+            with transaction.atomic(using=connection.alias):
+                with connection.cursor() as cursor:
+                    cursor.execute(prefix + sql, params)
+                    rows = cursor.fetchall()
+            stats.explain = '\n'.join(' '.join(str(value) for value in row) for row in rows)
+        except DatabaseError as e:
+            stats.explain = f'EXPLAIN failed: {e}'
+        finally:
+            self._local.paused = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.paused:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        stats = self.record(sql, duration_ms)
+        if (stats is not None and stats.explain is None and not many
+                and duration_ms >= settings.QUERYLOG_EXPLAIN_THRESHOLD_MS):
+            self.explain(context['connection'], stats, sql, params)
+        return result
+
+
+query_log = QueryLog()
+
+
+def _install_wrapper(sender, connection, **kwargs):
+    if query_log not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_log)
+
+
+def install() -> None:
+    """Підключає журнал до всіх з'єднань (викликається з AppConfig.ready)"""
+    connection_created.connect(_install_wrapper, dispatch_uid='whmcs_project.querylog')
+    from django.db import connections
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(None, connection)
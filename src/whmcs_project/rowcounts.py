@@ -0,0 +1,143 @@
+"""
+Швидкі кількості рядків без COUNT(*) на кожен запит.
+
+Для PostgreSQL кількість береться з ``pg_class.reltuples`` (оцінка, яку
+оновлюють ANALYZE та autovacuum) разом з ``pg_total_relation_size`` -
+один запит на будь-яку кількість таблиць. Таблиці, менші за
+ROWCOUNT_EXACT_THRESHOLD рядків, а також інші БД рахуються точно, але
+результат кешується у спільному кеші: застаріле значення (старше за
+ROWCOUNT_REFRESH_AFTER секунд) віддається одразу, а перерахунок
+виконується у фоновому потоці.
+
+Для моделей, зареєстрованих через ``track()``, точний кеш скидається
+при створенні та видаленні рядків.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+
+from .cache import SHARED
+
+logger = logging.getLogger(__name__)
+
+ESTIMATES_SQL = """
+    SELECT c.relname, c.reltuples::bigint, pg_total_relation_size(c.oid)
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p') AND c.relname = ANY(%s)
+"""
+
+
+@dataclass
+class RowCount:
+    value: int
+    exact: bool
+    size: Optional[int] = None
+
+    def __str__(self):
+        return str(self.value) if self.exact else f'~{self.value}'
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rowcounts')
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def _cache_key(alias: str, table: str) -> str:
+    return f'rowcount:{alias}:{table}'
+
+
+def estimates(tables: Iterable[str], alias: str = 'default') -> Dict[str, Tuple[int, int]]:
+    """{таблиця: (reltuples, розмір у байтах)}; для не-PostgreSQL - порожньо"""
+    connection = connections[alias]
+    tables = list(tables)
+    if connection.vendor != 'postgresql' or not tables:
+        return {}
+    with connection.cursor() as cursor:
+        cursor.execute(ESTIMATES_SQL, [tables])
+        return {name: (rows, size) for name, rows, size in cursor.fetchall()}
+
+
+def exact_count(model, alias: str = 'default') -> int:
+    """Точна кількість і оновлення кешу"""
+    count = model._default_manager.using(alias).count()
+    caches[SHARED].set(_cache_key(alias, model._meta.db_table), (count, time.time()),
+                       timeout=settings.ROWCOUNT_REFRESH_AFTER * 10)
+    return count
+
+
+def _refresh(model, alias: str, key: str) -> None:
+    try:
+        exact_count(model, alias)
+    except Exception:
+        logger.exception('Row count refresh failed for %s', model._meta.label)
+    finally:
+        # З'єднання фонового потоку не повинні висіти до наступного перерахунку
+        connections.close_all()
+        with _pending_lock:
+            _pending.discard(key)
+
+
+def _schedule_refresh(model, alias: str, key: str) -> None:
+    with _pending_lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+    _executor.submit(_refresh, model, alias, key)
+
+
+def cached_exact_count(model, alias: str = 'default') -> int:
+    """Точна кількість з кешу (stale-while-revalidate)"""
+    key = _cache_key(alias, model._meta.db_table)
+    cached = caches[SHARED].get(key)
+    if cached is None:
+        return exact_count(model, alias)
+    count, computed_at = cached
+    if time.time() - computed_at > settings.ROWCOUNT_REFRESH_AFTER:
+        _schedule_refresh(model, alias, key)
+    return count
+
+
+def row_counts(models: Iterable, alias: str = 'default') -> Dict[str, RowCount]:
+    """Кількості рядків для моделей, {label моделі: RowCount}"""
+    models = list(models)
+    table_estimates = estimates((model._meta.db_table for model in models), alias)
+    threshold = settings.ROWCOUNT_EXACT_THRESHOLD
+
+    result = {}
+    for model in models:
+        rows, size = table_estimates.get(model._meta.db_table, (-1, None))
+        # reltuples = -1: таблиця ще не аналізувалась, оцінки немає
+        if rows >= threshold:
+            result[model._meta.label] = RowCount(value=rows, exact=False, size=size)
+        else:
+            result[model._meta.label] = RowCount(value=cached_exact_count(model, alias), exact=True, size=size)
+    return result
+
+
+def row_count(model, alias: str = 'default') -> RowCount:
+    return row_counts([model], alias)[model._meta.label]
+
+
+def _invalidate(sender, created=True, **kwargs):
+    if not created:
+        return
+    alias = kwargs.get('using') or 'default'
+    caches[SHARED].delete(_cache_key(alias, sender._meta.db_table))
+
+
+def track(*models) -> None:
+    """Скидати точний кеш моделей при створенні та видаленні рядків"""
+    for model in models:
+        uid = f'rowcounts:{model._meta.label}'
+        post_save.connect(_invalidate, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+        post_delete.connect(_invalidate, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
@@ -0,0 +1,198 @@
+"""
+Статистичний профайлер стеків для глибокого профілювання на вимогу.
+
+Профайлер "озброюється" на наступні N запитів (опційно тільки для
+певного імені URL). Поки такий запит виконується, фоновий потік кожні
+``interval`` секунд знімає стеки через ``sys._current_frames()`` і
+зливає їх у лічильник. Результат - таблиця функцій (self/total
+семпли) та collapsed stacks для flamegraph.pl / speedscope.
+
+У sync режимі знімається тільки потік запиту. В async режимі запит
+виконується в кількох потоках (event loop та sync_to_async), тому
+знімаються всі потоки, крім простоюючих. Стан - в межах воркера.
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from django.conf import settings
+
+Stack = Tuple[str, ...]
+
+# Функції, в яких простоюють потоки пулу та event loop
+IDLE_FRAMES = frozenset({
+    ('threading.py', 'wait'),
+    ('selectors.py', 'select'),
+    ('queue.py', 'get'),
+    ('thread.py', '_worker'),
+})
+
+# Власні сторінки dev dashboard не витрачають "озброєні" запити
+IGNORED_NAMESPACES = ('dev_dashboard:',)
+
+DEFAULT_INTERVAL = 0.002
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    base_dir = str(settings.BASE_DIR)
+    if filename.startswith(base_dir):
+        filename = os.path.relpath(filename, base_dir)
+    elif 'site-packages' in filename:
+        filename = filename.split('site-packages' + os.sep, 1)[1]
+    else:
+        filename = os.path.basename(filename)
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in IDLE_FRAMES
+
+
+def _stack(frame) -> Stack:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+@dataclass
+class FunctionStats:
+    label: str
+    self_samples: int = 0
+    total_samples: int = 0
+
+
+class StackSampler:
+    """Стан профайлера воркера: озброєння, сесії запитів та злиті стеки"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.remaining = 0
+        self.url_name: Optional[str] = None
+        self.interval = DEFAULT_INTERVAL
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.requests = 0
+        self._active = 0
+        self._targets: Dict[int, Optional[FrozenSet[int]]] = {}
+        self._next_token = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # Керування
+
+    def arm(self, requests: int, url_name: Optional[str] = None, interval: float = DEFAULT_INTERVAL) -> None:
+        with self._lock:
+            self.remaining = max(0, requests)
+            self.url_name = url_name or None
+            self.interval = max(0.0005, interval)
+
+    def disarm(self) -> None:
+        with self._lock:
+            self.remaining = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self.stacks.clear()
+            self.samples = 0
+            self.requests = 0
+
+    @property
+    def armed(self) -> bool:
+        return self.remaining > 0
+
+    def claim(self, view_name: str) -> bool:
+        """Чи профілювати запит до view_name (зменшує лічильник)"""
+        if view_name.startswith(IGNORED_NAMESPACES):
+            return False
+        with self._lock:
+            if self.remaining <= 0 or (self.url_name and view_name != self.url_name):
+                return False
+            self.remaining -= 1
+            self.requests += 1
+            return True
+
+    # Сесії
+
+    def begin(self, all_threads: bool = False) -> int:
+        """Починає знімати стеки потоку запиту (або всіх потоків)"""
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._targets[token] = None if all_threads else frozenset({thread_id})
+            self._active += 1
+            if self._thread is None:
+                # Окрема подія на кожен потік: зупинений потік не "оживе" від нової сесії
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,), name='stack-sampler',
+                                                daemon=True)
+                self._thread.start()
+        return token
+
+    def end(self, token: int) -> None:
+        with self._lock:
+            self._targets.pop(token, None)
+            self._active -= 1
+            if self._active == 0 and self._thread is not None:
+                self._stop.set()
+                self._thread = None
+
+    def _run(self, stop: threading.Event) -> None:
+        own = threading.get_ident()
+        while not stop.wait(self.interval):
+            with self._lock:
+                targets = list(self._targets.values())
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            if any(target is None for target in targets):
+                thread_ids = set(frames) - {own}
+            else:
+                thread_ids = set().union(*targets)
+
+            collected = []
+            for thread_id in thread_ids:
+                frame = frames.get(thread_id)
+                if frame is None or _is_idle(frame):
+                    continue
+                collected.append(_stack(frame))
+            del frames
+            if collected:
+                with self._lock:
+                    self.stacks.update(collected)
+                    self.samples += len(collected)
+
+    # Результати
+
+    def functions(self, sort: str = 'self') -> List[FunctionStats]:
+        """Таблиця функцій: self - семпли на вершині стеку, total - в стеку взагалі"""
+        with self._lock:
+            stacks = list(self.stacks.items())
+
+        table: Dict[str, FunctionStats] = {}
+        for stack, count in stacks:
+            for label in set(stack):
+                table.setdefault(label, FunctionStats(label)).total_samples += count
+            table[stack[-1]].self_samples += count
+
+        if sort == 'name':
+            return sorted(table.values(), key=lambda item: item.label)
+        key = 'total_samples' if sort == 'total' else 'self_samples'
+        return sorted(table.values(), key=lambda item: (-getattr(item, key), item.label))
+
+    def collapsed(self) -> str:
+        """Collapsed stacks: "root;child;leaf count" на рядок"""
+        with self._lock:
+            stacks = sorted(self.stacks.items())
+        return ''.join(f'{";".join(stack)} {count}\n' for stack, count in stacks)
+
+
+sampler = StackSampler()
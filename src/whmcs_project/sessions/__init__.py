@@ -0,0 +1,85 @@
+"""
+Сесії з відкладеним записом.
+
+Рушії (``SESSION_MODE`` у settings.py):
+    db             - таблиця django_session
+    cached_db      - кеш SHARED перед таблицею: читання без SELECT
+    signed_cookies - дані в підписаному cookie, БД не використовується
+
+Усі рушії пропускають запис, якщо дані сесії не змінились (навіть коли
+``session.modified`` виставлено присвоєнням того самого значення), а
+термін дії продовжують не на кожному запиті, а раз на
+``SESSION_REFRESH_INTERVAL`` секунд: фактичний час неактивності до
+виходу - від ``SESSION_COOKIE_AGE - SESSION_REFRESH_INTERVAL`` до
+``SESSION_COOKIE_AGE``. Рішення приймає ``middleware.SessionMiddleware``.
+"""
+
+import copy
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+# Час останнього запису сесії (unix time), зберігається разом з даними
+REFRESHED_KEY = '_refreshed_at'
+
+PURGE_BATCH_SIZE = 5000
+
+
+def _payload(data: dict) -> dict:
+    return {key: value for key, value in data.items() if key != REFRESHED_KEY}
+
+
+class LazySessionMixin:
+    """Знімок даних при завантаженні та час останнього запису"""
+
+    _loaded = None
+
+    def _remember(self, data: dict) -> dict:
+        self._loaded = copy.deepcopy(_payload(data))
+        return data
+
+    def load(self):
+        return self._remember(super().load())
+
+    async def aload(self):
+        return self._remember(await super().aload())
+
+    def is_unchanged(self) -> bool:
+        """Дані такі ж, як при завантаженні (нова сесія завжди змінена)"""
+        if self._loaded is None or not self.session_key:
+            return False
+        return _payload(getattr(self, '_session_cache', {})) == self._loaded
+
+    def refresh_due(self) -> bool:
+        refreshed = getattr(self, '_session_cache', {}).get(REFRESHED_KEY) or 0
+        return time.time() - refreshed >= settings.SESSION_REFRESH_INTERVAL
+
+    def _prepare_save(self, must_create: bool) -> bool:
+        if not must_create and self.is_unchanged() and not self.refresh_due():
+            return False
+        self._session[REFRESHED_KEY] = int(time.time())
+        return True
+
+    def save(self, must_create=False):
+        if self._prepare_save(must_create):
+            super().save(must_create)
+            self._remember(self._session)
+
+    async def asave(self, must_create=False):
+        if self._prepare_save(must_create):
+            await super().asave(must_create)
+            self._remember(self._session)
+
+
+def purge_expired(model, batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """Видаляє прострочені сесії пачками (короткі транзакції замість одного
+    DELETE на мільйони рядків); повертає кількість видалених"""
+    now = timezone.now()
+    deleted = 0
+    while True:
+        keys = list(model.objects.filter(expire_date__lt=now)
+                    .values_list('session_key', flat=True)[:batch_size])
+        if not keys:
+            return deleted
+        deleted += model.objects.filter(session_key__in=keys).delete()[0]
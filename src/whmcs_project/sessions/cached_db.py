@@ -0,0 +1,11 @@
+from django.contrib.sessions.backends import cached_db
+
+from . import LazySessionMixin, purge_expired
+
+
+class SessionStore(LazySessionMixin, cached_db.SessionStore):
+    cache_key_prefix = 'whmcs.sessions.cached_db'
+
+    @classmethod
+    def clear_expired(cls):
+        purge_expired(cls.get_model_class())
@@ -0,0 +1,9 @@
+from django.contrib.sessions.backends import db
+
+from . import LazySessionMixin, purge_expired
+
+
+class SessionStore(LazySessionMixin, db.SessionStore):
+    @classmethod
+    def clear_expired(cls):
+        purge_expired(cls.get_model_class())
@@ -0,0 +1,22 @@
+from django.contrib.sessions import middleware
+
+
+class SessionMiddleware(middleware.SessionMiddleware):
+    """SessionMiddleware з пропуском незмінених записів та лінивим продовженням
+
+    Django зберігає сесію (і ставить cookie) лише коли ``modified``; тут
+    ``modified`` виправляється перед цим рішенням: скидається, якщо дані
+    не змінились і продовжувати ще рано, і виставляється, якщо сесію
+    час продовжити.
+    """
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if session is not None and session.accessed and not session.is_empty() \
+                and hasattr(session, 'refresh_due'):
+            refresh_due = session.refresh_due()
+            if session.modified and session.is_unchanged() and not refresh_due:
+                session.modified = False
+            elif not session.modified and refresh_due:
+                session.modified = True
+        return super().process_response(request, response)
@@ -0,0 +1,12 @@
+from django.contrib.sessions.backends import signed_cookies
+
+from . import LazySessionMixin
+
+
+class SessionStore(LazySessionMixin, signed_cookies.SessionStore):
+    """Сесія в підписаному cookie
+
+    Термін дії перевіряється за часом підпису, тому продовження сесії -
+    це новий підпис cookie раз на SESSION_REFRESH_INTERVAL. Серверного
+    стану немає: вихід очищає cookie лише в цьому браузері.
+    """
@@ -48,15 +48,35 @@ if DEBUG:
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'whmcs_project.staticfiles.StaticFilesMiddleware',
+    'whmcs_project.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'whmcs_project.users.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Профілювання запитів (whmcs_project.profiling, сторінка /dev/profiling/)
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=DEBUG, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=1.0, cast=float)
+PROFILING_BUFFER_SIZE = config('PROFILING_BUFFER_SIZE', default=1000, cast=int)
+
+if PROFILING_ENABLED:
+    # Першим, щоб вимірювати весь стек middleware
+    MIDDLEWARE.insert(0, 'whmcs_project.profiling.ProfilingMiddleware')
+
+# Журнал SQL запитів (whmcs_project.querylog, сторінка /dev/database/)
+QUERYLOG_ENABLED = config('QUERYLOG_ENABLED', default=DEBUG, cast=bool)
+QUERYLOG_EXPLAIN_THRESHOLD_MS = config('QUERYLOG_EXPLAIN_THRESHOLD_MS', default=100, cast=float)
+QUERYLOG_MAX_FINGERPRINTS = config('QUERYLOG_MAX_FINGERPRINTS', default=500, cast=int)
+
+# Кількості рядків (whmcs_project.rowcounts): оцінка з pg_class для великих таблиць,
+# кешований COUNT(*) з фоновим оновленням для малих
+ROWCOUNT_EXACT_THRESHOLD = config('ROWCOUNT_EXACT_THRESHOLD', default=100000, cast=int)
+ROWCOUNT_REFRESH_AFTER = config('ROWCOUNT_REFRESH_AFTER', default=300, cast=int)
+
 ROOT_URLCONF = 'whmcs_project.urls'
 
 TEMPLATES = [
@@ -76,12 +96,28 @@ TEMPLATES = [
     },
 ]
 
+# Без DEBUG шаблони компілюються один раз на воркер (cached loader),
+# а при старті воркера - заздалегідь (whmcs_project.templating.warm_up)
+if not DEBUG:
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
+TEMPLATE_WARMUP = config('TEMPLATE_WARMUP', default=not DEBUG, cast=bool)
+
 WSGI_APPLICATION = 'whmcs_project.wsgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# postgresql - основна БД; sqlite - локальний запуск та бенчмарки без PostgreSQL
+DB_ENGINE = config('DB_ENGINE', default='postgresql')  # postgresql | sqlite
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -90,9 +126,91 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default='whmcs_password'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Перевірка з'єднання перед повторним використанням
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
     }
 }
 
+if DB_ENGINE == 'sqlite':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': config('DB_SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+    }
+    # SQLite не підтримує INCLUDE: покривні індекси створюються як звичайні складені
+    SILENCED_SYSTEM_CHECKS = ['models.W040']
+
+# Режим з'єднань з PostgreSQL:
+#   off        - нове з'єднання на кожен запит
+#   persistent - з'єднання потоку живе DB_CONN_MAX_AGE секунд
+#   pool       - пул psycopg_pool на воркер (DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE)
+DB_POOL_MODE = config('DB_POOL_MODE', default='persistent')  # off | persistent | pool
+
+if DB_POOL_MODE == 'pool' and DB_ENGINE == 'postgresql':
+    # Пул несумісний з CONN_MAX_AGE: з'єднання повертається в пул після запиту
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    # Для пулу Django не перевіряє з'єднання на початку запиту, а передає
+    # ConnectionPool.check_connection у check пулу лише з CONN_HEALTH_CHECKS
+    # (ключ 'check' в OPTIONS['pool'] дає TypeError). Без перевірки після
+    # перезапуску БД пул видає мертві з'єднання, тому в режимі пулу вона завжди
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'name': 'whmcs-default',
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            # Скільки секунд чекати вільне з'єднання до помилки
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+            'max_idle': config('DB_POOL_MAX_IDLE', default=300, cast=float),
+            'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=3600, cast=float),
+        },
+    }
+elif DB_POOL_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+#
+# default - in-memory LRU кожного воркера для гарячих даних
+# shared  - спільний між воркерами кеш (файли, таблиця БД або Redis)
+
+CACHE_SHARED_BACKEND = config('CACHE_SHARED_BACKEND', default='file')  # file | db | redis
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'whmcs-local',
+        'TIMEOUT': config('CACHE_LOCAL_TIMEOUT', default=300, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('CACHE_LOCAL_MAX_ENTRIES', default=1000, cast=int),
+        },
+    },
+}
+
+if CACHE_SHARED_BACKEND == 'redis':
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('REDIS_URL', default='redis://localhost:6379/0'),
+    }
+elif CACHE_SHARED_BACKEND == 'db':
+    # Таблиця створюється командою: python manage.py createcachetable
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'whmcs_cache',
+    }
+else:
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('CACHE_FILE_LOCATION', default='/tmp/whmcs_cache'),
+    }
+
+CACHES['shared'].update({
+    'TIMEOUT': config('CACHE_SHARED_TIMEOUT', default=600, cast=int),
+    'KEY_PREFIX': 'whmcs',
+})
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -142,6 +260,19 @@ LOCALE_PATHS = [
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Bootstrap і Font Awesome лежать у admin_panel/static/admin_panel/vendor
+# (оновлення: python dev_tools/vendor_static.py). Поза DEBUG collectstatic
+# додає хеш вмісту до імен файлів та пише .gz/.br варіанти
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+        else 'whmcs_project.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
+# Роздача STATIC_ROOT самим Django (whmcs_project.staticfiles), без nginx
+STATIC_SERVE = config('STATIC_SERVE', default=not DEBUG, cast=bool)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/6.0/ref/settings/#default-auto-field
 
@@ -170,6 +301,34 @@ SESSION_COOKIE_HTTPONLY = True
 SESSION_COOKIE_AGE = 3600  # 1 година
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 
+# Сесії (whmcs_project.sessions):
+#   db             - тільки таблиця django_session
+#   cached_db      - кеш shared перед таблицею (читання без запитів до БД)
+#   signed_cookies - підписаний cookie без стану на сервері (вихід не
+#                    відкликає cookie, скопійований з іншого браузера)
+SESSION_MODE = config('SESSION_MODE', default='cached_db')  # db | cached_db | signed_cookies
+SESSION_ENGINE = f'whmcs_project.sessions.{SESSION_MODE}'
+# Спільний кеш: сесія, змінена в одному воркері, має бути видна всім
+SESSION_CACHE_ALIAS = 'shared'
+# Термін дії продовжується записом не частіше ніж раз на стільки секунд
+SESSION_REFRESH_INTERVAL = config('SESSION_REFRESH_INTERVAL', default=300, cast=int)
+# Знімок користувача запиту (whmcs_project.users) у кеші shared: скільки
+# секунд діє зміна доступу, зроблена QuerySet.update() в обхід сигналів
+USER_SNAPSHOT_TTL = config('USER_SNAPSHOT_TTL', default=300, cast=int)
+
 # CSRF Protection
 CSRF_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_HTTPONLY = True
+
+# Login Throttling (admin_panel.throttling)
+# Ліміти невдалих спроб за ковзне вікно; після перевищення - блокування
+# на LOCKOUT_BASE секунд, що подвоюється з кожним повтором до LOCKOUT_MAX
+LOGIN_THROTTLE_ENABLED = config('LOGIN_THROTTLE_ENABLED', default=True, cast=bool)
+LOGIN_THROTTLE_WINDOW = config('LOGIN_THROTTLE_WINDOW', default=900, cast=int)
+LOGIN_THROTTLE_USERNAME_LIMIT = config('LOGIN_THROTTLE_USERNAME_LIMIT', default=5, cast=int)
+LOGIN_THROTTLE_IP_LIMIT = config('LOGIN_THROTTLE_IP_LIMIT', default=20, cast=int)
+LOGIN_THROTTLE_SUBNET_LIMIT = config('LOGIN_THROTTLE_SUBNET_LIMIT', default=100, cast=int)
+LOGIN_THROTTLE_LOCKOUT_BASE = config('LOGIN_THROTTLE_LOCKOUT_BASE', default=60, cast=int)
+LOGIN_THROTTLE_LOCKOUT_MAX = config('LOGIN_THROTTLE_LOCKOUT_MAX', default=3600, cast=int)
+# Кількість довірених проксі перед додатком (для X-Forwarded-For)
+LOGIN_THROTTLE_PROXY_COUNT = config('LOGIN_THROTTLE_PROXY_COUNT', default=0, cast=int)
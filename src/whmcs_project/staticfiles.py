@@ -0,0 +1,306 @@
+"""
+Статичні файли для продакшн образу без окремого веб-сервера.
+
+Збірка (``collectstatic`` з ``CompressedManifestStaticFilesStorage``):
+файли отримують хеш вмісту в імені (``bootstrap.min.3a1f....css``), а
+для текстових форматів поруч записуються ``.gz`` і ``.br`` варіанти -
+стиснення виконується один раз під час збірки образу, а не на запит.
+
+Роздача (``StaticFilesMiddleware``, вмикається STATIC_SERVE): індекс
+STATIC_ROOT будується при старті воркера, файл обирається за
+Accept-Encoding (br, gzip, без стиснення), підтримуються
+If-None-Match / If-Modified-Since (304) та один діапазон Range (206).
+Імена з хешем віддаються з ``Cache-Control: immutable`` на рік, решта
+- з ревалідацією. Невеликі файли тримаються в пам'яті воркера після
+першого запиту.
+"""
+
+import gzip
+import logging
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.cache import parse_etags
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import http_date, parse_http_date_safe
+
+try:
+    import brotli
+except ImportError:  # необов'язково: без пакета Brotli пишуться лише .gz
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Формати, які варто стискати (woff2, png, jpg вже стиснені)
+COMPRESS_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ttf', '.eot', '.otf',
+                       '.ico')
+# Варіант зберігається, лише якщо він менший за оригінал хоча б на 5%
+MIN_COMPRESSION_RATIO = 0.95
+
+# Кодування в порядку переваги: (Content-Encoding, суфікс файлу)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, max-age=0, must-revalidate'
+# Файли до цього розміру після першого запиту віддаються з пам'яті
+MEMORY_FILE_SIZE = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+TEXT_CONTENT_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+
+# Збірка
+
+def _compress(path: str) -> Tuple[int, int]:
+    """Пише path.gz та path.br поруч з файлом; повертає (gz, br) записаних"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    variants = [('.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', lambda: brotli.compress(data, quality=11)))
+    written = {'.gz': 0, '.br': 0}
+    for suffix, compress in variants:
+        compressed = compress()
+        if len(compressed) < len(data) * MIN_COMPRESSION_RATIO:
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            written[suffix] = 1
+        elif os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return written['.gz'], written['.br']
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage, що після хешування пише .gz/.br варіанти"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        names = sorted({name for name in self.hashed_files.values()
+                        if name.lower().endswith(COMPRESS_EXTENSIONS)})
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            results = list(executor.map(_compress, (self.path(name) for name in names)))
+        if brotli is None:
+            logger.warning('Brotli is not installed: only .gz variants of static files were written')
+        logger.info('Compressed static files: %d .gz, %d .br',
+                    sum(gz for gz, _br in results), sum(br for _gz, br in results))
+
+
+# Роздача
+
+@dataclass
+class Variant:
+    path: str
+    size: int
+    etag: str
+    content: Optional[bytes] = None
+
+    def read(self) -> bytes:
+        if self.content is None:
+            with open(self.path, 'rb') as f:
+                content = f.read()
+            if self.size > MEMORY_FILE_SIZE:
+                return content
+            self.content = content
+        return self.content
+
+
+@dataclass
+class StaticFile:
+    content_type: str
+    last_modified: int
+    cache_control: str
+    # {Content-Encoding або '': варіант}
+    variants: Dict[str, Variant] = field(default_factory=dict)
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def _variant(path: str, suffix: str = '') -> Variant:
+    stat = os.stat(path)
+    return Variant(path=path, size=stat.st_size, etag=f'"{stat.st_size:x}-{int(stat.st_mtime):x}{suffix}"')
+
+
+def _content_type(name: str) -> str:
+    content_type, _encoding = mimetypes.guess_type(name)
+    content_type = content_type or 'application/octet-stream'
+    if content_type.startswith(TEXT_CONTENT_TYPES):
+        content_type += '; charset=utf-8'
+    return content_type
+
+
+def build_index(root: str, immutable_names) -> Dict[str, StaticFile]:
+    """{ім'я відносно STATIC_ROOT: StaticFile}; .gz/.br стають варіантами"""
+    index = {}
+    for directory, _dirs, files in os.walk(root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            if any(name.endswith(suffix) and name[:-len(suffix)].rsplit('/', 1)[-1] in files
+                   for _encoding, suffix in ENCODINGS):
+                continue
+            entry = StaticFile(
+                content_type=_content_type(name),
+                last_modified=int(os.stat(path).st_mtime),
+                cache_control=IMMUTABLE_CACHE_CONTROL if name in immutable_names else REVALIDATE_CACHE_CONTROL,
+                variants={'': _variant(path)},
+            )
+            for encoding, suffix in ENCODINGS:
+                if filename + suffix in files:
+                    entry.variants[encoding] = _variant(path + suffix, suffix)
+            index[name] = entry
+    return index
+
+
+def accepted_encodings(header: str) -> set:
+    """Кодування з Accept-Encoding з ненульовою вагою"""
+    accepted = set()
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if token:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+def byte_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(перший, останній) байт з Range або None, якщо заголовок ігнорується
+
+    Кілька діапазонів (multipart/byteranges) не підтримуються - тоді
+    віддається весь файл, як дозволяє RFC 9110.
+    """
+    unit, _, ranges = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in ranges:
+        return None
+    first, _, last = ranges.strip().partition('-')
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                raise RangeNotSatisfiable
+            return max(size - length, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start > end or start >= size:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def _stream(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+class StaticFilesMiddleware(MiddlewareMixin):
+    """Віддає STATIC_ROOT до решти middleware (сесії, авторизація не потрібні)"""
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if not settings.STATIC_SERVE:
+            raise MiddlewareNotUsed
+        self.prefix = settings.STATIC_URL
+        root = str(settings.STATIC_ROOT)
+        if not os.path.isdir(root):
+            logger.warning('STATIC_ROOT %s does not exist: run collectstatic', root)
+            self.files = {}
+            return
+        self.files = build_index(root, self._immutable_names())
+
+    @staticmethod
+    def _immutable_names() -> set:
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        hashed = getattr(staticfiles_storage, 'hashed_files', None)
+        return set(hashed.values()) if hashed else set()
+
+    def process_request(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.prefix):
+            return None
+        entry = self.files.get(request.path[len(self.prefix):])
+        if entry is None:
+            return None
+        return self.serve(request, entry)
+
+    def serve(self, request, entry: StaticFile):
+        range_header = request.META.get('HTTP_RANGE')
+        encoding = ''
+        if not range_header:
+            accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            encoding = next((name for name, _suffix in ENCODINGS if name in entry.variants and name in accepted), '')
+        variant = entry.variants[encoding]
+
+        headers = {
+            'ETag': variant.etag,
+            'Last-Modified': http_date(entry.last_modified),
+            'Cache-Control': entry.cache_control,
+            'Accept-Ranges': 'bytes',
+        }
+        if len(entry.variants) > 1:
+            headers['Vary'] = 'Accept-Encoding'
+
+        if self._not_modified(request, variant, entry):
+            response = HttpResponseNotModified()
+            for name, value in headers.items():
+                response[name] = value
+            return response
+
+        status, start, length = 200, 0, variant.size
+        if range_header and request.META.get('HTTP_IF_RANGE', variant.etag) == variant.etag:
+            try:
+                selected = byte_range(range_header, variant.size)
+            except RangeNotSatisfiable:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{variant.size}'
+                return response
+            if selected is not None:
+                start, end = selected
+                status, length = 206, end - start + 1
+                headers['Content-Range'] = f'bytes {start}-{end}/{variant.size}'
+
+        if request.method == 'HEAD':
+            response = HttpResponse(status=status, content_type=entry.content_type)
+        elif variant.size <= MEMORY_FILE_SIZE:
+            response = HttpResponse(variant.read()[start:start + length], status=status,
+                                    content_type=entry.content_type)
+        else:
+            response = StreamingHttpResponse(_stream(variant.path, start, length), status=status,
+                                             content_type=entry.content_type)
+        for name, value in headers.items():
+            response[name] = value
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['Content-Length'] = str(length)
+        return response
+
+    @staticmethod
+    def _not_modified(request, variant: Variant, entry: StaticFile) -> bool:
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or variant.etag in etags or f'W/{variant.etag}' in etags
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return if_modified_since is not None and entry.last_modified <= if_modified_since
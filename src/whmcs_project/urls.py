@@ -14,6 +14,7 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.urls import path, include
 from django.shortcuts import redirect
 from django.http import Http404
@@ -39,8 +40,7 @@ urlpatterns += i18n_patterns(
     prefix_default_language=False
 )
 
-# Додаємо dev dashboard тільки в DEBUG режимі
-from django.conf import settings
+# Додаємо dev dashboard тільки в DEBUG режимі (views імпортуються при першому запиті)
 if settings.DEBUG:
     urlpatterns += [
         path('dev/', include('dev_dashboard.urls')),
@@ -0,0 +1,171 @@
+"""
+Користувач запиту без SELECT з auth_user.
+
+``AuthenticationMiddleware`` Django на кожному запиті завантажує
+користувача з БД за id із сесії. Тут замість цього використовується
+знімок (``UserSnapshot``) у спільному кеші: id, логін, імена, email,
+прапорці доступу, дати та відбиток пароля - ``get_session_auth_hash()``,
+який Django зберігає в сесії при вході. Знімок приймається лише коли
+відбиток збігається з сесійним, тож сесія, відкрита зі старим паролем,
+іде звичайним шляхом через БД (і Django її завершує).
+
+Знімок видаляється при збереженні та видаленні користувача і при
+виході, а без цього живе USER_SNAPSHOT_TTL секунд (5 хвилин):
+``QuerySet.update()`` сигналів не викликає, тож деактивація чи зняття
+``is_staff`` масовим оновленням діє не пізніше ніж через цей час.
+Знімок неактивного користувача не приймається ніколи.
+
+Методи та поля поза знімком (``has_perm``, ``groups`` тощо) завантажують
+повну модель з БД при першому зверненні - лише в синхронному коді;
+async view отримує модель через ``aget_user()``.
+"""
+
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware as BaseAuthenticationMiddleware
+from django.contrib.auth.signals import user_logged_out
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .cache import SHARED
+
+SNAPSHOT_FIELDS = ('id', 'username', 'first_name', 'last_name', 'email', 'is_staff', 'is_superuser',
+                   'is_active', 'date_joined', 'last_login')
+
+
+def _cache_key(user_id) -> str:
+    return f'user-snapshot:{user_id}'
+
+
+class UserSnapshot:
+    """Незмінна копія полів користувача для шаблонів і перевірок доступу"""
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, data: dict):
+        self._data = data
+        self._user = None
+
+    @classmethod
+    def from_user(cls, user) -> 'UserSnapshot':
+        data = {name: getattr(user, name) for name in SNAPSHOT_FIELDS}
+        data['password_fingerprint'] = user.get_session_auth_hash()
+        return cls(data)
+
+    @property
+    def pk(self):
+        return self._data['id']
+
+    def __getattr__(self, name):
+        data = self.__dict__.get('_data')
+        if data is None:
+            raise AttributeError(name)
+        if name in data:
+            return data[name]
+        return getattr(self.get_user(), name)
+
+    def get_user(self):
+        """Повна модель User (запит до БД при першому виклику)"""
+        if self._user is None:
+            self._user = auth.get_user_model()._default_manager.get(pk=self.pk)
+        return self._user
+
+    async def aget_user(self):
+        if self._user is None:
+            self._user = await auth.get_user_model()._default_manager.aget(pk=self.pk)
+        return self._user
+
+    def get_username(self) -> str:
+        return self.username
+
+    def get_full_name(self) -> str:
+        return f'{self.first_name} {self.last_name}'.strip()
+
+    def get_short_name(self) -> str:
+        return self.first_name
+
+    def __str__(self):
+        return self.username
+
+    def __eq__(self, other):
+        return getattr(other, 'is_authenticated', False) and other.pk == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+
+def _snapshot(request):
+    """Знімок з кешу, якщо він відповідає сесії, інакше None"""
+    session = request.session
+    user_id = session.get(SESSION_KEY)
+    session_hash = session.get(HASH_SESSION_KEY)
+    if user_id is None or not session_hash or session.get(BACKEND_SESSION_KEY) not in settings.AUTHENTICATION_BACKENDS:
+        return None
+    data = caches[SHARED].get(_cache_key(user_id))
+    if data is None or str(data['id']) != str(user_id) or not data['is_active'] \
+            or not constant_time_compare(data['password_fingerprint'], session_hash):
+        return None
+    return UserSnapshot(data)
+
+
+def get_user(request):
+    """Користувач запиту: знімок з кешу або (при промаху) модель з БД"""
+    if not hasattr(request, '_cached_user'):
+        user = _snapshot(request)
+        if user is None:
+            user = auth.get_user(request)
+            if user.is_authenticated:
+                snapshot = UserSnapshot.from_user(user)
+                caches[SHARED].set(_cache_key(user.pk), snapshot._data, timeout=settings.USER_SNAPSHOT_TTL)
+        request._cached_user = user
+    return request._cached_user
+
+
+async def auser(request):
+    if not hasattr(request, '_acached_user'):
+        request._acached_user = await sync_to_async(get_user)(request)
+    return request._acached_user
+
+
+class AuthenticationMiddleware(BaseAuthenticationMiddleware):
+    """AuthenticationMiddleware, що бере користувача зі знімка в кеші"""
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_user(request))
+        request.auser = partial(auser, request)
+
+
+def invalidate(user_id) -> None:
+    """Скидає знімок користувача
+
+    Сигнали викликають це лише для ``save()``/``delete()``. Після
+    ``User.objects.filter(...).update(is_active=False)`` чи іншої масової
+    зміни доступу викликайте ``invalidate`` для кожного id, інакше знімок
+    діятиме до USER_SNAPSHOT_TTL.
+    """
+    caches[SHARED].delete(_cache_key(user_id))
+
+
+def _after_change(sender, instance, **kwargs):
+    invalidate(instance.pk)
+
+
+def _after_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate(user.pk)
+
+
+def connect() -> None:
+    """Підключає інвалідацію знімків (викликається з AppConfig.ready)"""
+    model = auth.get_user_model()
+    post_save.connect(_after_change, sender=model, dispatch_uid='whmcs_project.users.post_save')
+    post_delete.connect(_after_change, sender=model, dispatch_uid='whmcs_project.users.post_delete')
+    user_logged_out.connect(_after_logout, dispatch_uid='whmcs_project.users.logged_out')